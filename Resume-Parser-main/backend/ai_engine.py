@@ -4,15 +4,29 @@ Generates SWOT analysis and interview questions
 FREE tier - perfect for hackathon
 """
 
+import asyncio
 import os
-from typing import Dict, List
+import weakref
+from typing import Dict, List, Optional
 import json
 
+from ai_scheduler import AIUnavailable, BATCH, INTERACTIVE, estimate_tokens, shared_scheduler
+
 try:
     import google.generativeai as genai  # type: ignore
 except Exception:
     genai = None
 
+MODEL_NAME = 'gemini-2.0-flash'
+# Bump whenever a prompt template changes, so cached responses are not reused
+PROMPT_VERSION = '1'
+# Characters of each input that reach the prompts (and the cache key)
+RESUME_CHARS = 1500
+JD_CHARS = 1000
+SKILL_TEXT_CHARS = 2000
+# Cheapest call that proves the API answers again (circuit breaker probe)
+PROBE_PROMPT = 'Reply with the single word OK.'
+
 class AIInsightsEngine:
     """
     Uses Gemini 2.0 Flash for:
@@ -20,7 +34,40 @@ class AIInsightsEngine:
     - Tailored Interview Questions
     """
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, model=None, max_concurrency: int = 4,
+                 timeout: float = 20.0, cache=None, skill_batch_size: int = 8,
+                 api_endpoint: str = None, scheduler=None):
+        """
+        Args:
+            model: Optional object with generate_content(prompt) (and optionally
+                   generate_content_async) returning something with .text;
+                   replaces Gemini, e.g. a local stub
+            max_concurrency: Model calls in flight at once on the async path
+            timeout: Seconds per async model call before falling back to the mock output
+            cache: Optional LLMResponseCache for parsed model responses
+            skill_batch_size: Resumes packed into one skill-extraction prompt (1 = one call each)
+            api_endpoint: Alternative Gemini REST endpoint, e.g. a local stand-in
+                          server (http://127.0.0.1:8765); calls use the REST transport
+            scheduler: AIScheduler every model call goes through (rate budgets,
+                       priorities, circuit breaker); defaults to the process-wide one
+        """
+        self.cache = cache
+        self.scheduler = scheduler if scheduler is not None else shared_scheduler()
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.skill_batch_size = max(1, skill_batch_size)
+        # The REST transport has no async client, so its calls run on worker threads
+        self.async_calls = not api_endpoint
+        # One semaphore per event loop (the batch paths run their own loops)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+        if model is not None:
+            self.api_key = api_key
+            self.model = model
+            self.available = True
+            self.scheduler.set_probe(self._probe)
+            return
+
         # Get API key from environment
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
         if not self.api_key:
@@ -36,30 +83,29 @@ class AIInsightsEngine:
         
         # Configure Gemini (keep app running even if config/model init fails)
         try:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-2.0-flash')
+            if api_endpoint:
+                genai.configure(api_key=self.api_key, transport='rest',
+                                client_options={'api_endpoint': api_endpoint})
+            else:
+                genai.configure(api_key=self.api_key)
+            self.model = genai.GenerativeModel(MODEL_NAME)
             self.available = True
-            print("[SUCCESS] Gemini AI Insights Engine ready")
+            self.scheduler.set_probe(self._probe)
+            print(f"[SUCCESS] Gemini AI Insights Engine ready{f' ({api_endpoint})' if api_endpoint else ''}")
         except Exception as e:
             print(f"[WARNING] Gemini init failed - AI insights disabled: {e}")
             self.available = False
             self.model = None
     
-    def generate_swot(self, resume_text: str, jd_text: str, skills: List[str] = None) -> Dict:
-        """
-        Generate SWOT analysis for candidate vs job
-        """
-        if not self.available:
-            return self._mock_swot(skills)
-        
-        prompt = f"""
+    def _swot_prompt(self, resume_text: str, jd_text: str) -> str:
+        return f"""
         You are an expert HR analyst. Analyze this candidate's resume against the job description.
         
         JOB DESCRIPTION:
-        {jd_text[:1000]}
+        {jd_text[:JD_CHARS]}
         
         RESUME:
-        {resume_text[:1500]}
+        {resume_text[:RESUME_CHARS]}
         
         Generate a SWOT analysis:
         
@@ -78,40 +124,64 @@ class AIInsightsEngine:
         
         Be specific, concise, and professional.
         """
+
+    def _parse_json(self, text: str):
+        """JSON payload of a model response, with or without a ``` fence"""
+        if '```json' in text:
+            text = text.split('```json')[1].split('```')[0]
+        elif '```' in text:
+            text = text.split('```')[1].split('```')[0]
+        return json.loads(text.strip())
+
+    def _cache_key(self, kind: str, *inputs) -> str:
+        if self.cache is None:
+            return None
+        return self.cache.key_for(PROMPT_VERSION, MODEL_NAME, kind, *inputs)
+
+    def _cache_get(self, key):
+        return self.cache.get(key) if key is not None else None
+
+    def _cache_set(self, key, value):
+        if key is not None:
+            self.cache.set(key, value)
+
+    def _swot_key(self, resume_text: str, jd_text: str):
+        return self._cache_key('swot', resume_text[:RESUME_CHARS], jd_text[:JD_CHARS])
+
+    def _questions_key(self, resume_text: str, jd_text: str, num_questions: int):
+        return self._cache_key('questions', num_questions, resume_text[:RESUME_CHARS], jd_text[:JD_CHARS])
+
+    def generate_swot(self, resume_text: str, jd_text: str, skills: List[str] = None) -> Dict:
+        """
+        Generate SWOT analysis for candidate vs job
+        """
+        if not self.available:
+            return self._mock_swot(skills)
+
+        key = self._swot_key(resume_text, jd_text)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
         
         try:
-            response = self.model.generate_content(prompt)
-            # Extract JSON from response
-            text = response.text
-            if '```json' in text:
-                text = text.split('```json')[1].split('```')[0]
-            elif '```' in text:
-                text = text.split('```')[1].split('```')[0]
-            
-            return json.loads(text.strip())
+            swot = self._parse_json(self._generate(self._swot_prompt(resume_text, jd_text)))
+            self._cache_set(key, swot)
+            return swot
+        except AIUnavailable:
+            return self._mock_swot(skills)
         except Exception as e:
             print(f"Error generating SWOT: {e}")
             return self._mock_swot(skills)
     
-    def generate_interview_questions(self, 
-                                   resume_text: str, 
-                                   jd_text: str,
-                                   num_questions: int = 5,
-                                   skills: List[str] = None) -> List[Dict]:
-        """
-        Generate tailored interview questions
-        """
-        if not self.available:
-            return self._mock_questions(skills)
-        
-        prompt = f"""
+    def _questions_prompt(self, resume_text: str, jd_text: str, num_questions: int) -> str:
+        return f"""
         You are a technical interviewer. Generate {num_questions} interview questions for this candidate.
         
         JOB DESCRIPTION:
-        {jd_text[:1000]}
+        {jd_text[:JD_CHARS]}
         
         CANDIDATE RESUME:
-        {resume_text[:1500]}
+        {resume_text[:RESUME_CHARS]}
         
         Create questions that:
         1. Test their claimed skills
@@ -131,20 +201,36 @@ class AIInsightsEngine:
         
         Make questions specific to their resume and the job.
         """
+
+    def generate_interview_questions(self, 
+                                   resume_text: str, 
+                                   jd_text: str,
+                                   num_questions: int = 5,
+                                   skills: List[str] = None) -> List[Dict]:
+        """
+        Generate tailored interview questions
+        """
+        if not self.available:
+            return self._mock_questions(skills)
+
+        key = self._questions_key(resume_text, jd_text, num_questions)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
         
         try:
-            response = self.model.generate_content(prompt)
-            text = response.text
-            if '```json' in text:
-                text = text.split('```json')[1].split('```')[0]
-            elif '```' in text:
-                text = text.split('```')[1].split('```')[0]
-            
-            return json.loads(text.strip())
+            questions = self._parse_json(self._generate(self._questions_prompt(resume_text, jd_text, num_questions)))
+            self._cache_set(key, questions)
+            return questions
+        except AIUnavailable:
+            return self._mock_questions(skills)
         except Exception as e:
             print(f"Error generating questions: {e}")
             return self._mock_questions(skills)
     
+    def _skills_key(self, text: str):
+        return self._cache_key('skills', text[:SKILL_TEXT_CHARS])
+
     async def extract_skills(self, text: str) -> List[str]:
         """
         Extract professional skills from text using Gemini
@@ -152,10 +238,18 @@ class AIInsightsEngine:
         if not self.available:
             return []
 
+        key = self._skills_key(text)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return list(cached)
+        return await self._request_skills(text, key) or []
+
+    async def _request_skills(self, text: str, key, priority: int = INTERACTIVE) -> Optional[List[str]]:
+        """Skills from one model call; None when the call failed or was refused"""
         prompt = f"""
         Extract a comprehensive list of professional skills, technical tools, and soft skills from the following text.
         Text:
-        {text[:2000]}
+        {text[:SKILL_TEXT_CHARS]}
 
         Return only a JSON array of skill names.
         Example: ["Python", "Machine Learning", "FastAPI", "Project Management"]
@@ -163,18 +257,104 @@ class AIInsightsEngine:
 
         try:
             # Use a slightly larger limit for skill extraction but keep it efficient
-            response = await self.model.generate_content_async(prompt)
-            output = response.text
-            if '```json' in output:
-                output = output.split('```json')[1].split('```')[0]
-            elif '```' in output:
-                output = output.split('```')[1].split('```')[0]
-            
-            skills = json.loads(output.strip())
-            return [str(s).strip() for s in skills if s]
+            skills = self._parse_json(await self._generate_async(prompt, priority))
+            skills = [str(s).strip() for s in skills if s]
+            self._cache_set(key, skills)
+            return skills
+        except AIUnavailable:
+            return None
         except Exception as e:
             print(f"Error extracting skills via Gemini: {e}")
-            return []
+            return None
+
+    def _skills_batch_prompt(self, texts: List[str]) -> str:
+        documents = "\n".join(
+            f'<doc id="{i}">\n{text[:SKILL_TEXT_CHARS]}\n</doc>' for i, text in enumerate(texts)
+        )
+        return f"""
+        Extract a comprehensive list of professional skills, technical tools, and soft skills from each of the following {len(texts)} resumes.
+        Each resume is enclosed in <doc id="N"> ... </doc>. Treat every document independently.
+
+        {documents}
+
+        Return only a JSON object with one key per document id, mapping it to a JSON array of skill names.
+        Example: {{"0": ["Python", "Machine Learning"], "1": ["FastAPI", "Project Management"]}}
+        """
+
+    def _split_skills_batch(self, text: str, count: int) -> List:
+        """Per-document skill lists of a batched response; None for documents missing from it"""
+        payload = self._parse_json(text)
+        if isinstance(payload, list):
+            # Also accept [{"id": 0, "skills": [...]}, ...]
+            payload = {str(item.get('id')): item.get('skills') for item in payload if isinstance(item, dict)}
+        if not isinstance(payload, dict):
+            raise ValueError(f"expected a JSON object, got {type(payload).__name__}")
+        results = []
+        for i in range(count):
+            skills = payload.get(str(i))
+            results.append([str(s).strip() for s in skills if s] if isinstance(skills, list) else None)
+        return results
+
+    async def _extract_skills_chunk(self, texts: List[str]) -> List[Optional[List[str]]]:
+        """
+        One batched call for an uncached chunk; documents it fails to answer get
+        their own call (None for those that fail again)
+        """
+        results = [None] * len(texts)
+        if len(texts) > 1:
+            try:
+                results = self._split_skills_batch(
+                    await self._generate_async(self._skills_batch_prompt(texts), BATCH), len(texts)
+                )
+            except AIUnavailable:
+                # Rate budget or circuit breaker: retrying each resume would be refused too
+                return [None for _ in texts]
+            except asyncio.TimeoutError:
+                print(f"[WARNING] Batched skill extraction timed out after {self.timeout}s - "
+                      f"retrying {len(texts)} resumes one by one")
+            except Exception as e:
+                print(f"[WARNING] Batched skill extraction failed ({e}) - retrying {len(texts)} resumes one by one")
+
+        missing = [i for i, skills in enumerate(results) if skills is None]
+        for text, skills in zip(texts, results):
+            if skills is not None:
+                self._cache_set(self._skills_key(text), skills)
+        retried = await asyncio.gather(*[
+            self._request_skills(texts[i], self._skills_key(texts[i]), BATCH) for i in missing
+        ])
+        for i, skills in zip(missing, retried):
+            results[i] = skills
+        return results
+
+    async def extract_skills_batch(self, texts: List[str]) -> List[Optional[List[str]]]:
+        """
+        extract_skills for many texts, skill_batch_size resumes per prompt.
+        Cached texts are answered first; the rest are packed into numbered
+        documents and the per-document JSON is split back out. A chunk whose
+        response can't be parsed (or that leaves documents out) falls back to
+        one extract_skills call per affected resume. Unlike extract_skills,
+        resumes whose calls failed or were refused (circuit open, rate limit)
+        come back as None, so callers can tell an outage from "no skills".
+        """
+        if not self.available:
+            return [[] for _ in texts]
+
+        results = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            cached = self._cache_get(self._skills_key(text))
+            if cached is not None:
+                results[i] = list(cached)
+            else:
+                pending.append(i)
+
+        size = self.skill_batch_size
+        chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+        answers = await asyncio.gather(*[self._extract_skills_chunk([texts[i] for i in chunk]) for chunk in chunks])
+        for chunk, skills in zip(chunks, answers):
+            for i, doc_skills in zip(chunk, skills):
+                results[i] = doc_skills
+        return results
 
     def _mock_swot(self, skills: List[str] = None) -> Dict:
         """Fallback SWOT when AI unavailable"""
@@ -240,3 +420,105 @@ class AIInsightsEngine:
             'interview_questions': questions,
             'ai_powered': self.available
         }
+
+    # --- Async path: bounded concurrency, per-call timeouts ------------------
+
+    def _semaphore(self):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def _probe(self):
+        self.model.generate_content(PROBE_PROMPT)
+
+    def _generate(self, prompt: str, priority: int = INTERACTIVE) -> str:
+        """
+        One blocking model call admitted by the scheduler; raises AIUnavailable
+        without calling the model while the budget or circuit breaker refuses it
+        """
+        reserved = self.scheduler.acquire(estimate_tokens(prompt), priority, timeout=self.timeout)
+        try:
+            response = self.model.generate_content(prompt)
+        except Exception as e:
+            self.scheduler.record_failure(e)
+            raise
+        self.scheduler.record_success(reserved, response)
+        return response.text
+
+    async def _generate_async(self, prompt: str, priority: int = INTERACTIVE) -> str:
+        """One model call under the scheduler, concurrency limit and timeout; returns the response text"""
+        reserved = await self.scheduler.aacquire(estimate_tokens(prompt), priority, timeout=self.timeout)
+        async with self._semaphore():
+            if self.async_calls and hasattr(self.model, 'generate_content_async'):
+                call = self.model.generate_content_async(prompt)
+            else:
+                # Sync-only models run on a worker thread instead of the event loop
+                call = asyncio.to_thread(self.model.generate_content, prompt)
+            try:
+                response = await asyncio.wait_for(call, timeout=self.timeout)
+            except Exception as e:
+                self.scheduler.record_failure(e)
+                raise
+            self.scheduler.record_success(reserved, response)
+            return response.text
+
+    async def _generate_or_mock(self, label: str, key, prompt: str, fallback, priority: int = INTERACTIVE):
+        """(parsed response, fell_back) - fallback() on timeout, refusal or any model/parse error"""
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached, False
+        try:
+            value = self._parse_json(await self._generate_async(prompt, priority))
+            self._cache_set(key, value)
+            return value, False
+        except AIUnavailable:
+            pass
+        except asyncio.TimeoutError:
+            print(f"[WARNING] {label} timed out after {self.timeout}s - using fallback")
+        except Exception as e:
+            print(f"Error generating {label}: {e}")
+        return fallback(), True
+
+    async def analyze_candidate_async(self, resume_text: str, jd_text: str,
+                                      skills: List[str] = None, num_questions: int = 5,
+                                      priority: int = INTERACTIVE) -> Dict:
+        """
+        analyze_candidate without blocking the event loop: SWOT and interview
+        questions are generated concurrently; a part that times out, fails or
+        is refused by the scheduler falls back to its mock and is listed under 'fallback'
+        """
+        if not self.available:
+            return self.analyze_candidate(resume_text, jd_text, skills=skills)
+
+        (swot, swot_failed), (questions, questions_failed) = await asyncio.gather(
+            self._generate_or_mock('SWOT', self._swot_key(resume_text, jd_text),
+                                   self._swot_prompt(resume_text, jd_text),
+                                   lambda: self._mock_swot(skills), priority),
+            self._generate_or_mock('interview questions',
+                                   self._questions_key(resume_text, jd_text, num_questions),
+                                   self._questions_prompt(resume_text, jd_text, num_questions),
+                                   lambda: self._mock_questions(skills), priority)
+        )
+        result = {
+            'swot_analysis': swot,
+            'interview_questions': questions,
+            'ai_powered': True
+        }
+        fallback = [name for name, failed in (('swot_analysis', swot_failed),
+                                              ('interview_questions', questions_failed)) if failed]
+        if fallback:
+            result['fallback'] = fallback
+        return result
+
+    async def analyze_candidates_async(self, candidates: List[Dict], priority: int = INTERACTIVE) -> List[Dict]:
+        """
+        Insights for many candidates at once, in input order; at most
+        max_concurrency model calls are in flight across all of them
+        candidates: [{'resume_text', 'jd_text', 'skills'}]
+        """
+        return await asyncio.gather(*[
+            self.analyze_candidate_async(c['resume_text'], c['jd_text'], skills=c.get('skills'), priority=priority)
+            for c in candidates
+        ])
@@ -0,0 +1,344 @@
+"""
+AI Scheduler - shared admission control in front of every Gemini call
+Token buckets enforce a requests-per-minute and a tokens-per-minute budget;
+waiting callers are admitted by priority (interactive before batch, FIFO
+within a priority), and batch callers cannot drain the last `batch_reserve`
+of either budget. A circuit breaker trips after repeated call failures:
+while it is open calls are refused at once, so callers use their mock
+fallbacks instead of paying the full latency, and a background thread
+probes the model until it answers again.
+
+Budgets and breaker state live in one process. With the process batch backend
+the parent and every worker get an equal share of the configured budget (see
+set_budget_share), so together they stay within it; each process still trips
+its own breaker.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', BATCH: 'batch'}
+
+# Output tokens reserved per call until the response reports its real usage
+OUTPUT_TOKENS = 512
+# Async waiters re-check the queue at least this often
+POLL_SECONDS = 0.05
+
+class AIUnavailable(Exception):
+    """The scheduler refused a call; the caller should use its fallback"""
+
+class RateLimited(AIUnavailable):
+    pass
+
+class CircuitOpen(AIUnavailable):
+    pass
+
+def estimate_tokens(prompt):
+    """Rough prompt + response token count (~4 characters per token)"""
+    return len(prompt) // 4 + OUTPUT_TOKENS
+
+class TokenBucket:
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, reserve=0.0):
+        """Seconds until `amount` can be taken while leaving `reserve` (a capacity fraction)"""
+        self._refill(time.monotonic())
+        missing = amount + reserve * self.capacity - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount):
+        self.level -= amount
+
+    def give_back(self, amount):
+        self.level = min(self.capacity, self.level + amount)
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, cooldown=30.0, max_cooldown=300.0):
+        """
+        Args:
+            failure_threshold: Consecutive failed calls that open the circuit
+            cooldown: Seconds before the first recovery probe (doubles per failed probe)
+            max_cooldown: Upper bound for the probe interval
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probe = None
+        self.state = 'closed'
+        self.failures = 0
+        self.trips = 0
+        self.last_error = None
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        return self.state == 'closed'
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+
+    def record_failure(self, error):
+        with self.lock:
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            if self.state != 'closed' or self.failures < self.failure_threshold:
+                return
+            self.state = 'open'
+            self.trips += 1
+            self.opened_at = time.time()
+        print(f"[WARNING] Gemini circuit open after {self.failures} failures ({self.last_error}) - "
+              f"using offline fallbacks, first probe in {self.cooldown:g}s")
+        threading.Thread(target=self._probe_until_closed, name='ai-circuit-probe', daemon=True).start()
+
+    def _close(self):
+        with self.lock:
+            self.state = 'closed'
+            self.failures = 0
+            self.opened_at = None
+        print("[SUCCESS] Gemini reachable again - circuit closed")
+
+    def _probe_until_closed(self):
+        delay = self.cooldown
+        while True:
+            time.sleep(delay)
+            if self.probe is None:
+                # Nothing to probe with: let real calls try again
+                self._close()
+                return
+            try:
+                self.probe()
+            except Exception as e:
+                with self.lock:
+                    self.last_error = f"{type(e).__name__}: {e}"
+                delay = min(delay * 2, self.max_cooldown)
+                continue
+            self._close()
+            return
+
+    def status(self):
+        status = {'state': self.state, 'consecutive_failures': self.failures, 'trips': self.trips}
+        if self.opened_at is not None:
+            status['open_seconds'] = round(time.time() - self.opened_at, 1)
+        if self.last_error:
+            status['last_error'] = self.last_error
+        return status
+
+class AIScheduler:
+    def __init__(self, requests_per_minute=0, tokens_per_minute=0, batch_reserve=0.1,
+                 failure_threshold=5, cooldown=30.0):
+        """
+        Args:
+            requests_per_minute: Model call budget (0 = unlimited)
+            tokens_per_minute: Prompt + response token budget (0 = unlimited)
+            batch_reserve: Fraction of each budget only interactive callers may use
+            failure_threshold: Consecutive failures that open the circuit breaker
+            cooldown: Seconds between the breaker tripping and its first probe
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.share = 1.0
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.batch_reserve = batch_reserve
+        self.breaker = CircuitBreaker(failure_threshold, cooldown)
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.waiting = []
+        self._seq = itertools.count()
+        self.counters = {'admitted': 0, 'rate_limited': 0, 'circuit_open': 0, 'failures': 0}
+
+    @classmethod
+    def from_env(cls, share=1.0):
+        scheduler = cls(
+            requests_per_minute=float(os.getenv('AI_REQUESTS_PER_MINUTE', '0')),
+            tokens_per_minute=float(os.getenv('AI_TOKENS_PER_MINUTE', '0')),
+            failure_threshold=int(os.getenv('AI_BREAKER_FAILURES', '5')),
+            cooldown=float(os.getenv('AI_BREAKER_COOLDOWN_SECONDS', '30'))
+        )
+        scheduler.set_share(share)
+        return scheduler
+
+    def set_share(self, share):
+        """Use `share` (0-1] of the configured budgets; what is already spent stays spent"""
+        with self.lock:
+            self.share = share
+            for name, per_minute in (('requests', self.requests_per_minute), ('tokens', self.tokens_per_minute)):
+                bucket = getattr(self, name)
+                if bucket is None:
+                    continue
+                spent = bucket.capacity - bucket.level
+                bucket.capacity = per_minute * share
+                bucket.rate = bucket.capacity / 60.0
+                bucket.level = max(0.0, bucket.capacity - spent)
+
+    def set_probe(self, probe):
+        """Zero-argument callable the breaker uses to test for recovery (raises on failure)"""
+        self.breaker.probe = probe
+
+    def _check_breaker(self):
+        if not self.breaker.allow():
+            with self.lock:
+                self.counters['circuit_open'] += 1
+            raise CircuitOpen(f"Gemini circuit open ({self.breaker.last_error})")
+
+    def _clamp(self, tokens):
+        # A prompt larger than the whole budget would never be admitted
+        if self.tokens is not None:
+            return min(tokens, self.tokens.capacity * (1 - self.batch_reserve))
+        return tokens
+
+    def _try_admit(self, ticket, tokens):
+        """(Lock held) 0 once admitted, else seconds to wait before trying again"""
+        if self.waiting[0] != ticket:
+            return POLL_SECONDS
+        reserve = self.batch_reserve if ticket[0] == BATCH else 0.0
+        wait = max(
+            self.requests.wait_time(1, reserve) if self.requests is not None else 0.0,
+            self.tokens.wait_time(tokens, reserve) if self.tokens is not None else 0.0
+        )
+        if wait > 0:
+            return wait
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None:
+            self.tokens.take(tokens)
+        heapq.heappop(self.waiting)
+        self.counters['admitted'] += 1
+        self.changed.notify_all()
+        return 0
+
+    def _leave(self, ticket, timed_out=True):
+        """(Lock held) Drop a waiter that gave up"""
+        if ticket in self.waiting:
+            self.waiting.remove(ticket)
+            heapq.heapify(self.waiting)
+            self.changed.notify_all()
+        if timed_out:
+            self.counters['rate_limited'] += 1
+
+    def acquire(self, tokens, priority=INTERACTIVE, timeout=None):
+        """
+        Block until the call fits both budgets; returns the tokens reserved
+        (pass them to record_success). Raises CircuitOpen at once while the
+        breaker is open, RateLimited if not admitted within `timeout` seconds.
+        """
+        self._check_breaker()
+        tokens = self._clamp(tokens)
+        if self.requests is None and self.tokens is None:
+            with self.lock:
+                self.counters['admitted'] += 1
+            return tokens
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        ticket = (priority, next(self._seq))
+        with self.changed:
+            heapq.heappush(self.waiting, ticket)
+            while True:
+                wait = self._try_admit(ticket, tokens)
+                if wait == 0:
+                    break
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._leave(ticket)
+                        raise RateLimited(f"not admitted within {timeout}s")
+                    wait = min(wait, remaining)
+                self.changed.wait(wait)
+        self._check_breaker()
+        return tokens
+
+    async def aacquire(self, tokens, priority=INTERACTIVE, timeout=None):
+        """acquire() for coroutines: waits with asyncio.sleep instead of blocking the loop"""
+        self._check_breaker()
+        tokens = self._clamp(tokens)
+        if self.requests is None and self.tokens is None:
+            with self.lock:
+                self.counters['admitted'] += 1
+            return tokens
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        ticket = (priority, next(self._seq))
+        with self.lock:
+            heapq.heappush(self.waiting, ticket)
+        try:
+            while True:
+                with self.lock:
+                    wait = self._try_admit(ticket, tokens)
+                if wait == 0:
+                    break
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RateLimited(f"not admitted within {timeout}s")
+                    wait = min(wait, remaining)
+                await asyncio.sleep(min(wait, POLL_SECONDS))
+        except BaseException as e:
+            # Timed out or cancelled while queued
+            with self.lock:
+                self._leave(ticket, timed_out=isinstance(e, RateLimited))
+            raise
+        self._check_breaker()
+        return tokens
+
+    def record_success(self, reserved, response=None):
+        """Close the failure streak and settle the token estimate against real usage"""
+        self.breaker.record_success()
+        usage = getattr(getattr(response, 'usage_metadata', None), 'total_token_count', None)
+        if self.tokens is not None and usage:
+            with self.lock:
+                self.tokens.give_back(reserved - usage)
+
+    def record_failure(self, error):
+        with self.lock:
+            self.counters['failures'] += 1
+        self.breaker.record_failure(error)
+
+    def status(self):
+        with self.lock:
+            status = {
+                **self.counters,
+                'queued': {name: sum(1 for p, _ in self.waiting if p == priority)
+                           for priority, name in PRIORITY_NAMES.items()},
+                'circuit': self.breaker.status()
+            }
+            for name, bucket in (('requests_per_minute', self.requests), ('tokens_per_minute', self.tokens)):
+                if bucket is not None:
+                    bucket._refill(time.monotonic())
+                    status[name] = {'budget': bucket.capacity, 'available': round(bucket.level, 1)}
+        return status
+
+_shared = None
+_shared_share = 1.0
+_shared_lock = threading.Lock()
+
+def shared_scheduler():
+    """The process-wide scheduler (configured from the environment on first use)"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = AIScheduler.from_env(_shared_share)
+        return _shared
+
+def set_budget_share(processes):
+    """
+    Split the configured budgets evenly over `processes` processes calling
+    Gemini at once (the parent plus its batch workers); call it in each of them
+    """
+    global _shared_share
+    with _shared_lock:
+        _shared_share = 1.0 / max(1, processes)
+        if _shared is not None:
+            _shared.set_share(_shared_share)
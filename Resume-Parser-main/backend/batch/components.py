@@ -0,0 +1,132 @@
+"""
+Lazy Components - heavy dependencies built on first use or by a background warmup
+Each component records its state so /health can report readiness per component:
+    pending -> loading -> ready | failed
+A component the service can run without (required=False) only has to finish
+loading before the service is ready; if it failed, or came up unavailable
+(e.g. the semantic model without torch), it is reported as degraded.
+"""
+
+import asyncio
+import threading
+import time
+
+class LazyComponent:
+    def __init__(self, name, factory, warmup=None, required=True):
+        """
+        Args:
+            name: Component name as reported by status()
+            factory: Zero-argument callable that builds the component
+            warmup: Optional callable run once on the built component (e.g. one
+                    throwaway inference) so the first real request is not slow
+            required: Whether the service counts as not ready while this is missing;
+                      optional components only have to finish loading (or fail)
+        """
+        self.name = name
+        self.factory = factory
+        self.warmup = warmup
+        self.required = required
+        self.state = 'pending'
+        self.error = None
+        self.seconds = None
+        self._value = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self.state == 'ready'
+
+    @property
+    def settled(self):
+        return self.state in ('ready', 'failed')
+
+    @property
+    def degraded(self):
+        """Failed, or built but reporting itself unavailable (an `available` attribute)"""
+        if self.state == 'failed':
+            return True
+        return self.state == 'ready' and getattr(self._value, 'available', True) is False
+
+    def get(self):
+        """The component, building it (once, thread-safe) if needed; None if it failed"""
+        if self.state in ('ready', 'failed'):
+            return self._value
+        with self._lock:
+            if self.state in ('ready', 'failed'):
+                return self._value
+            self.state = 'loading'
+            start = time.perf_counter()
+            try:
+                value = self.factory()
+                if self.warmup is not None and value is not None:
+                    self.warmup(value)
+                self._value = value
+                self.state = 'ready'
+            except Exception as e:
+                print(f"[WARNING] {self.name} failed to load: {e}")
+                self.error = str(e)
+                self.state = 'failed'
+            self.seconds = round(time.perf_counter() - start, 3)
+        return self._value
+
+    async def aget(self):
+        """get() without blocking the event loop while the component loads"""
+        if self.state in ('ready', 'failed'):
+            return self._value
+        return await asyncio.to_thread(self.get)
+
+    def peek(self):
+        """The component if it is already built, without triggering a load"""
+        return self._value if self.state == 'ready' else None
+
+    def status(self):
+        status = {'state': self.state, 'required': self.required}
+        if self.degraded:
+            status['degraded'] = True
+        if self.seconds is not None:
+            status['load_seconds'] = self.seconds
+        if self.error:
+            status['error'] = self.error
+        return status
+
+class ComponentRegistry:
+    """Named LazyComponents, warmed in registration order"""
+
+    def __init__(self):
+        self.components = {}
+        self.started = time.time()
+        self.warmup_seconds = None
+
+    def register(self, component):
+        self.components[component.name] = component
+        return component
+
+    def __getitem__(self, name):
+        return self.components[name]
+
+    def warm_up(self, names=None):
+        """Build every (or the named) component; returns the seconds it took"""
+        start = time.perf_counter()
+        for name in names or list(self.components):
+            self.components[name].get()
+        self.warmup_seconds = round(time.perf_counter() - start, 3)
+        return self.warmup_seconds
+
+    def start_warmup(self, names=None):
+        """warm_up() on a daemon thread, so startup does not wait for it"""
+        thread = threading.Thread(target=self.warm_up, args=(names,), name='component-warmup', daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def ready(self):
+        return all(c.ready if c.required else c.settled for c in self.components.values())
+
+    def status(self):
+        return {
+            'ready': self.ready,
+            'degraded': [name for name, c in self.components.items() if c.degraded],
+            'uptime_seconds': round(time.time() - self.started, 3),
+            'warmup_seconds': self.warmup_seconds,
+            'components': {name: c.status() for name, c in self.components.items()}
+        }
@@ -0,0 +1,196 @@
+"""
+Upload Ingestion - bounded-memory spooling of uploaded resumes
+Each upload is copied in chunks into memory until it crosses the spool
+threshold or the request's memory ceiling, then rolls over to a temp file.
+Extractors get bytes for small files and a read-only mmap for spooled ones.
+Process workers are handed the spool file's path (SpoolFile) and map it
+themselves, so no upload is copied whole outside the memory ceiling.
+"""
+
+import hashlib
+import mmap
+import tempfile
+
+CHUNK_SIZE = 1024 * 1024
+
+class MemoryBudget:
+    """Per-request ceiling on upload bytes held in memory"""
+
+    def __init__(self, ceiling):
+        self.ceiling = ceiling
+        self.used = 0
+
+    def reserve(self, size):
+        if self.used + size > self.ceiling:
+            return False
+        self.used += size
+        return True
+
+    def release(self, size):
+        self.used = max(0, self.used - size)
+
+class SpoolFile:
+    """Picklable reference to a spooled upload, opened by a worker process"""
+
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+        self._file = None
+        self._mmap = None
+
+    def __getstate__(self):
+        return {'path': self.path, 'size': self.size}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['size'])
+
+    def source(self):
+        """Read-only mmap of the file (b'' for an empty one)"""
+        if self.size == 0:
+            return b''
+        if self._mmap is None:
+            self._file = open(self.path, 'rb')
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mmap.seek(0)
+        return self._mmap
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class SpooledUpload:
+    """
+    One uploaded file, held in memory or in a temp file, with the SHA-256 of
+    its bytes computed while it was copied (used as the parse cache key).
+    """
+
+    def __init__(self, filename, budget, spool_threshold):
+        self.filename = filename
+        self.size = 0
+        self.sha256 = None
+        self._budget = budget
+        self._threshold = spool_threshold
+        self._hash = hashlib.sha256()
+        self._chunks = []
+        self._data = None
+        self._file = None
+        self._mmap = None
+
+    @property
+    def on_disk(self):
+        return self._file is not None
+
+    def write(self, chunk):
+        self._hash.update(chunk)
+        self.size += len(chunk)
+        if self._file is None:
+            if self.size <= self._threshold and self._budget.reserve(len(chunk)):
+                self._chunks.append(chunk)
+                return
+            self._rollover()
+        self._file.write(chunk)
+
+    def _rollover(self):
+        # Named, so process workers can open it by path; removed on close
+        self._file = tempfile.NamedTemporaryFile(prefix='resume-upload-')
+        for chunk in self._chunks:
+            self._file.write(chunk)
+            self._budget.release(len(chunk))
+        self._chunks = []
+
+    def finish(self):
+        self.sha256 = self._hash.hexdigest()
+        if self._file is None:
+            self._data = b''.join(self._chunks)
+            self._chunks = []
+        else:
+            self._file.flush()
+        return self
+
+    def source(self):
+        """bytes for in-memory uploads, a read-only mmap (file-like) for spooled ones"""
+        if self._file is None:
+            return self._data
+        if self.size == 0:
+            return b''
+        if self._mmap is None:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mmap.seek(0)
+        return self._mmap
+
+    def worker_payload(self):
+        """
+        What a process worker gets: the bytes of an in-memory upload (already
+        counted against the memory ceiling) or a SpoolFile for a spooled one
+        """
+        if self._file is None:
+            return self._data
+        return SpoolFile(self._file.name, self.size)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._data is not None:
+            self._budget.release(len(self._data))
+            self._data = None
+
+async def spool_upload(upload, budget, spool_threshold, chunk_size=CHUNK_SIZE):
+    """Copy a FastAPI UploadFile into a SpooledUpload without reading it whole"""
+    spooled = SpooledUpload(upload.filename, budget, spool_threshold)
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            spooled.write(chunk)
+    except Exception:
+        spooled.close()
+        raise
+    return spooled.finish()
+
+async def spool_uploads(uploads, memory_ceiling, spool_threshold):
+    """Spool every upload of one request under a shared memory ceiling"""
+    budget = MemoryBudget(memory_ceiling)
+    spooled = []
+    try:
+        for upload in uploads:
+            spooled.append(await spool_upload(upload, budget, spool_threshold))
+            # The framework's own temp copy is no longer needed
+            await upload.close()
+    except Exception:
+        close_all(spooled)
+        raise
+    return spooled
+
+def close_all(spooled):
+    for upload in spooled:
+        upload.close()
+
+def content_digest(content):
+    if isinstance(content, SpooledUpload):
+        return content.sha256
+    return hashlib.sha256(content).hexdigest()
+
+def content_source(content):
+    if isinstance(content, SpooledUpload):
+        return content.source()
+    return content
+
+def worker_payload(content):
+    if isinstance(content, SpooledUpload):
+        return content.worker_payload()
+    return content
+
+def open_payload(content):
+    """Worker side of worker_payload: bytes, or a read-only mmap for a SpoolFile"""
+    if isinstance(content, SpoolFile):
+        return content.source()
+    return content
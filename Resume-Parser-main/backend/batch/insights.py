@@ -0,0 +1,203 @@
+"""
+Deferred AI Insights - SWOT and interview questions generated after the match response
+A match request submits its candidates and returns an insights id straight
+away; a background event loop (its own thread) works through the queue at
+batch priority, and clients poll or stream the job as each candidate finishes.
+Jobs are bounded by count and idle time, like ranking sessions.
+"""
+
+import asyncio
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from ai_scheduler import BATCH
+
+class InsightsJob:
+    def __init__(self, job_id, candidates, jd_text):
+        """
+        Args:
+            candidates: [{'filename', 'resume_text', 'skills'}] in result order
+            jd_text: Job description the insights are generated against
+        """
+        self.id = job_id
+        self.jd_text = jd_text
+        self.candidates = candidates
+        self.total = len(candidates)
+        # Completed candidates in completion order: {'index', 'filename', 'ai_insights'}
+        self.results = []
+        self.created = time.time()
+        self.touched = self.created
+        self.finished = None if candidates else self.created
+        self.lock = threading.Lock()
+        self._listeners = set()
+
+    @property
+    def status(self):
+        if self.finished is not None:
+            return 'done'
+        return 'running' if self.results else 'queued'
+
+    def complete(self, index, insights):
+        with self.lock:
+            self.results.append({
+                'index': index,
+                'filename': self.candidates[index]['filename'],
+                'ai_insights': insights
+            })
+            if len(self.results) == self.total:
+                self.finished = time.time()
+                # The texts are not needed once every candidate is done
+                self.candidates = [{'filename': c['filename']} for c in self.candidates]
+            listeners = list(self._listeners)
+        for loop, event in listeners:
+            loop.call_soon_threadsafe(event.set)
+
+    def summary(self):
+        return {
+            'insights_id': self.id,
+            'status': self.status,
+            'completed': len(self.results),
+            'total': self.total,
+            'url': f"/insights/{self.id}"
+        }
+
+    def snapshot(self, offset=0):
+        """Summary plus the results completed so far (from `offset` on, in completion order)"""
+        self.touched = time.time()
+        with self.lock:
+            return {**self.summary(), 'results': self.results[offset:]}
+
+    async def stream(self, poll_seconds=15.0):
+        """
+        Yield one 'insight' event per candidate as it completes (already finished
+        ones first), then a 'done' event. A 'progress' heartbeat is sent if
+        nothing completes for poll_seconds.
+        """
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        listener = (loop, event)
+        with self.lock:
+            self._listeners.add(listener)
+        sent = 0
+        try:
+            while True:
+                event.clear()
+                self.touched = time.time()
+                with self.lock:
+                    new = self.results[sent:]
+                for result in new:
+                    sent += 1
+                    yield {'type': 'insight', 'completed': sent, 'total': self.total, **result}
+                if self.finished is not None and sent == self.total:
+                    yield {'type': 'done', **self.summary()}
+                    return
+                if not new:
+                    try:
+                        await asyncio.wait_for(event.wait(), timeout=poll_seconds)
+                    except asyncio.TimeoutError:
+                        yield {'type': 'progress', **self.summary()}
+        finally:
+            with self.lock:
+                self._listeners.discard(listener)
+
+class InsightsQueue:
+    def __init__(self, engine, workers=4, max_jobs=64, ttl_seconds=1800):
+        """
+        Args:
+            engine: Zero-argument callable returning the AIInsightsEngine (loaded lazily)
+            workers: Candidates worked on at once (the engine's own concurrency
+                     limit and scheduler still apply)
+            max_jobs/ttl_seconds: Jobs kept for polling (count, idle seconds)
+        """
+        self.engine = engine
+        self.workers = max(1, workers)
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._loop = None
+        self._queue = None
+        self._thread = None
+
+    def _expire(self):
+        now = time.time()
+        expired = [j for j, job in self._jobs.items() if job.finished is not None and now - job.touched > self.ttl_seconds]
+        for job_id in expired:
+            del self._jobs[job_id]
+        # Over the bound, finished jobs go first; running ones only if nothing else is left
+        while len(self._jobs) > self.max_jobs:
+            victim = next((j for j, job in self._jobs.items() if job.finished is not None), None)
+            if victim is None:
+                victim = next(iter(self._jobs))
+            del self._jobs[victim]
+
+    def _start(self):
+        """(Lock held) Background event loop with `workers` consumer tasks"""
+        if self._thread is not None:
+            return
+        ready = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            workers = [loop.create_task(self._worker()) for _ in range(self.workers)]
+            ready.set()
+            loop.run_forever()
+            # Stopped by close(): cancel the workers (and any insights in progress)
+            for task in workers:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*workers, return_exceptions=True))
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name='insights-worker', daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    async def _worker(self):
+        while True:
+            job, index = await self._queue.get()
+            if job.id not in self._jobs:
+                # Evicted before it was worked on; nobody can fetch it any more
+                continue
+            candidate = job.candidates[index]
+            try:
+                engine = await asyncio.to_thread(self.engine)
+                insights = await engine.analyze_candidate_async(
+                    candidate['resume_text'], job.jd_text, skills=candidate.get('skills'), priority=BATCH
+                )
+            except Exception as e:
+                print(f"Error generating insights for {candidate['filename']}: {e}")
+                insights = {'error': str(e), 'ai_powered': False}
+            job.complete(index, insights)
+
+    def submit(self, records, jd_text):
+        """Queue insights for parsed (and matched) resume records; returns the job summary"""
+        candidates = [
+            {'filename': res.get('filename'), 'resume_text': res.get('full_text', ""), 'skills': res.get('skills', [])}
+            for res in records
+        ]
+        job = InsightsJob(secrets.token_urlsafe(12), candidates, jd_text)
+        with self.lock:
+            self._start()
+            self._jobs[job.id] = job
+            self._expire()
+        for index in range(job.total):
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, (job, index))
+        return job.summary()
+
+    def get(self, job_id):
+        """The job; KeyError once it expired or for an unknown id"""
+        with self.lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise KeyError("Insights expired or unknown; run the match again")
+            self._jobs.move_to_end(job_id)
+            return job
+
+    def close(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
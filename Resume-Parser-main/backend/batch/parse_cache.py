@@ -0,0 +1,101 @@
+"""
+Parse Cache - content-addressed store of extracted resume fields
+Keyed on the SHA-256 of the uploaded bytes plus model and extractor versions,
+so re-uploading the same resume skips text extraction, NER, Gemini and the extractors.
+The extractor version is derived from the sources that shape a record (the
+extractors, the pipeline, the skill dictionary and the NIRF rankings), so
+editing any of them invalidates old entries without a manual bump.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import zlib
+
+from batch.ingest import content_digest
+from storage.disk_cache import DiskLRUCache
+
+# Bump whenever the record layout changes
+EXTRACTOR_VERSION = "2"
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Files whose contents decide the extracted fields (relative to backend/)
+EXTRACTOR_SOURCES = (
+    os.path.join('extraction', '*.py'),
+    os.path.join('batch', 'pipeline.py'),
+    os.path.join('matcher', 'skill_index.py'),
+    os.path.join('matcher', 'skill_terms.json'),
+)
+
+def extractor_fingerprint(rankings_dir=None):
+    """Short hash of the extractor sources and the NIRF ranking CSVs (college_tier)"""
+    paths = []
+    for pattern in EXTRACTOR_SOURCES:
+        paths.extend(sorted(glob.glob(os.path.join(_BACKEND_DIR, pattern))))
+    if rankings_dir:
+        paths.extend(sorted(glob.glob(os.path.join(rankings_dir, '*.csv'))))
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode('utf-8') + b'\0')
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def model_fingerprint(model_path):
+    """Short hash of the spaCy model files, so a retrained model invalidates old entries"""
+    digest = hashlib.sha256()
+    for rel in ('meta.json', os.path.join('ner', 'model')):
+        try:
+            with open(os.path.join(model_path, rel), 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b'missing')
+    return digest.hexdigest()[:16]
+
+class ParseCache:
+    """
+    Maps file bytes to the record ResumePipeline produced for them.
+    Scores are not stored - they are recomputed on every hit.
+    """
+
+    def __init__(self, path, model_path, max_bytes=512 * 1024 * 1024, ai_enabled=False,
+                 pdf_backend='pdfplumber', rankings_dir='./data'):
+        self.store = DiskLRUCache(path, max_bytes=max_bytes)
+        # Gemini enrichment and the PDF text backend both change the extracted
+        # fields, so they are part of the version
+        self.version = ":".join([
+            EXTRACTOR_VERSION,
+            extractor_fingerprint(rankings_dir),
+            model_fingerprint(model_path),
+            'ai' if ai_enabled else 'noai',
+            # 'parallel' produces the same text as 'pdfminer'
+            'pdfminer' if pdf_backend == 'parallel' else pdf_backend
+        ])
+
+    def key_for(self, content):
+        """content: bytes or a SpooledUpload (whose digest was computed while spooling)"""
+        return f"{self.version}:{content_digest(content)}"
+
+    def get(self, key):
+        try:
+            blob = self.store.get(key)
+            if blob is None:
+                return None
+            return json.loads(zlib.decompress(blob))
+        except Exception as e:
+            print(f"[WARNING] Parse cache read failed: {e}")
+            return None
+
+    def set(self, key, record):
+        """Store a record; records whose Gemini enrichment failed are skipped so they are re-enriched later"""
+        if record.get('ai_skills_ok') is False:
+            return
+        try:
+            payload = {k: v for k, v in record.items() if k not in ('filename', 'score', 'rank')}
+            self.store.set(key, zlib.compress(json.dumps(payload).encode('utf-8'), 1))
+        except Exception as e:
+            print(f"[WARNING] Parse cache write failed: {e}")
+
+    def close(self):
+        self.store.close()
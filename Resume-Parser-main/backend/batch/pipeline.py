@@ -0,0 +1,294 @@
+"""
+Resume Pipeline - text extraction, spaCy NER and the specialised extractors
+Shared by the in-process thread backend and the process-pool workers
+The spaCy model, NIRF rankings and Gemini client are LazyComponents: they are
+built on first use or by a background warmup (see batch.components).
+"""
+
+import asyncio
+import os
+
+from batch.components import ComponentRegistry, LazyComponent
+from scoring.scorer import ResumeScorer
+from extraction.project_extractor import ProjectExtractor
+from extraction.achievement_extractor import AchievementExtractor
+from extraction.cgpa_extractor import CGPAExtractor
+from extraction.school_marks import SchoolMarksExtractor
+from extraction.online_presence import OnlinePresenceExtractor
+from extraction.extra_curricular import ExtraCurricularExtractor
+from extraction.degree_classifier import DegreeClassifier
+from extraction.skill_filter import SkillFilter
+from extraction.text_extractor import TextExtractor
+from extraction.resume_document import INTERNSHIP_KEYWORDS, ResumeDocument
+from extraction.numeric_patterns import NumericScan
+
+# The only entity labels the extractors read back from spaCy
+ENTITY_LABELS = ('Skill', 'Education', 'Work_Experience', 'Language')
+# Components a resume parse needs
+PARSE_COMPONENTS = ('spacy_ner', 'college_rankings', 'ai_insights')
+WARMUP_TEXT = "Software engineer with Python and React experience. B.Tech, IIT Bombay, 2021."
+
+class ResumePipeline:
+    """
+    Everything needed to turn one uploaded file into a scored candidate record.
+    Holds no per-request state, so one instance can be built per worker process
+    and reused for every resume that worker receives.
+    """
+
+    def __init__(self, model_path="./model", rankings_dir='./data', ai_insights=None,
+                 nlp_batch_size=32, nlp_n_process=1, pdf_backend='pdfplumber', llm_cache=None):
+        """
+        Args:
+            llm_cache: Optional LLMResponseCache for the Gemini engine built here
+            pdf_backend: 'pdfplumber', 'pdfminer' or 'parallel' (see TextExtractor)
+            nlp_batch_size: Texts per nlp.pipe batch
+            nlp_n_process: spaCy worker processes for nlp.pipe (must be 1 inside pool workers)
+        """
+        self.scorer = ResumeScorer()
+        self.components = ComponentRegistry()
+        # A failed load leaves nlp as None (NER is skipped), as before
+        self._nlp = self.components.register(LazyComponent(
+            'spacy_ner', lambda: self._load_nlp(model_path),
+            warmup=lambda nlp: list(nlp.pipe([WARMUP_TEXT])),
+            required=False
+        ))
+        self._college_ranker = self.components.register(LazyComponent(
+            'college_rankings', lambda: self._load_college_ranker(rankings_dir)
+        ))
+        self._ai_insights = self.components.register(LazyComponent(
+            'ai_insights', lambda: ai_insights if ai_insights is not None else self._load_ai_insights(llm_cache),
+            required=False
+        ))
+        self.nlp_batch_size = nlp_batch_size
+        self.nlp_n_process = nlp_n_process
+
+        # Initialize extractors
+        self.text_extractor = TextExtractor(pdf_backend=pdf_backend)
+        self.project_extractor = ProjectExtractor()
+        self.achievement_extractor = AchievementExtractor()
+        self.cgpa_extractor = CGPAExtractor()
+        self.school_extractor = SchoolMarksExtractor()
+        self.online_extractor = OnlinePresenceExtractor()
+        self.ec_extractor = ExtraCurricularExtractor()
+        self.degree_classifier = DegreeClassifier()
+        self.skill_filter = SkillFilter()
+
+    @property
+    def nlp(self):
+        return self._nlp.get()
+
+    @property
+    def college_ranker(self):
+        return self._college_ranker.get()
+
+    @property
+    def ai_insights(self):
+        return self._ai_insights.get()
+
+    def load(self):
+        """Build every lazy component now (process workers pre-load everything)"""
+        return self.components.warm_up()
+
+    def _load_nlp(self, model_path):
+        """
+        Load the NER model with every component the backend never reads excluded.
+        A tok2vec/transformer is only loaded if the NER model listens to it.
+        """
+        # Imported here so startup does not pay for spaCy before the first parse
+        import spacy
+
+        config = spacy.util.load_config(os.path.join(model_path, 'config.cfg'))
+        keep = {'ner'}
+        ner_tok2vec = config['components']['ner']['model'].get('tok2vec', {})
+        if 'Listener' in str(ner_tok2vec.get('@architectures', '')):
+            upstream = ner_tok2vec.get('upstream', '*')
+            for name, component in config['components'].items():
+                if upstream == name or (upstream == '*' and component.get('factory') in ('tok2vec', 'transformer')):
+                    keep.add(name)
+        exclude = [name for name in config['nlp']['pipeline'] if name not in keep]
+        return spacy.load(model_path, exclude=exclude)
+
+    @staticmethod
+    def _load_college_ranker(rankings_dir):
+        from extraction.college_ranker import CollegeRanker
+
+        # Initialize with the directory containing all NIRF CSVs (loaded from the compiled snapshot when current)
+        return CollegeRanker(rankings_dir, snapshot_path=os.getenv('NIRF_SNAPSHOT_PATH') or None)
+
+    @staticmethod
+    def _load_ai_insights(llm_cache=None):
+        from ai_engine import AIInsightsEngine
+
+        return AIInsightsEngine(
+            api_key=os.getenv('GEMINI_API_KEY'),
+            max_concurrency=int(os.getenv('AI_MAX_CONCURRENCY', '4')),
+            timeout=float(os.getenv('AI_TIMEOUT_SECONDS', '20')),
+            cache=llm_cache,
+            skill_batch_size=int(os.getenv('AI_SKILL_BATCH_SIZE', '8')),
+            api_endpoint=os.getenv('GEMINI_API_ENDPOINT') or None
+        )
+
+    def extract_text(self, filename, content):
+        return self.text_extractor.extract(filename, content)
+
+    def extract_entities(self, texts, n_process=None):
+        """
+        Batch NER stage: run every text through nlp.pipe in one go.
+        Returns one list of (text, label) tuples per input text.
+        """
+        texts = list(texts)
+        if not self.nlp:
+            return [[] for _ in texts]
+
+        docs = self.nlp.pipe(
+            texts,
+            batch_size=self.nlp_batch_size,
+            n_process=n_process or self.nlp_n_process
+        )
+        return [
+            [(ent.text, ent.label_) for ent in doc.ents if ent.label_ in ENTITY_LABELS]
+            for doc in docs
+        ]
+
+    async def extract_ai_skills(self, texts):
+        """
+        Gemini skill enrichment for many texts with batched prompts (see
+        AIInsightsEngine.extract_skills_batch); [] per text when AI is disabled,
+        None for texts whose calls failed (passed on to build_record as is)
+        """
+        texts = list(texts)
+        if not texts or not self.ai_insights.available:
+            return [[] for _ in texts]
+        try:
+            return await self.ai_insights.extract_skills_batch(texts)
+        except Exception as e:
+            print(f"Error extracting skills via Gemini: {e}")
+            return [None for _ in texts]
+
+    async def parse(self, filename, content):
+        try:
+            text = self.extract_text(filename, content)
+            entities = self.extract_entities([text], n_process=1)[0]
+            return await self.build_record(filename, text, entities)
+        except Exception as e:
+            print(f"Error processing {filename}: {e}")
+            return None
+
+    def parse_sync(self, filename, content):
+        return asyncio.run(self.parse(filename, content))
+
+    def parse_many(self, files):
+        """
+        Parse a list of (filename, bytes) with a single nlp.pipe pass.
+        Failed files come back as None in their original position.
+        """
+        texts = []
+        for filename, content in files:
+            try:
+                texts.append(self.extract_text(filename, content))
+            except Exception as e:
+                print(f"Error processing {filename}: {e}")
+                texts.append(None)
+
+        ok = [i for i, t in enumerate(texts) if t is not None]
+        entities = self.extract_entities([texts[i] for i in ok])
+        ai_skills = asyncio.run(self.extract_ai_skills([texts[i] for i in ok]))
+
+        results = [None] * len(files)
+        for i, ents, skills in zip(ok, entities, ai_skills):
+            results[i] = self.build_record_sync(files[i][0], texts[i], ents, ai_skills=skills, ai_requested=True)
+        return results
+
+    async def build_record(self, filename, text, entities, ai_skills=None, ai_requested=False):
+        """
+        Run skill enrichment, the specialised extractors and scoring on NER output.
+        ai_skills: Gemini skills already extracted for this text (batched callers,
+        with ai_requested=True); None asks Gemini for this resume alone. A record
+        whose Gemini call failed gets 'ai_skills_ok': False and is not cached.
+        """
+        try:
+            spacy_skills = [t for t, label in entities if label == 'Skill']
+            education = [t for t, label in entities if label == 'Education']
+
+            # AI Skill Enrichment (Crucial Fix for "0 AI Skills")
+            if ai_skills is None and not ai_requested:
+                ai_skills = []
+                if self.ai_insights.available:
+                    # If spacy finds very few skills, or even if it finds some, let's enrich
+                    ai_skills = (await self.ai_insights.extract_skills_batch([text]))[0]
+            # Outage, rate limit or open circuit: score without them, mark the record degraded
+            ai_skills_ok = ai_skills is not None
+            ai_skills = ai_skills or []
+
+            # Combine and remove duplicates
+            combined_skills = list(set(spacy_skills + ai_skills))
+
+            # Filter skills to remove college names and academic noise
+            skills = self.skill_filter.filter_skills(combined_skills, education)
+
+            experience_text = [t for t, label in entities if label == 'Work_Experience']
+            languages = [t for t, label in entities if label == 'Language']
+
+            # One combined scan feeds CGPA, school marks, links and experience years
+            numeric = NumericScan(text)
+
+            # Heuristic for experience years
+            exp_years = numeric.experience_years()
+
+            # Segment once; the line-based extractors share this document
+            doc = ResumeDocument(text)
+
+            # Heuristic for internships
+            internships = []
+            # Look for lines containing 'intern' and keep them as entries
+            for i in sorted(doc.lines_with_any(INTERNSHIP_KEYWORDS)):
+                if len(doc.stripped[i]) > 10:
+                    internships.append(doc.stripped[i])
+
+            # Run specialized extractors
+            extracted = {
+                'skills': skills,
+                'education': education,
+                'experience': experience_text,
+                'languages': languages,
+                'projects': self.project_extractor.extract(doc),
+                'achievements': self.achievement_extractor.extract(doc),
+                'cgpa': self.cgpa_extractor.extract(numeric),
+                'school_marks_avg': self.school_extractor.extract_school_marks(numeric),
+                'online_presence': self.online_extractor.extract(numeric),
+                'extra_curricular': self.ec_extractor.extract(doc),
+                'degree_type': self.degree_classifier.get_highest_degree(doc),
+                'college_tier': self.college_ranker.get_tier(' '.join(education) if education else text),
+                'experience_years': exp_years,
+                'internships': internships
+            }
+
+            # Calculate score
+            score = self.scorer.calculate_score(extracted)
+
+            record = {
+                'filename': filename,
+                'full_text': text,
+                'score': score,
+                **extracted
+            }
+            if not ai_skills_ok:
+                record['ai_skills_ok'] = False
+            return record
+        except Exception as e:
+            print(f"Error processing {filename}: {e}")
+            return None
+
+    def build_record_sync(self, filename, text, entities, ai_skills=None, ai_requested=False):
+        return asyncio.run(self.build_record(filename, text, entities, ai_skills=ai_skills, ai_requested=ai_requested))
+
+    def rescore(self, filename, extracted):
+        """Rebuild a full record from cached fields (everything but filename and score)"""
+        text = extracted.get('full_text', '')
+        fields = {k: v for k, v in extracted.items() if k != 'full_text'}
+        return {
+            'filename': filename,
+            'full_text': text,
+            'score': self.scorer.calculate_score(fields),
+            **fields
+        }
@@ -1,78 +1,229 @@
 import asyncio
+import contextvars
+import heapq
+import math
 import os
 from concurrent.futures import ThreadPoolExecutor
 import time
-from pathlib import Path
-import json
-import spacy
-import pdfplumber
-import docx2txt
-import io
-import re
-
-from scoring.scorer import ResumeScorer
-from extraction.project_extractor import ProjectExtractor
-from extraction.achievement_extractor import AchievementExtractor
-from extraction.cgpa_extractor import CGPAExtractor
-from extraction.school_marks import SchoolMarksExtractor
-from extraction.online_presence import OnlinePresenceExtractor
-from extraction.extra_curricular import ExtraCurricularExtractor
-from extraction.degree_classifier import DegreeClassifier
-from extraction.college_ranker import CollegeRanker
-from extraction.skill_filter import SkillFilter
+
+from ai_scheduler import set_budget_share
+from batch.ingest import content_source, worker_payload
+from batch.components import LazyComponent
+from batch.insights import InsightsQueue
+from batch.pipeline import PARSE_COMPONENTS, WARMUP_TEXT, ResumePipeline
+from batch.ranking import RankingStore
+from batch.workers import create_process_pool, parse_resumes, warm_up
 from matcher.jd_parser import JDParser
-from matcher.tfidf_matcher import TFIDFJobMatcher
-from matcher.semantic_matcher import SemanticJobMatcher
-from ai_engine import AIInsightsEngine
+from matcher.job_profile import JobProfile
+from storage.candidate_pool import candidate_id_for
+from storage.llm_cache import track_request
+
+BACKENDS = ('thread', 'process')
+# Components JD matching needs on top of PARSE_COMPONENTS
+MATCH_COMPONENTS = ('tfidf_matcher', 'semantic_model', 'ai_insights')
 
 class BatchResumeProcessor:
-    def __init__(self, model_path="./model"):
-        self.scorer = ResumeScorer()
-        try:
-            self.nlp = spacy.load(model_path)
-        except Exception:
-            # Fallback if specific model is not found, though should be there
-            self.nlp = None
-        
-        # Initialize extractors
-        self.project_extractor = ProjectExtractor()
-        self.achievement_extractor = AchievementExtractor()
-        self.cgpa_extractor = CGPAExtractor()
-        self.school_extractor = SchoolMarksExtractor()
-        self.online_extractor = OnlinePresenceExtractor()
-        self.ec_extractor = ExtraCurricularExtractor()
-        self.degree_classifier = DegreeClassifier()
-        # Initialize with the directory containing all NIRF CSVs
-        self.college_ranker = CollegeRanker('./data')
-        self.skill_filter = SkillFilter()
+    def __init__(self, model_path="./model", rankings_dir='./data',
+                 backend='thread', max_workers=None, start_method=None,
+                 nlp_batch_size=32, nlp_n_process=1, parse_cache=None,
+                 pdf_backend='pdfplumber', embedding_cache=None, candidate_pool=None,
+                 ranking_sessions=64, ranking_ttl=1800, semantic_backend='torch',
+                 semantic_onnx_dir=None, llm_cache=None, insights_workers=4, insights_jobs=64,
+                 insights_ttl=1800, job_store=None):
+        """
+        Args:
+            backend: 'thread' runs every resume in this process (GIL-bound),
+                     'process' fans out to worker processes that each pre-load the pipeline
+            max_workers: Worker count for the chosen backend
+            start_method: multiprocessing start method for the process backend
+            nlp_batch_size: Texts per nlp.pipe batch in the batch NER stage
+            nlp_n_process: spaCy processes for the thread backend's NER stage
+            parse_cache: Optional ParseCache; repeat uploads skip straight to scoring
+            pdf_backend: Text extraction backend for PDFs ('pdfplumber', 'pdfminer', 'parallel')
+            embedding_cache: Optional EmbeddingStore for the semantic matcher
+            candidate_pool: Optional CandidatePool that /pool uploads are kept in
+            ranking_sessions/ranking_ttl: Paged rankings kept server-side (count, idle seconds)
+            semantic_backend: Semantic model inference backend ('torch', 'int8', 'onnx')
+            semantic_onnx_dir: Directory for the exported ONNX graph
+            llm_cache: Optional LLMResponseCache for Gemini responses (thread backend only;
+                       process workers call Gemini uncached)
+            insights_workers: Candidates the deferred-insights queue works on at once
+            insights_jobs/insights_ttl: Deferred-insights jobs kept for polling (count, idle seconds)
+            job_store: Optional JobProfileStore; registered profiles embedded after
+                       registration are written back so they are encoded only once
+        """
+        self.model_path = model_path
+        self.rankings_dir = rankings_dir
+        self.nlp_batch_size = nlp_batch_size
+        self.pdf_backend = pdf_backend
+        self.pipeline = ResumePipeline(
+            model_path=model_path,
+            rankings_dir=rankings_dir,
+            nlp_batch_size=nlp_batch_size,
+            nlp_n_process=nlp_n_process,
+            pdf_backend=pdf_backend,
+            llm_cache=llm_cache
+        )
+        self.llm_cache = llm_cache
+        self.components = self.pipeline.components
+        self.parse_cache = parse_cache
+        self.candidate_pool = candidate_pool
+        self.job_store = job_store
+        self.embedding_cache = embedding_cache
+        self.rankings = RankingStore(max_sessions=ranking_sessions, ttl_seconds=ranking_ttl)
+        self.insights = InsightsQueue(
+            lambda: self.ai_insights, workers=insights_workers, max_jobs=insights_jobs, ttl_seconds=insights_ttl
+        )
+
         self.jd_parser = JDParser()
-        self.job_matcher = TFIDFJobMatcher()
-        try:
-            self.semantic_matcher = SemanticJobMatcher()
-        except Exception as e:
-            print(f"[WARNING] Semantic matcher unavailable - falling back to TF-IDF only: {e}")
-            self.semantic_matcher = None
-        self.ai_insights = AIInsightsEngine(api_key=os.getenv('GEMINI_API_KEY'))
-        
-        self.executor = ThreadPoolExecutor(max_workers=10)
-    
+        self._job_matcher = self.components.register(LazyComponent(
+            'tfidf_matcher', self._load_job_matcher,
+            warmup=lambda m: m.match_batch([WARMUP_TEXT], "Hiring a backend developer who knows SQL")
+        ))
+        # A failed load leaves semantic_matcher as None (TF-IDF only)
+        self._semantic_matcher = self.components.register(LazyComponent(
+            'semantic_model', lambda: self._load_semantic_matcher(
+                embedding_cache, semantic_backend, semantic_onnx_dir
+            ),
+            warmup=lambda m: m.warm_up(),
+            required=False
+        ))
+
+        self.max_workers = max_workers
+        self.start_method = start_method
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or 10)
+        self.process_pool = None
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown batch backend '{backend}', expected one of {BACKENDS}")
+        # The worker processes are started by warm_up() or the first batch
+        # A pool that fails to start leaves batches on the thread backend
+        self._process_workers = LazyComponent('process_workers', self._get_process_pool, required=False)
+        self.backend = backend
+        if backend == 'process':
+            self.components.register(self._process_workers)
+
+    @staticmethod
+    def _load_job_matcher():
+        # Imported here so startup does not pay for scikit-learn
+        from matcher.tfidf_matcher import TFIDFJobMatcher
+
+        return TFIDFJobMatcher()
+
+    @staticmethod
+    def _load_semantic_matcher(embedding_cache, backend, onnx_dir):
+        # Imported here so startup does not pay for torch / sentence-transformers
+        from matcher.semantic_matcher import SemanticJobMatcher
+
+        return SemanticJobMatcher(embedding_cache=embedding_cache, backend=backend, onnx_dir=onnx_dir)
+
+    @property
+    def job_matcher(self):
+        return self._job_matcher.get()
+
+    @property
+    def semantic_matcher(self):
+        return self._semantic_matcher.get()
+
+    @property
+    def ai_insights(self):
+        return self.pipeline.ai_insights
+
     def is_model_loaded(self):
-        return self.nlp is not None
+        return self.components['spacy_ner'].peek() is not None
+
+    def ai_status(self):
+        """Gemini scheduler budgets, queue and circuit state; None until the engine is loaded"""
+        engine = self.components['ai_insights'].peek()
+        if engine is None or not engine.available:
+            return None
+        return engine.scheduler.status()
+
+    def warm_up(self, background=True):
+        """
+        Load every component (and run one throwaway inference on each) so the
+        first request is not slow; in the background unless asked otherwise
+        """
+        if background:
+            return self.components.start_warmup()
+        return self.components.warm_up()
+
+    async def ensure_ready(self, *names):
+        """Wait (off the event loop) until the named components are loaded"""
+        for name in names:
+            if name in self.components.components:
+                await self.components[name].aget()
+
+    def set_backend(self, backend):
+        """Switch between the 'thread' and 'process' execution backends at runtime"""
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown batch backend '{backend}', expected one of {BACKENDS}")
+        self.backend = backend
+        if backend == 'process':
+            self.components.register(self._process_workers).get()
+
+    def _get_process_pool(self):
+        if self.process_pool is None:
+            workers = self.max_workers or os.cpu_count() or 1
+            # The parent keeps calling Gemini (insights) next to the workers
+            set_budget_share(workers + 1)
+            self.process_pool = create_process_pool(
+                self.model_path,
+                self.rankings_dir,
+                max_workers=workers,
+                start_method=self.start_method,
+                nlp_batch_size=self.nlp_batch_size,
+                pdf_backend=self.pdf_backend
+            )
+            warm_up(self.process_pool, workers)
+            print(f"[SUCCESS] Process backend ready with {workers} pre-warmed workers")
+        return self.process_pool
+
+    def close(self):
+        self.insights.close()
+        self.executor.shutdown(wait=False)
+        self.pipeline.text_extractor.close()
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=True, cancel_futures=True)
+            self.process_pool = None
+        if self.parse_cache is not None:
+            self.parse_cache.close()
+        # The store is closed even if the semantic model was never loaded
+        semantic_matcher = self._semantic_matcher.peek()
+        embedding_cache = semantic_matcher.embedding_cache if semantic_matcher is not None else self.embedding_cache
+        if embedding_cache is not None:
+            embedding_cache.close()
+        if self.candidate_pool is not None:
+            self.candidate_pool.close()
+        if self.llm_cache is not None:
+            self.llm_cache.close()
     
-    async def process_batch(self, files):
+    def _resolve_backend(self, backend):
+        backend = backend or self.backend
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown batch backend '{backend}', expected one of {BACKENDS}")
+        return backend
+
+    async def process_batch(self, files, backend=None, limit=None):
+        """
+        Parse and rank resumes. With a limit only the top `limit` are ranked and
+        returned; the rest stay in a server-side session reachable via
+        result['page']['next_cursor'] and next_page().
+        """
         start = time.time()
+        backend = self._resolve_backend(backend)
         
-        loop = asyncio.get_event_loop()
-        tasks = [
-            loop.run_in_executor(self.executor, self._process_single_sync, file_name, file_content)
-            for file_name, file_content in files
-        ]
-        
-        results = await asyncio.gather(*tasks)
-        
+        counters = self._new_counters()
         # Filter out errors
-        results = [r for r in results if r is not None]
+        results = [r async for r in self._iter_parsed(files, backend, counters) if r is not None]
         
+        if limit:
+            page, page_info = self.rankings.create(results, key=lambda x: x['score']['total'], limit=limit)
+            return {
+                'results': page,
+                'page': page_info,
+                'stats': self._batch_stats(results, time.time() - start, backend, counters)
+            }
+
         # Rank results
         ranked = self._rank_candidates(results)
         
@@ -80,109 +231,247 @@ class BatchResumeProcessor:
         
         return {
             'results': ranked,
-            'stats': {
-                'count': len(ranked),
-                'time_seconds': round(elapsed, 2),
-                'avg_per_resume': round(elapsed / max(len(ranked), 1), 3),
-                'max_score': max([r['score']['total'] for r in ranked]) if ranked else 0,
-                'min_score': min([r['score']['total'] for r in ranked]) if ranked else 0,
-                'avg_score': round(sum([r['score']['total'] for r in ranked]) / max(len(ranked), 1), 2) if ranked else 0
-            }
+            'stats': self._batch_stats(ranked, elapsed, backend, counters)
         }
+
+    async def next_page(self, cursor, limit=20):
+        """
+        Next page of a ranking created with a limit (KeyError once the session expired).
+        Match rankings get AI insights for the page the same way the first page did.
+        """
+        page, page_info, context = self.rankings.page_with_context(cursor, limit)
+        result = {'results': page, 'page': page_info}
+        await self._page_insights(result, context)
+        return result
+
+    async def _page_insights(self, result, context):
+        """Attach (or queue, when deferred) AI insights for one page of a match ranking"""
+        if not context.get('include_ai_insights'):
+            return
+        page = result['results']
+        if context.get('defer_ai_insights'):
+            result['insights'] = self.insights.submit(page, context['profile'].text)
+        else:
+            # A page read again keeps the insights it already got
+            pending = [res for res in page if 'ai_insights' not in res]
+            if pending:
+                await self._attach_insights_async(pending, context['profile'])
+
+    def _new_counters(self):
+        # Also starts this request's LLM cache counters
+        track_request()
+        return {'cache_hits': 0, 'cache_misses': 0}
+
+    def _with_ai_cache(self, stats):
+        """Add the current request's LLM cache hits/misses to a stats dict"""
+        if self.llm_cache is not None:
+            stats['ai_cache'] = track_request().as_dict()
+        return stats
+
+    def _batch_stats(self, ranked, elapsed, backend, counters):
+        return self._with_ai_cache({
+            'count': len(ranked),
+            'backend': backend,
+            **counters,
+            'time_seconds': round(elapsed, 2),
+            'avg_per_resume': round(elapsed / max(len(ranked), 1), 3),
+            'max_score': max([r['score']['total'] for r in ranked]) if ranked else 0,
+            'min_score': min([r['score']['total'] for r in ranked]) if ranked else 0,
+            'avg_score': round(sum([r['score']['total'] for r in ranked]) / max(len(ranked), 1), 2) if ranked else 0
+        })
+
+    def _chunk_files(self, files, backend):
+        """
+        Chunks are the unit of work handed to a worker: each one gets a single
+        nlp.pipe pass, and its records are released as soon as it finishes.
+        """
+        chunk_size = self.nlp_batch_size
+        if backend == 'process':
+            # Spread small batches over every worker instead of filling one chunk
+            workers = self.max_workers or os.cpu_count() or 1
+            chunk_size = min(chunk_size, math.ceil(len(files) / workers))
+        chunk_size = max(1, chunk_size)
+        return [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+
+    async def _iter_parsed(self, files, backend, counters):
+        """
+        Yield parsed records (or None for failed files) in completion order.
+        Parse-cache hits come out first; every chunk of misses runs concurrently
+        on the chosen backend and is written back to the cache when it finishes.
+        """
+        files = list(files)
+        if not files:
+            return
+        await self.ensure_ready(*PARSE_COMPONENTS)
+
+        loop = asyncio.get_event_loop()
+        queue = asyncio.Queue()
+        cache = self.parse_cache
+
+        misses = []
+        miss_keys = []
+        for file_name, file_content in files:
+            key = cache.key_for(file_content) if cache is not None else None
+            cached = cache.get(key) if key is not None else None
+            if cached is not None:
+                counters['cache_hits'] += 1
+                queue.put_nowait(self.pipeline.rescore(file_name, cached))
+                continue
+            if cache is not None:
+                counters['cache_misses'] += 1
+            misses.append((file_name, file_content))
+            miss_keys.append(key)
+
+        pool = None
+        if backend == 'process' and misses:
+            # A pool that failed to start leaves the batch on the thread backend
+            pool = await self._process_workers.aget()
+        # Bound the chunks in flight so only a few are materialised at once
+        if pool is not None:
+            workers = self.max_workers or os.cpu_count() or 1
+        else:
+            workers = self.max_workers or 10
+        in_flight = asyncio.Semaphore(max(2, workers * 2))
+
+        async def run(chunk, keys):
+            try:
+                async with in_flight:
+                    if pool is not None:
+                        # Spooled uploads go by path; workers map the file themselves
+                        payload = [(name, worker_payload(content)) for name, content in chunk]
+                        results = await loop.run_in_executor(pool, parse_resumes, payload)
+                    else:
+                        payload = [(name, content_source(content)) for name, content in chunk]
+                        results = await self._parse_in_threads(payload)
+            except Exception as e:
+                # A crashed worker surfaces here as an exception for its whole chunk
+                print(f"Error in batch worker ({len(chunk)} resumes lost): {e}")
+                results = [None] * len(chunk)
+            for key, res in zip(keys, results):
+                if res is not None and key is not None:
+                    cache.set(key, res)
+                queue.put_nowait(res)
+
+        tasks = []
+        offset = 0
+        for chunk in self._chunk_files(misses, backend):
+            keys = miss_keys[offset:offset + len(chunk)]
+            offset += len(chunk)
+            tasks.append(asyncio.ensure_future(run(chunk, keys)))
+        try:
+            for _ in range(len(files)):
+                yield await queue.get()
+        finally:
+            # The consumer may stop early (e.g. a streaming client disconnects)
+            for task in tasks:
+                task.cancel()
     
+    async def _parse_in_threads(self, files):
+        """
+        Three stages: text extraction on the thread pool, one batched nlp.pipe
+        pass over every text, then the extractors on the thread pool again.
+        """
+        loop = asyncio.get_event_loop()
+        pipeline = self.pipeline
+
+        async def extract(file_name, file_content):
+            try:
+                return await loop.run_in_executor(self.executor, pipeline.extract_text, file_name, file_content)
+            except Exception as e:
+                print(f"Error processing {file_name}: {e}")
+                return None
+
+        texts = await asyncio.gather(*[extract(name, content) for name, content in files])
+        ok = [i for i, t in enumerate(texts) if t is not None]
+        # Gemini skill extraction (batched prompts) overlaps the NER pass
+        entities, ai_skills = await asyncio.gather(
+            loop.run_in_executor(self.executor, pipeline.extract_entities, [texts[i] for i in ok]),
+            pipeline.extract_ai_skills([texts[i] for i in ok])
+        )
+
+        results = [None] * len(files)
+        # The request context carries the LLM cache counters into the workers
+        records = await asyncio.gather(*[
+            loop.run_in_executor(
+                self.executor, contextvars.copy_context().run,
+                pipeline.build_record_sync, files[i][0], texts[i], ents, skills, True
+            )
+            for i, ents, skills in zip(ok, entities, ai_skills)
+        ])
+        for i, record in zip(ok, records):
+            results[i] = record
+        return results
+
+    async def stream_batch(self, files, backend=None, progress_every=10, top_n=10):
+        """
+        Streaming variant of process_batch. Yields event dicts:
+            candidate - one parsed resume, as soon as its chunk finishes
+            progress  - every `progress_every` candidates: provisional top-N and running stats
+            summary   - final ranking (filename/score/rank only) and stats
+        """
+        start = time.time()
+        backend = self._resolve_backend(backend)
+        files = list(files)
+        total = len(files)
+        done = 0
+        parsed = []
+        counters = self._new_counters()
+
+        async for res in self._iter_parsed(files, backend, counters):
+            done += 1
+            if res is not None:
+                parsed.append(self._ranking_entry(res, res['score']['total']))
+                yield {'type': 'candidate', 'completed': done, 'total': total, 'candidate': res}
+            if done % progress_every == 0 and done < total:
+                yield self._progress_event(parsed, done, total, start, backend, counters, top_n)
+
+        ranking = self._rank_entries(parsed)
+        yield {
+            'type': 'summary',
+            'completed': done,
+            'total': total,
+            'ranking': ranking,
+            'stats': self._entry_stats(ranking, time.time() - start, backend, counters)
+        }
+
+    def _ranking_entry(self, res, score):
+        return {'filename': res['filename'], 'score': score, 'resume_score': res['score']['total']}
+
+    def _rank_entries(self, entries):
+        ranked = sorted(entries, key=lambda x: x['score'], reverse=True)
+        return [dict(entry, rank=i) for i, entry in enumerate(ranked, 1)]
+
+    def _entry_stats(self, ranking, elapsed, backend, counters):
+        scores = [e['score'] for e in ranking]
+        return self._with_ai_cache({
+            'count': len(ranking),
+            'backend': backend,
+            **counters,
+            'time_seconds': round(elapsed, 2),
+            'avg_per_resume': round(elapsed / max(len(ranking), 1), 3),
+            'max_score': max(scores) if scores else 0,
+            'min_score': min(scores) if scores else 0,
+            'avg_score': round(sum(scores) / len(scores), 2) if scores else 0
+        })
+
+    def _progress_event(self, entries, done, total, start, backend, counters, top_n):
+        # Only the provisional top-N is ordered; stats don't need a sort
+        leaders = heapq.nlargest(top_n, entries, key=lambda x: x['score'])
+        return {
+            'type': 'progress',
+            'completed': done,
+            'total': total,
+            'provisional_ranking': [dict(entry, rank=i) for i, entry in enumerate(leaders, 1)],
+            'stats': self._entry_stats(entries, time.time() - start, backend, counters)
+        }
+
     async def _process_single(self, filename, content):
-        try:
-            # Extract text
-            if filename.lower().endswith('.pdf'):
-                text = self._extract_pdf(content)
-            elif filename.lower().endswith('.docx'):
-                text = self._extract_docx(content)
-            else:
-                text = content.decode('utf-8', errors='ignore')
-            
-            # Run NLP
-            doc = self.nlp(text) if self.nlp else None
-            
-            # Extract basic entities from spaCy
-            spacy_skills = [ent.text for ent in doc.ents if ent.label_ == 'Skill'] if doc else []
-            education = [ent.text for ent in doc.ents if ent.label_ == 'Education'] if doc else []
-            
-            # AI Skill Enrichment (Crucial Fix for "0 AI Skills")
-            ai_skills = []
-            if self.ai_insights.available:
-                # If spacy finds very few skills, or even if it finds some, let's enrich
-                ai_skills = await self.ai_insights.extract_skills(text)
-            
-            # Combine and remove duplicates
-            combined_skills = list(set(spacy_skills + ai_skills))
-            
-            # Filter skills to remove college names and academic noise
-            skills = self.skill_filter.filter_skills(combined_skills, education)
-            
-            experience_text = [ent.text for ent in doc.ents if ent.label_ == 'Work_Experience'] if doc else []
-            languages = [ent.text for ent in doc.ents if ent.label_ == 'Language'] if doc else []
-            
-            # Heuristic for experience years
-            exp_years = 0
-            exp_match = re.search(r'(\d+(?:\.\d+)?)\+?\s*years?\s*(?:of\s*)?experience', text, re.IGNORECASE)
-            if exp_match:
-                exp_years = float(exp_match.group(1))
-            
-            # Heuristic for internships
-            internships = []
-            # Look for lines containing 'intern' and keep them as entries
-            for line in text.split('\n'):
-                if 'intern' in line.lower() and len(line.strip()) > 10:
-                    internships.append(line.strip())
-
-            # Run specialized extractors
-            extracted = {
-                'skills': skills,
-                'education': education,
-                'experience': experience_text,
-                'languages': languages,
-                'projects': self.project_extractor.extract(text),
-                'achievements': self.achievement_extractor.extract(text),
-                'cgpa': self.cgpa_extractor.extract(text),
-                'school_marks_avg': self.school_extractor.extract_school_marks(text),
-                'online_presence': self.online_extractor.extract(text),
-                'extra_curricular': self.ec_extractor.extract(text),
-                'degree_type': self.degree_classifier.get_highest_degree(text),
-                'college_tier': self.college_ranker.get_tier(' '.join(education) if education else text),
-                'experience_years': exp_years,
-                'internships': internships
-            }
-            
-            # Calculate score
-            score = self.scorer.calculate_score(extracted)
-            
-            return {
-                'filename': filename,
-                'full_text': text,
-                'score': score,
-                **extracted
-            }
-        except Exception as e:
-            print(f"Error processing {filename}: {e}")
-            return None
+        await self.ensure_ready(*PARSE_COMPONENTS)
+        return await self.pipeline.parse(filename, content_source(content))
     
     # Keeping sync version for internal calls if necessary, but shifting to async
     def _process_single_sync(self, filename, content):
-        return asyncio.run(self._process_single(filename, content))
-    
-    def _extract_pdf(self, content):
-        with io.BytesIO(content) as f:
-            with pdfplumber.open(f) as pdf:
-                text = []
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text.append(page_text)
-                return '\n'.join(text)
-    
-    def _extract_docx(self, content):
-        with io.BytesIO(content) as f:
-            return docx2txt.process(f)
+        return self.pipeline.parse_sync(filename, content)
     
     def _rank_candidates(self, candidates):
         """Sort by score with tie-breaking"""
@@ -197,57 +486,173 @@ class BatchResumeProcessor:
         
         return sorted_cands
 
-    async def match_with_jd(self, files, job_description, include_ai_insights=True):
-        """Match resumes against job description using Hybrid (TF-IDF + Semantic) matching"""
-        # Parse job description
-        jd_data = self.jd_parser.parse_job_description(job_description)
-        jd_skills = jd_data['required_skills']
-        jd_exp = jd_data['years_experience']
+    def build_job_profile(self, job_description):
+        """Compile a JD once: parsed requirements, TF-IDF terms and, if available, embeddings"""
+        requirements = self.jd_parser.parse_job_description(job_description)
+        requirements.pop('full_text', None)
+        profile = JobProfile(
+            job_description,
+            requirements,
+            self.job_matcher.analyze(job_description)
+        )
+        self._embed_job_profile(profile)
+        return profile
+
+    def _embed_job_profile(self, profile):
+        """(Re)compute JD embeddings when the semantic model is up and they are missing or stale"""
+        matcher = self.semantic_matcher
+        if matcher is None or not matcher.available:
+            return profile
+        model_name = matcher.embedding_cache.namespace
+        if profile.has_embeddings(model_name):
+            return profile
+        profile.jd_embedding = matcher.get_embeddings([profile.text])[0]
+        if profile.skills:
+            profile.skill_embeddings = matcher.get_embeddings(profile.skills)
+        profile.embedding_model = model_name
+        return profile
+
+    def _as_job_profile(self, job):
+        """job: JD text or an already compiled JobProfile"""
+        if isinstance(job, JobProfile):
+            model_name = job.embedding_model
+            self._embed_job_profile(job)
+            if job.embedding_model != model_name and self.job_store is not None:
+                # Registered before the semantic model was up (or under another model)
+                self.job_store.update(job)
+            return job
+        return self.build_job_profile(job)
+
+    def _match_candidate(self, res, profile, tfidf, include_ai_insights=True):
+        """
+        Attach job_match (and optionally ai_insights) to one parsed resume
+        tfidf: {'similarity', 'top_terms'} from a TF-IDF fit (see _match_records)
+        """
+        job_description = profile.text
+        jd_skills = profile.skills
+        resume_skills = res.get('skills', [])
+        resume_exp = res.get('experience_years', 0)
+        resume_text = res.get('full_text', "") 
         
-        # Process resumes to get basic features
-        results = await self.process_batch(files)
+        # 1. TF-IDF match (Legacy/Baseline)
+        tfidf_match = tfidf['similarity']
         
-        # Add matches using Hybrid and Semantic Matchers
-        for res in results['results']:
-            resume_skills = res.get('skills', [])
-            resume_exp = res.get('experience_years', 0)
-            resume_text = res.get('full_text', "") 
-            
-            # 1. TF-IDF match (Legacy/Baseline)
-            tfidf_match = self.job_matcher.calculate_similarity(resume_text, job_description)
-            
-            # 2. Semantic Hybrid match
-            semantic_res = self.semantic_matcher.hybrid_match(
-                resume_text=resume_text,
-                jd_text=job_description,
-                resume_skills=resume_skills,
-                jd_skills=jd_skills,
-                tfidf_score=tfidf_match
-            )
-            
-            # 3. Comprehensive match (Existing logic but enhanced)
-            match_res = self.job_matcher.comprehensive_match(
-                resume_text=resume_text,
-                jd_text=job_description,
-                resume_skills=set([s.lower() for s in resume_skills]),
-                jd_skills=set([s.lower() for s in jd_skills]),
-                resume_exp=resume_exp,
-                jd_exp=jd_exp
+        # 2. Semantic Hybrid match
+        semantic_res = self.semantic_matcher.hybrid_match(
+            resume_text=resume_text,
+            jd_text=job_description,
+            resume_skills=resume_skills,
+            jd_skills=jd_skills,
+            tfidf_score=tfidf_match,
+            jd_embedding=profile.jd_embedding,
+            jd_skill_embeddings=profile.skill_embeddings
+        )
+        
+        # 3. Comprehensive match (Existing logic but enhanced)
+        match_res = self.job_matcher.comprehensive_match(
+            resume_text=resume_text,
+            jd_text=job_description,
+            resume_skills=set([s.lower() for s in resume_skills]),
+            jd_skills=set([s.lower() for s in jd_skills]),
+            resume_exp=resume_exp,
+            jd_exp=profile.years_experience,
+            tfidf_score=tfidf_match,
+            top_terms=tfidf['top_terms']
+        )
+        
+        res['job_match'] = {
+            'score': semantic_res['hybrid_score'], # Upgrade to Hybrid Score as primary
+            'tfidf_similarity': round(tfidf_match * 100, 2),
+            'semantic_similarity': semantic_res['semantic_similarity'],
+            'matching_skills': semantic_res['skill_match']['matched_skills'],
+            'skill_analysis': semantic_res['skill_match'],
+            'experience_match': match_res['experience_match'],
+            'top_terms': match_res['top_terms']
+        }
+
+        # 4. AI Insights (SWOT & Interview Questions)
+        if include_ai_insights:
+            self._attach_insights(res, profile)
+        return res
+
+    def _attach_insights(self, res, profile):
+        res['ai_insights'] = self.ai_insights.analyze_candidate(
+            res.get('full_text', ""), profile.text, skills=res.get('skills', [])
+        )
+        return res
+
+    async def _attach_insights_async(self, records, profile):
+        """AI insights for many candidates concurrently (bounded by the engine's limit)"""
+        insights = await self.ai_insights.analyze_candidates_async([
+            {'resume_text': res.get('full_text', ""), 'jd_text': profile.text, 'skills': res.get('skills', [])}
+            for res in records
+        ])
+        for res, result in zip(records, insights):
+            res['ai_insights'] = result
+        return records
+
+    def _match_records(self, records, profile, include_ai_insights=True):
+        """Match a list of parsed resumes with one TF-IDF fit over all of them plus the JD"""
+        tfidf = self.job_matcher.match_batch(
+            [res.get('full_text', "") for res in records],
+            profile.text,
+            jd_terms=profile.tfidf_terms
+        )
+        for i, res in enumerate(records):
+            self._match_candidate(res, profile, {
+                'similarity': tfidf['similarities'][i],
+                'top_terms': {'resume': tfidf['resume_terms'][i], 'job': tfidf['job_terms']}
+            }, include_ai_insights=include_ai_insights)
+        return records
+
+    async def match_with_jd(self, files, job_description, include_ai_insights=True, backend=None,
+                            limit=None, defer_ai_insights=False):
+        """
+        Match resumes against job description using Hybrid (TF-IDF + Semantic) matching
+        job_description: JD text or a registered JobProfile
+        limit: return only the top `limit` by match score (their 'rank' is the match
+               rank) and keep the rest server-side for next_page()
+        defer_ai_insights: return without insights; they are generated in the
+               background and fetched via result['insights']['insights_id']
+        """
+        # Parse job description (or reuse the compiled profile); TF-IDF fits and
+        # encodes run on the executor so other requests keep being served
+        await self.ensure_ready(*MATCH_COMPONENTS)
+        loop = asyncio.get_running_loop()
+        profile = await loop.run_in_executor(self.executor, self._as_job_profile, job_description)
+        
+        if limit:
+            start = time.time()
+            backend = self._resolve_backend(backend)
+            counters = self._new_counters()
+            parsed = [r async for r in self._iter_parsed(files, backend, counters) if r is not None]
+            # AI insights only for candidates that make it onto a page
+            await loop.run_in_executor(self.executor, self._match_records, parsed, profile, False)
+            # Later pages (next_page) get their insights the same way as this one
+            context = {
+                'include_ai_insights': include_ai_insights,
+                'defer_ai_insights': defer_ai_insights,
+                'profile': profile
+            }
+            page, page_info = self.rankings.create(
+                parsed, key=lambda x: x['job_match']['score'], limit=limit, context=context
             )
-            
-            res['job_match'] = {
-                'score': semantic_res['hybrid_score'], # Upgrade to Hybrid Score as primary
-                'tfidf_similarity': round(tfidf_match * 100, 2),
-                'semantic_similarity': semantic_res['semantic_similarity'],
-                'matching_skills': semantic_res['skill_match']['matched_skills'],
-                'skill_analysis': semantic_res['skill_match'],
-                'experience_match': match_res['experience_match'],
-                'top_terms': match_res['top_terms']
+            result = {
+                'results': page,
+                'page': page_info
             }
+            await self._page_insights(result, context)
+            result['stats'] = self._batch_stats(parsed, time.time() - start, backend, counters)
+            return result
 
-            # 4. AI Insights (SWOT & Interview Questions)
-            if include_ai_insights:
-                res['ai_insights'] = self.ai_insights.analyze_candidate(resume_text, job_description, skills=resume_skills)
+        # Process resumes to get basic features
+        results = await self.process_batch(files, backend=backend)
+        
+        # Add matches using Hybrid and Semantic Matchers
+        await loop.run_in_executor(self.executor, self._match_records, results['results'], profile, False)
+        if include_ai_insights and not defer_ai_insights:
+            await self._attach_insights_async(results['results'], profile)
+            self._with_ai_cache(results['stats'])
         
         # Re-rank by hybrid match score
         results['results'] = sorted(
@@ -255,5 +660,195 @@ class BatchResumeProcessor:
             key=lambda x: x['job_match']['score'],
             reverse=True
         )
+        if include_ai_insights and defer_ai_insights:
+            # Queued in match order, so the best candidates get their insights first
+            results['insights'] = self.insights.submit(results['results'], profile.text)
         
         return results
+
+    async def stream_match_with_jd(self, files, job_description, include_ai_insights=True,
+                                   backend=None, progress_every=10, top_n=10):
+        """
+        Streaming variant of match_with_jd: each candidate is matched as soon as
+        it is parsed, and provisional rankings use its hybrid match score. Yields:
+            candidate - one matched resume ('index' in stream order); its job_match
+                        is marked provisional
+            insight   - AI insights for the candidate with that 'index', as each
+                        finishes (the calls run concurrently, up to the engine's limit)
+            progress  - provisional top-N and running stats
+            summary   - final ranking with each candidate's final job_match
+        TF-IDF IDF depends on the whole batch, so the final ranking re-matches every
+        candidate with one batch-wide fit and agrees with match_with_jd.
+        """
+        start = time.time()
+        backend = self._resolve_backend(backend)
+        await self.ensure_ready(*MATCH_COMPONENTS)
+        loop = asyncio.get_running_loop()
+        profile = await loop.run_in_executor(self.executor, self._as_job_profile, job_description)
+        files = list(files)
+        total = len(files)
+        done = 0
+        matched = []
+        records = []
+        pending = set()
+        counters = self._new_counters()
+
+        async def insight(index, res):
+            try:
+                await self._attach_insights_async([res], profile)
+            except Exception as e:
+                print(f"Error generating insights for {res.get('filename')}: {e}")
+                res['ai_insights'] = None
+            return {'type': 'insight', 'index': index, 'filename': res.get('filename'),
+                    'ai_insights': res['ai_insights']}
+
+        def finished_insights():
+            ready = [task for task in pending if task.done()]
+            pending.difference_update(ready)
+            return [task.result() for task in ready]
+
+        try:
+            async for res in self._iter_parsed(files, backend, counters):
+                done += 1
+                if res is not None:
+                    await loop.run_in_executor(self.executor, self._match_records, [res], profile, False)
+                    # One-document TF-IDF until the batch-wide fit below
+                    res['job_match']['provisional'] = True
+                    index = len(records)
+                    records.append(res)
+                    matched.append(self._ranking_entry(res, res['job_match']['score']))
+                    yield {'type': 'candidate', 'index': index, 'completed': done, 'total': total, 'candidate': res}
+                    if include_ai_insights:
+                        pending.add(asyncio.ensure_future(insight(index, res)))
+                for event in finished_insights():
+                    yield event
+                if done % progress_every == 0 and done < total:
+                    yield self._progress_event(matched, done, total, start, backend, counters, top_n)
+
+            await loop.run_in_executor(self.executor, self._match_records, records, profile, False)
+            while pending:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for event in finished_insights():
+                    yield event
+        finally:
+            # Client went away mid-stream
+            for task in pending:
+                task.cancel()
+
+        ranking = self._rank_entries([
+            dict(self._ranking_entry(res, res['job_match']['score']), job_match=res['job_match'])
+            for res in records
+        ])
+        yield {
+            'type': 'summary',
+            'completed': done,
+            'total': total,
+            'ranking': ranking,
+            'stats': self._entry_stats(ranking, time.time() - start, backend, counters)
+        }
+
+    def _semantic_model_name(self):
+        matcher = self.semantic_matcher
+        if matcher is None or not matcher.available:
+            return None
+        return matcher.embedding_cache.namespace
+
+    def _require_pool(self):
+        if self.candidate_pool is None:
+            raise ValueError("Candidate pool is disabled")
+        return self.candidate_pool
+
+    async def add_to_pool(self, files, backend=None):
+        """Parse resumes and keep them (with their embeddings) in the candidate pool"""
+        pool = self._require_pool()
+        start = time.time()
+        results = await self.process_batch(files, backend=backend)
+        records = results['results']
+
+        def store():
+            model_name = self._semantic_model_name()
+            embeddings = None
+            if model_name and records:
+                embeddings = self.semantic_matcher.embed_resumes(
+                    [res.get('full_text', "") for res in records]
+                )
+            added = []
+            for i, res in enumerate(records):
+                candidate_id = candidate_id_for(res.get('full_text', ""))
+                pool.add(candidate_id, res,
+                         embedding=embeddings[i] if embeddings is not None else None,
+                         embedding_model=model_name)
+                added.append({'candidate_id': candidate_id, 'filename': res['filename']})
+            return added
+
+        added = await asyncio.get_running_loop().run_in_executor(self.executor, store)
+        return {
+            'added': added,
+            'pool': pool.stats(),
+            'stats': {**results['stats'], 'time_seconds': round(time.time() - start, 2)}
+        }
+
+    async def search_pool(self, job, k=20, include_ai_insights=False, lexical_max=5000):
+        """
+        Top-k pooled candidates for a JD (text or JobProfile).
+        With embeddings: nearest-neighbour retrieval of 3*k candidates (exact or IVF),
+        re-ranked by the hybrid match score. Candidates the index can't find (added
+        without the semantic model, or embedded by another model) are scored too,
+        the newest lexical_max of them, and embedded on the way so later searches
+        retrieve them by vector. Without the semantic model the newest lexical_max
+        candidates are ranked by the hybrid (TF-IDF + skills) score.
+        """
+        pool = self._require_pool()
+        start = time.time()
+        track_request()
+        await self.ensure_ready(*MATCH_COMPONENTS)
+        loop = asyncio.get_running_loop()
+        profile = await loop.run_in_executor(self.executor, self._as_job_profile, job)
+
+        def search():
+            model_name = self._semantic_model_name()
+            if profile.jd_embedding is None:
+                model_name = None
+            hits = []
+            retrieval = []
+            if model_name and pool.stats()['embedded']:
+                # [] when the index holds another model's embeddings
+                hits = pool.search(profile.jd_embedding, k * 3, model_name)
+                if hits:
+                    retrieval.append(pool.index.kind)
+            unembedded = pool.unembedded_ids(model_name, limit=lexical_max)
+            if unembedded:
+                hits += [(candidate_id, None) for candidate_id in unembedded]
+                retrieval.append('lexical')
+
+            similarity = dict(hits)
+            records = pool.get_many([candidate_id for candidate_id, _ in hits])
+            if model_name and unembedded:
+                missing = set(unembedded)
+                pending = [res for res in records if res['candidate_id'] in missing]
+                embeddings = self.semantic_matcher.embed_resumes(
+                    [res.get('full_text', "") for res in pending]
+                )
+                pool.set_embeddings([res['candidate_id'] for res in pending], embeddings, model_name)
+            self._match_records(records, profile, include_ai_insights=False)
+            for res in records:
+                res['retrieval_similarity'] = similarity.get(res['candidate_id'])
+            return records, '+'.join(retrieval) or 'lexical', len(hits)
+
+        records, retrieval, retrieved = await loop.run_in_executor(self.executor, search)
+        ranked = heapq.nlargest(k, records, key=lambda x: x['job_match']['score'])
+        for i, res in enumerate(ranked, 1):
+            res['rank'] = i
+        if include_ai_insights:
+            await self._attach_insights_async(ranked, profile)
+
+        return {
+            'job_id': profile.job_id,
+            'results': ranked,
+            'stats': self._with_ai_cache({
+                'pool_size': len(pool),
+                'retrieval': retrieval,
+                'retrieved': retrieved,
+                'time_seconds': round(time.time() - start, 3)
+            })
+        }
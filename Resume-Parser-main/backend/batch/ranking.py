@@ -0,0 +1,103 @@
+"""
+Ranking Sessions - heap-based top-k ranking with server-side paging
+A session heapifies the scored candidates once (O(n)) and pops only as many
+as the pages requested so far need (O(log n) each), instead of sorting everything.
+Later pages are served from the session through an opaque cursor.
+"""
+
+import base64
+import heapq
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+class RankingSession:
+    def __init__(self, items, key, rank_field='rank', context=None):
+        """
+        Args:
+            items: Candidate dicts
+            key: Score function; higher ranks first, ties keep input order
+            rank_field: Field set to the 1-based position as items are ranked
+            context: What the creating request needs to finish later pages the
+                     same way as the first (e.g. the AI insights settings)
+        """
+        self.total = len(items)
+        self.rank_field = rank_field
+        self.context = context or {}
+        self.touched = time.time()
+        self._heap = [(-key(item), i, item) for i, item in enumerate(items)]
+        heapq.heapify(self._heap)
+        self._ranked = []
+
+    def page(self, offset, limit):
+        self.touched = time.time()
+        while len(self._ranked) < offset + limit and self._heap:
+            _, _, item = heapq.heappop(self._heap)
+            self._ranked.append(item)
+            item[self.rank_field] = len(self._ranked)
+        return self._ranked[offset:offset + limit]
+
+def encode_cursor(session_id, offset):
+    return base64.urlsafe_b64encode(f"{session_id}:{offset}".encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """(session_id, offset); ValueError for anything that is not a cursor we issued"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        session_id, offset = base64.urlsafe_b64decode(padded.encode()).decode().rsplit(':', 1)
+        return session_id, int(offset)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+class RankingStore:
+    """
+    Recent ranking sessions, bounded by count and idle time.
+    Pages of an expired session raise KeyError (the client re-runs the request).
+    """
+
+    def __init__(self, max_sessions=64, ttl_seconds=1800):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        self._sessions = OrderedDict()
+
+    def _expire(self):
+        now = time.time()
+        for session_id in [s for s, session in self._sessions.items() if now - session.touched > self.ttl_seconds]:
+            del self._sessions[session_id]
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def create(self, items, key, limit, rank_field='rank', context=None):
+        """Rank items, keep the rest server-side and return the first page"""
+        session = RankingSession(items, key, rank_field=rank_field, context=context)
+        session_id = secrets.token_urlsafe(12)
+        with self.lock:
+            self._sessions[session_id] = session
+            self._expire()
+            return self._page(session_id, session, 0, limit)
+
+    def page(self, cursor, limit):
+        items, page_info, _ = self.page_with_context(cursor, limit)
+        return items, page_info
+
+    def page_with_context(self, cursor, limit):
+        """(items, page info, the context the session was created with)"""
+        session_id, offset = decode_cursor(cursor)
+        with self.lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                raise KeyError("Ranking expired or unknown; run the request again")
+            self._sessions.move_to_end(session_id)
+            return (*self._page(session_id, session, max(offset, 0), limit), session.context)
+
+    def _page(self, session_id, session, offset, limit):
+        items = session.page(offset, limit)
+        next_offset = offset + len(items)
+        return items, {
+            'offset': offset,
+            'limit': limit,
+            'total': session.total,
+            'next_cursor': encode_cursor(session_id, next_offset) if next_offset < session.total else None
+        }
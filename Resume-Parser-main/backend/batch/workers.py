@@ -0,0 +1,85 @@
+"""
+Process-pool workers for BatchResumeProcessor
+Each worker builds its own ResumePipeline once (spaCy model, CollegeRanker,
+extractors) in the pool initializer, then only receives chunks of
+(filename, bytes or SpoolFile) pairs and sends back plain result dicts.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, wait
+
+# Per-process pipeline, populated by _init_worker
+_pipeline = None
+
+def _init_worker(model_path, rankings_dir, nlp_batch_size, pdf_backend, ai_processes):
+    global _pipeline
+    # Imported here so the parent only pays for it when it builds a pipeline itself
+    from ai_scheduler import set_budget_share
+    from batch.pipeline import ResumePipeline
+
+    # Gemini budgets are per process: this worker gets its share of AI_*_PER_MINUTE
+    set_budget_share(ai_processes)
+
+    # spaCy can't fork its own workers from inside a pool process
+    _pipeline = ResumePipeline(
+        model_path=model_path,
+        rankings_dir=rankings_dir,
+        nlp_batch_size=nlp_batch_size,
+        nlp_n_process=1,
+        pdf_backend=pdf_backend
+    )
+    _pipeline.load()
+    print(f"[SUCCESS] Resume worker {os.getpid()} ready")
+
+def _ping():
+    return os.getpid()
+
+def parse_resumes(files):
+    """Entry point executed inside a worker process: one nlp.pipe pass per chunk"""
+    from batch.ingest import SpoolFile, open_payload
+
+    opened = []
+    for name, content in files:
+        try:
+            opened.append((name, open_payload(content)))
+        except OSError as e:
+            # e.g. the request finished and removed its spool files
+            print(f"Error processing {name}: {e}")
+            opened.append(None)
+    try:
+        ok = [item for item in opened if item is not None]
+        parsed = iter(_pipeline.parse_many(ok))
+        return [next(parsed) if item is not None else None for item in opened]
+    finally:
+        for _, content in files:
+            if isinstance(content, SpoolFile):
+                content.close()
+
+def create_process_pool(model_path, rankings_dir, max_workers=None, start_method=None,
+                        nlp_batch_size=32, pdf_backend='pdfplumber'):
+    """
+    Build a ProcessPoolExecutor whose workers pre-load the resume pipeline
+
+    Args:
+        max_workers: Number of worker processes (defaults to the CPU count)
+        start_method: 'fork', 'spawn' or 'forkserver' (defaults to the platform default)
+    """
+    ctx = multiprocessing.get_context(start_method)
+    max_workers = max_workers or os.cpu_count() or 1
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        # The workers and the parent split the Gemini budget
+        initargs=(model_path, rankings_dir, nlp_batch_size, pdf_backend, max_workers + 1)
+    )
+
+def warm_up(pool, count):
+    """
+    Start every worker up front so the first batch doesn't pay for model loading.
+    Returns the pids of the workers that answered.
+    """
+    futures = [pool.submit(_ping) for _ in range(count)]
+    wait(futures)
+    return sorted(set(f.result() for f in futures if f.exception() is None))
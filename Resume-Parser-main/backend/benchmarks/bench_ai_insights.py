@@ -0,0 +1,105 @@
+"""
+Benchmark AI insights fan-out against a local stub model (no API key needed)
+
+Usage (from backend/):
+    python -m benchmarks.bench_ai_insights [--candidates 50] [--latency 0.2] [--concurrency 8]
+                                           [--timeout 1.0] [--slow-every 10]
+
+The stub answers every prompt after `latency` seconds; every `slow-every`-th
+call hangs past the timeout. Reports wall time for the old sequential path
+(analyze_candidate per candidate) and the async bounded-concurrency path, plus
+how many parts fell back to the mock output.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import threading
+import time
+
+from ai_engine import AIInsightsEngine
+
+_SWOT = json.dumps({
+    'strengths': ['Stub strength'], 'weaknesses': ['Stub weakness'],
+    'opportunities': ['Stub opportunity'], 'threats': ['Stub threat']
+})
+_QUESTIONS = json.dumps([
+    {'question': 'Stub question?', 'type': 'technical', 'skill_tested': 'Python', 'difficulty': 'easy'}
+])
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+class StubModel:
+    """Stands in for genai.GenerativeModel: fixed latency, every slow_every-th call hangs"""
+
+    def __init__(self, latency=0.2, slow_every=0, hang_seconds=30.0):
+        self.latency = latency
+        self.slow_every = slow_every
+        self.hang_seconds = hang_seconds
+        self._calls = itertools.count(1)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _delay(self):
+        call = next(self._calls)
+        slow = self.slow_every and call % self.slow_every == 0
+        return self.hang_seconds if slow else self.latency
+
+    def _answer(self, prompt):
+        return _Response(_SWOT if 'SWOT' in prompt else _QUESTIONS)
+
+    def generate_content(self, prompt):
+        time.sleep(self._delay())
+        return self._answer(prompt)
+
+    async def generate_content_async(self, prompt):
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delay())
+            return self._answer(prompt)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+def run(candidates, latency, concurrency, timeout, slow_every):
+    jobs = [
+        {'resume_text': f"Candidate {i}: Python developer", 'jd_text': "Python backend role", 'skills': ['Python']}
+        for i in range(candidates)
+    ]
+    print(f"{candidates} candidates, 2 calls each, stub latency {latency}s, "
+          f"every {slow_every or 'no'} call(s) slow, timeout {timeout}s\n")
+
+    # The sequential path has no timeout, so it only gets the well-behaved stub
+    engine = AIInsightsEngine(model=StubModel(latency))
+    start = time.perf_counter()
+    for job in jobs:
+        engine.analyze_candidate(job['resume_text'], job['jd_text'], skills=job['skills'])
+    print(f"{'sequential':<12}{time.perf_counter() - start:>8.2f}s  (no slow calls)")
+
+    model = StubModel(latency, slow_every=slow_every, hang_seconds=timeout * 10)
+    engine = AIInsightsEngine(model=model, max_concurrency=concurrency, timeout=timeout)
+    start = time.perf_counter()
+    results = asyncio.run(engine.analyze_candidates_async(jobs))
+    elapsed = time.perf_counter() - start
+    fallbacks = sum(len(r.get('fallback', [])) for r in results)
+    print(f"{'async':<12}{elapsed:>8.2f}s  peak in flight {model.peak_in_flight}/{concurrency}, "
+          f"{fallbacks} part(s) fell back to mock")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--candidates', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--timeout', type=float, default=1.0)
+    parser.add_argument('--slow-every', type=int, default=10)
+    args = parser.parse_args()
+    run(args.candidates, args.latency, args.concurrency, args.timeout, args.slow_every)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Exercise the Gemini scheduler against a local stub model (no API key needed)
+
+Usage (from backend/):
+    python -m benchmarks.bench_ai_scheduler [--rpm 120] [--batch 40] [--interactive 5]
+                                            [--latency 0.2] [--outage 2.0]
+
+1. Priorities: `batch` skill-extraction calls and `interactive` insight calls
+   compete for a requests-per-minute budget; reports the admission wait of each.
+2. Circuit breaker: the stub starts failing like an exhausted quota for
+   `outage` seconds. Reports how fast refused calls fall back while the
+   circuit is open and how long the background probe takes to close it.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from ai_engine import AIInsightsEngine
+from ai_scheduler import AIScheduler, BATCH, INTERACTIVE
+from benchmarks.bench_ai_insights import StubModel
+
+class QuotaError(Exception):
+    pass
+
+class FlakyModel(StubModel):
+    """StubModel that raises a quota error while `down_until` is in the future"""
+
+    def __init__(self, latency=0.2):
+        super().__init__(latency)
+        self.down_until = 0.0
+        self.calls = 0
+
+    def _check(self):
+        self.calls += 1
+        if time.monotonic() < self.down_until:
+            raise QuotaError("429 Resource has been exhausted (e.g. check quota)")
+
+    def generate_content(self, prompt):
+        self._check()
+        return super().generate_content(prompt)
+
+    async def generate_content_async(self, prompt):
+        self._check()
+        return await super().generate_content_async(prompt)
+
+async def _timed(scheduler, priority, waits):
+    start = time.perf_counter()
+    await scheduler.aacquire(600, priority)
+    waits.append(time.perf_counter() - start)
+
+async def _priorities(rpm, batch, interactive):
+    # A drained budget makes every caller queue
+    scheduler = AIScheduler(requests_per_minute=rpm, batch_reserve=0.1)
+    scheduler.requests.level = 0
+    batch_waits, interactive_waits = [], []
+    tasks = [asyncio.ensure_future(_timed(scheduler, BATCH, batch_waits)) for _ in range(batch)]
+    await asyncio.sleep(0.1)
+    # Interactive callers arrive after the batch is already queued
+    tasks += [asyncio.ensure_future(_timed(scheduler, INTERACTIVE, interactive_waits)) for _ in range(interactive)]
+    await asyncio.gather(*tasks)
+    for name, waits in (('interactive', interactive_waits), ('batch', batch_waits)):
+        print(f"{name:<12}{len(waits):>6} calls  wait median {statistics.median(waits):>6.2f}s  max {max(waits):>6.2f}s")
+
+async def _breaker(latency, outage):
+    model = FlakyModel(latency)
+    scheduler = AIScheduler(failure_threshold=3, cooldown=0.5)
+    engine = AIInsightsEngine(model=model, timeout=5, scheduler=scheduler)
+    model.down_until = time.monotonic() + outage
+
+    start = time.perf_counter()
+    failures = 0
+    while scheduler.breaker.allow():
+        result = await engine.analyze_candidate_async("Python developer", "Python role", skills=['Python'])
+        failures += len(result.get('fallback', []))
+    print(f"circuit opened after {failures} failed calls ({time.perf_counter() - start:.2f}s)")
+
+    calls_before = model.calls
+    start = time.perf_counter()
+    for _ in range(100):
+        result = await engine.analyze_candidate_async("Python developer", "Python role", skills=['Python'])
+    per_call = (time.perf_counter() - start) / 100
+    print(f"while open: 100 analyses fell back in {per_call * 1e6:.0f}us each, "
+          f"{model.calls - calls_before} model calls (probes only)")
+
+    start = time.perf_counter()
+    while not scheduler.breaker.allow():
+        await asyncio.sleep(0.05)
+    print(f"circuit closed by the background probe {time.perf_counter() - start:.2f}s later "
+          f"(outage {outage}s, {scheduler.breaker.trips} trip)")
+    result = await engine.analyze_candidate_async("Python developer", "Python role", skills=['Python'])
+    print(f"after recovery: fallback parts = {result.get('fallback', [])}")
+
+def run(rpm, batch, interactive, latency, outage):
+    print(f"Priorities: {batch} batch + {interactive} interactive calls on an empty {rpm} rpm budget\n")
+    asyncio.run(_priorities(rpm, batch, interactive))
+    print(f"\nCircuit breaker: stub latency {latency}s, quota errors for {outage}s\n")
+    asyncio.run(_breaker(latency, outage))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rpm', type=float, default=120)
+    parser.add_argument('--batch', type=int, default=40)
+    parser.add_argument('--interactive', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--outage', type=float, default=2.0)
+    args = parser.parse_args()
+    run(args.rpm, args.batch, args.interactive, args.latency, args.outage)
+
+if __name__ == '__main__':
+    main()
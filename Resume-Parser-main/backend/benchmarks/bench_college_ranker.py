@@ -0,0 +1,79 @@
+"""
+Benchmark CollegeRanker lookups on whole resume texts
+
+Usage (from backend/):
+    python -m benchmarks.bench_college_ranker path/to/pdfs [--rankings data] [--repeat 3]
+
+Compares the previous lookup (a linear scan over every stored name with
+substring checks in both directions) with the Aho-Corasick matcher, cold
+(cache cleared before each text) and warm (every text cached), and counts
+how many resumes each resolves to a ranked college.
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from extraction.college_ranker import CollegeRanker
+from extraction.text_extractor import TextExtractor
+
+def linear_lookup(ranker, text):
+    """The lookup CollegeRanker used before the matcher, for comparison"""
+    cleaned = ranker._clean_college_name(text)
+    if cleaned in ranker.rankings:
+        return ranker.rankings[cleaned]
+    for stored_name, info in ranker.rankings.items():
+        if (stored_name in cleaned or cleaned in stored_name) and len(cleaned) > 5:
+            return info
+    return None
+
+def _timed(fn, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        found = [fn(text) for text in texts]
+    return (time.perf_counter() - start) / (repeat * len(texts)), sum(f is not None for f in found)
+
+def run(corpus_dir, rankings_dir, repeat):
+    paths = sorted(glob.glob(os.path.join(corpus_dir, '**', '*.pdf'), recursive=True))
+    if not paths:
+        print(f"No PDFs found under {corpus_dir}")
+        return
+    extractor = TextExtractor()
+    texts = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            texts.append(extractor.extract(os.path.basename(path), f.read()))
+    extractor.close()
+
+    ranker = CollegeRanker(rankings_dir)
+    print(f"\n{len(texts)} resumes (avg {sum(map(len, texts)) // len(texts)} chars), "
+          f"{len(ranker.rankings)} colleges, {len(ranker.matcher)} indexed names\n")
+
+    def cold(text):
+        ranker.tier_cache.clear()
+        return ranker.get_college_info(text)
+
+    def warm(text):
+        return ranker.get_college_info(text)
+
+    print(f"{'lookup':<16}{'per resume':>14}{'found':>8}")
+    for name, fn in (('linear scan', lambda t: linear_lookup(ranker, t)),
+                     ('matcher (cold)', cold),
+                     ('matcher (warm)', warm)):
+        if fn is warm:
+            for text in texts:
+                warm(text)
+        seconds, found = _timed(fn, texts, repeat)
+        print(f"{name:<16}{seconds * 1e6:>12.0f}us{found:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir')
+    parser.add_argument('--rankings', default='data')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.corpus_dir, args.rankings, args.repeat)
+
+if __name__ == '__main__':
+    main()
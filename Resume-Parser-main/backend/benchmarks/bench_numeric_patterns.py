@@ -0,0 +1,158 @@
+"""
+Benchmark the combined numeric scan against the per-extractor regexes it replaced
+
+Usage (from backend/):
+    python -m benchmarks.bench_numeric_patterns [path/to/annotated] [--repeat 20] [--long-line 200000]
+
+Checks that both produce the same fields on every resume text, then reports
+resumes/s for each, plus one pathological long line (no newlines, many
+'10th' triggers and no '%') where the old unbounded '.*?' spans backtrack.
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import time
+
+from extraction.numeric_patterns import NumericScan
+
+# --- Previous implementations, kept verbatim as the baseline ----------------
+
+def _legacy_cgpa(text):
+    num = r"(\d+(?:\.\d+)?)"
+    denom = r"(10(?:\.0)?|4(?:\.0)?)"
+    ratio_patterns = [
+        rf"(?:cgpa|gpa)\s*[:\-]?\s*{num}\s*/\s*{denom}",
+        rf"{num}\s*/\s*{denom}\s*(?:cgpa|gpa)?",
+    ]
+    for pattern in ratio_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if not match:
+            continue
+        try:
+            val = float(match.group(1))
+            den = float(match.group(2))
+        except ValueError:
+            continue
+        if abs(den - 4.0) < 1e-6:
+            val = val * 2.5
+        if 0 < val <= 10.0:
+            return round(val, 2)
+    patterns = [
+        rf"(?:cgpa|gpa)\s*(?:of\s*)?[:\-]?\s*{num}",
+        rf"{num}\s*(?:cgpa|gpa)\b",
+        rf"(?:grade|grade\s*point\s*average)\s*[:\-]?\s*{num}",
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if not match:
+            continue
+        try:
+            val = float(match.group(1))
+        except ValueError:
+            continue
+        if 0 < val <= 10.0:
+            return round(val, 2)
+    return 0.0
+
+def _legacy_school_marks(text):
+    patterns = [
+        r'(?:10th|12th|ssc|hsc).*?(\d{2}(?:\.\d+)?)\s*%',
+        r'(\d{2}(?:\.\d+)?)\s*%\s*(?:in|for)\s*(?:10th|12th)',
+        r'(?:10th|12th).*?(\d\.\d+)\s*cgpa'
+    ]
+    marks = []
+    for pattern in patterns:
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            try:
+                val = float(match.group(1))
+                marks.append(val * 10 if val <= 10 else val)
+            except ValueError:
+                continue
+    if marks:
+        return sum(marks) / len(marks)
+    return 0.0
+
+def _legacy_online_presence(text):
+    presence = {'github': None, 'linkedin': None, 'portfolio': None}
+    github_match = re.search(r'github\.com/([\w-]+)', text, re.IGNORECASE)
+    if github_match:
+        presence['github'] = f"https://github.com/{github_match.group(1)}"
+    linkedin_match = re.search(r'linkedin\.com/in/([\w-]+)', text, re.IGNORECASE)
+    if linkedin_match:
+        presence['linkedin'] = f"https://linkedin.com/in/{linkedin_match.group(1)}"
+    portfolio_match = re.search(r'(?:portfolio|website)[:\s]+(https?://[^\s,]+)', text, re.IGNORECASE)
+    if portfolio_match:
+        presence['portfolio'] = portfolio_match.group(1)
+    return presence
+
+def _legacy_experience_years(text):
+    exp_match = re.search(r'(\d+(?:\.\d+)?)\+?\s*years?\s*(?:of\s*)?experience', text, re.IGNORECASE)
+    return float(exp_match.group(1)) if exp_match else 0
+
+def legacy_fields(text):
+    return {
+        'cgpa': _legacy_cgpa(text),
+        'school_marks_avg': _legacy_school_marks(text),
+        'online_presence': _legacy_online_presence(text),
+        'experience_years': _legacy_experience_years(text),
+    }
+
+def combined_fields(text):
+    return NumericScan(text).fields()
+
+# -----------------------------------------------------------------------------
+
+def load_texts(annotated_dir):
+    texts = []
+    for path in sorted(glob.glob(os.path.join(annotated_dir, '*.json'))):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        for entry in data if isinstance(data, list) else [data]:
+            text = entry.get('data', {}).get('text') if isinstance(entry, dict) else None
+            if text:
+                texts.append(text)
+    return texts
+
+def _time(fn, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / repeat
+
+def run(annotated_dir, repeat, long_line):
+    texts = load_texts(annotated_dir)
+    if not texts:
+        print(f"No annotated resumes found under {annotated_dir}")
+        return
+
+    mismatches = sum(1 for t in texts if legacy_fields(t) != combined_fields(t))
+    print(f"Corpus: {len(texts)} resumes, {sum(len(t) for t in texts) / 1e3:.0f}k chars, "
+          f"{mismatches} field mismatches\n")
+
+    print(f"{'implementation':<16}{'resumes/s':>12}")
+    for label, fn in (('legacy', legacy_fields), ('combined', combined_fields)):
+        elapsed = _time(fn, texts, repeat)
+        print(f"{label:<16}{len(texts) / elapsed:>12.1f}")
+
+    if long_line:
+        text = ('10th grade topper ' * (long_line // 18 + 1))[:long_line]
+        print(f"\nPathological line: {len(text)} chars without a newline")
+        for label, fn in (('legacy', _legacy_school_marks), ('combined', combined_fields)):
+            elapsed = _time(fn, [text], 1)
+            print(f"{label:<16}{elapsed:>10.3f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('annotated_dir', nargs='?', default=os.path.join('..', 'training', 'annotated'))
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--long-line', type=int, default=20000,
+                        help="Length of the pathological single-line input (0 to skip)")
+    args = parser.parse_args()
+    run(args.annotated_dir, args.repeat, args.long_line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark the semantic model inference backends against the fp32 PyTorch baseline
+
+Usage (from backend/):
+    python -m benchmarks.bench_semantic_backends [path/to/annotated] [--backends torch int8 onnx] [--repeat 3]
+
+Encodes the section chunks of every annotated resume (the same chunks the
+matcher embeds) with each backend on CPU and reports:
+    chunks/s       - encode throughput
+    cos vs fp32    - mean / min cosine between each chunk's vector and its fp32 vector
+    sim drift      - mean / max absolute change of the chunk-vs-chunk similarity matrix
+    rank agreement - share of chunks whose nearest neighbour is unchanged
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from benchmarks.bench_numeric_patterns import load_texts
+from matcher.encoders import ENCODER_BACKENDS, build_encoder
+from matcher.semantic_matcher import SemanticJobMatcher
+from matcher.vector_index import normalize_rows
+
+def _chunks(texts):
+    # Only the chunking is used, so no model is needed here
+    chunker = SemanticJobMatcher.__new__(SemanticJobMatcher)
+    chunker.chunk_words, chunker.chunk_overlap = 128, 32
+    return [chunk for text in texts for chunk in chunker.chunk_resume(text)]
+
+def _encode(encoder, chunks, repeat, batch_size):
+    encoder.encode(chunks[:batch_size], convert_to_numpy=True, batch_size=batch_size)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        vectors = encoder.encode(chunks, convert_to_numpy=True, batch_size=batch_size)
+    return normalize_rows(vectors), (time.perf_counter() - start) / repeat
+
+def _nearest(sims):
+    sims = sims.copy()
+    np.fill_diagonal(sims, -np.inf)
+    return sims.argmax(axis=1)
+
+def run(annotated_dir, model_name, backends, repeat, batch_size, onnx_dir):
+    texts = load_texts(annotated_dir)
+    if not texts:
+        print(f"No annotated resumes found under {annotated_dir}")
+        return
+    chunks = _chunks(texts)
+    print(f"Corpus: {len(texts)} resumes, {len(chunks)} chunks, model {model_name}\n")
+
+    # fp32 baseline is always measured, first
+    backends = ['torch'] + [b for b in backends if b != 'torch']
+    baseline = None
+    print(f"{'backend':<10}{'chunks/s':>10}{'cos mean':>10}{'cos min':>10}"
+          f"{'sim drift':>11}{'sim max':>10}{'nn agree':>10}")
+    for backend in backends:
+        try:
+            encoder = build_encoder(model_name, backend, device='cpu', onnx_dir=onnx_dir)
+        except Exception as e:
+            print(f"{backend:<10}unavailable: {e}")
+            continue
+        vectors, elapsed = _encode(encoder, chunks, repeat, batch_size)
+        sims = vectors @ vectors.T
+        if baseline is None:
+            baseline = (vectors, sims, _nearest(sims))
+        base_vectors, base_sims, base_nearest = baseline
+        cos = np.sum(vectors * base_vectors, axis=1)
+        drift = np.abs(sims - base_sims)
+        agree = float(np.mean(_nearest(sims) == base_nearest))
+        print(f"{backend:<10}{len(chunks) / elapsed:>10.1f}{cos.mean():>10.4f}{cos.min():>10.4f}"
+              f"{drift.mean():>11.4f}{drift.max():>10.4f}{agree:>10.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('annotated_dir', nargs='?', default=os.path.join('..', 'training', 'annotated'))
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--backends', nargs='+', default=list(ENCODER_BACKENDS), choices=ENCODER_BACKENDS)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--onnx-dir', default=None)
+    args = parser.parse_args()
+    run(args.annotated_dir, args.model, args.backends, args.repeat, args.batch_size, args.onnx_dir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark batched Gemini skill extraction against the local stand-in server
+
+Usage (from backend/):
+    python -m benchmarks.bench_skill_batching [path/to/pdfs] [--resumes 100] [--batch-sizes 1 4 8 16]
+                                              [--latency 0.3] [--concurrency 4] [--malformed-every 0]
+
+Starts benchmarks.gemini_stub_server on a free port and runs
+extract_skills_batch over the resumes once per batch size, reporting model
+round trips, wall time and agreement with the one-call-per-resume output.
+Resumes come from the PDFs under the given directory, or are synthesised
+from the skill index. The engine talks to the stub through google-generativeai's
+REST transport when it is installed, otherwise through a minimal HTTP client
+sending the same generateContent request.
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import time
+import urllib.request
+
+from ai_engine import AIInsightsEngine, MODEL_NAME, genai
+from benchmarks.gemini_stub_server import StubGeminiServer
+from matcher.skill_index import default_index
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+class RestModel:
+    """generateContent over plain HTTP, for when google-generativeai is not installed"""
+
+    def __init__(self, endpoint, model=MODEL_NAME):
+        self.url = f"{endpoint}/v1beta/models/{model}:generateContent?key=stub"
+
+    def generate_content(self, prompt):
+        body = json.dumps({'contents': [{'role': 'user', 'parts': [{'text': prompt}]}]}).encode('utf-8')
+        request = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=60) as response:
+            payload = json.load(response)
+        return _Response(payload['candidates'][0]['content']['parts'][0]['text'])
+
+def _load_texts(corpus_dir, count):
+    if corpus_dir:
+        from extraction.text_extractor import TextExtractor
+
+        extractor = TextExtractor()
+        paths = sorted(glob.glob(os.path.join(corpus_dir, '**', '*.pdf'), recursive=True))
+        texts = []
+        for path in paths[:count]:
+            with open(path, 'rb') as f:
+                texts.append(extractor.extract(os.path.basename(path), f.read()))
+        extractor.close()
+        return texts
+
+    rng = random.Random(0)
+    names = [default_index().name(skill_id) for skill_id in sorted(default_index().skills)]
+    return [
+        f"Candidate {i}\nSoftware engineer. Skills: {', '.join(rng.sample(names, 8))}.\n"
+        f"Built services with {rng.choice(names)} and {rng.choice(names)}."
+        for i in range(count)
+    ]
+
+def _engine(server, batch_size, concurrency):
+    if genai is not None:
+        return AIInsightsEngine(api_key='stub', api_endpoint=server.endpoint, max_concurrency=concurrency,
+                                timeout=60, skill_batch_size=batch_size)
+    return AIInsightsEngine(model=RestModel(server.endpoint), max_concurrency=concurrency,
+                            timeout=60, skill_batch_size=batch_size)
+
+def run(corpus_dir, count, batch_sizes, latency, concurrency, malformed_every):
+    texts = _load_texts(corpus_dir, count)
+    if not texts:
+        print(f"No resumes found under {corpus_dir}")
+        return
+    server = StubGeminiServer(latency=latency, malformed_every=malformed_every).start()
+    client = 'google-generativeai (REST)' if genai is not None else 'plain HTTP'
+    print(f"{len(texts)} resumes, stub at {server.endpoint} ({client}), latency {latency}s, "
+          f"{concurrency} calls in flight\n")
+
+    reference = None
+    print(f"{'batch size':<12}{'round trips':>12}{'seconds':>10}{'resumes/s':>11}{'agreement':>11}")
+    try:
+        for batch_size in batch_sizes:
+            engine = _engine(server, batch_size, concurrency)
+            before = server.requests
+            start = time.perf_counter()
+            skills = asyncio.run(engine.extract_skills_batch(texts))
+            elapsed = time.perf_counter() - start
+            if reference is None:
+                reference = skills
+            agreement = sum(set(a or ()) == set(b or ()) for a, b in zip(reference, skills)) / len(texts)
+            print(f"{batch_size:<12}{server.requests - before:>12}{elapsed:>10.2f}"
+                  f"{len(texts) / elapsed:>11.1f}{agreement:>11.1%}")
+    finally:
+        server.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir', nargs='?')
+    parser.add_argument('--resumes', type=int, default=100)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 4, 8, 16])
+    parser.add_argument('--latency', type=float, default=0.3)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--malformed-every', type=int, default=0,
+                        help="Every n-th batched answer is broken JSON (exercises the fallback)")
+    args = parser.parse_args()
+    run(args.corpus_dir, args.resumes, args.batch_sizes, args.latency, args.concurrency, args.malformed_every)
+
+if __name__ == '__main__':
+    main()
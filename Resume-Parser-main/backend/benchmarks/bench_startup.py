@@ -0,0 +1,83 @@
+"""
+Measure API startup against an import-time budget
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup [--budget-ms 1500] [--top 15] [--warmup]
+
+Imports main in a fresh interpreter with -X importtime and reports the wall
+time of `import main` plus the slowest modules (cumulative). Exits with
+status 1 when the import exceeds the budget, so it can gate CI.
+--warmup additionally loads every component and reports per-component load times.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter() - start
+sys.stderr.write('@@imported\\n')
+report = {'import_seconds': imported}
+if %(warmup)r:
+    main.processor.warm_up(background=False)
+    report['warmup'] = main.processor.components.status()
+print('@@' + json.dumps(report))
+"""
+
+def _slowest(importtime_log, top):
+    rows = []
+    # Imports made by the warmup are not part of startup
+    importtime_log = importtime_log.split('@@imported')[0]
+    for line in importtime_log.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, self_us, cumulative_us, module = [p.strip() for p in line.replace('import time:', '|', 1).split('|')]
+        rows.append((int(cumulative_us), int(self_us), module.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+def run(budget_ms, top, warmup):
+    # The probe must not start a background warmup of its own
+    env = dict(os.environ, WARMUP_ON_STARTUP='0')
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROBE % {'warmup': warmup}],
+        capture_output=True, text=True, env=env
+    )
+    marker = [line for line in proc.stdout.splitlines() if line.startswith('@@')]
+    if proc.returncode != 0 or not marker:
+        print(proc.stdout + proc.stderr)
+        return 2
+    report = json.loads(marker[-1][2:])
+
+    print(f"{'module':<48}{'cumulative ms':>15}{'self ms':>10}")
+    for cumulative_us, self_us, module in _slowest(proc.stderr, top):
+        print(f"{module[:47]:<48}{cumulative_us / 1000:>15.1f}{self_us / 1000:>10.1f}")
+
+    import_ms = report['import_seconds'] * 1000
+    print(f"\nimport main: {import_ms:.0f} ms (budget {budget_ms} ms)")
+    if warmup:
+        status = report['warmup']
+        print(f"warmup: {status['warmup_seconds']:.2f} s, ready={status['ready']}")
+        for name, component in status['components'].items():
+            print(f"  {name:<20}{component['state']:<10}{component.get('load_seconds', 0):>8.2f} s")
+
+    if import_ms > budget_ms:
+        print("[WARNING] Import-time budget exceeded")
+        return 1
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv('IMPORT_BUDGET_MS', '1500')))
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--warmup', action='store_true', help="Also load every component and time it")
+    args = parser.parse_args()
+    sys.exit(run(args.budget_ms, args.top, args.warmup))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark the PDF text-extraction backends on a sample corpus
+
+Usage (from backend/):
+    python -m benchmarks.bench_text_extraction path/to/pdfs [--repeat 3] [--backends pdfplumber pdfminer parallel]
+
+Reports per backend: files/s, pages/s and fidelity against the pdfplumber output
+(token-sequence similarity, 1.0 = identical words in identical order).
+"""
+
+import argparse
+import difflib
+import glob
+import os
+import time
+
+from extraction.text_extractor import PDF_BACKENDS, TextExtractor, _count_pages
+
+def _fidelity(reference, candidate):
+    ref_tokens = reference.split()
+    cand_tokens = candidate.split()
+    if not ref_tokens and not cand_tokens:
+        return 1.0
+    return difflib.SequenceMatcher(None, ref_tokens, cand_tokens, autojunk=False).ratio()
+
+def run(corpus_dir, backends, repeat):
+    paths = sorted(glob.glob(os.path.join(corpus_dir, '**', '*.pdf'), recursive=True))
+    if not paths:
+        print(f"No PDFs found under {corpus_dir}")
+        return
+
+    docs = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            docs.append(f.read())
+    pages = sum(_count_pages(content) for content in docs)
+    print(f"Corpus: {len(docs)} PDFs, {pages} pages, {sum(len(d) for d in docs) / 1e6:.1f} MB\n")
+
+    extractor = TextExtractor(parallel_min_pages=2)
+    reference = [extractor.extract_pdf(content, backend='pdfplumber') for content in docs]
+
+    print(f"{'backend':<12}{'files/s':>10}{'pages/s':>10}{'fidelity':>10}{'chars':>12}")
+    for backend in backends:
+        outputs = []
+        elapsed = 0.0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            outputs = [extractor.extract_pdf(content, backend=backend) for content in docs]
+            elapsed += time.perf_counter() - start
+        elapsed /= repeat
+
+        fidelity = sum(_fidelity(r, o) for r, o in zip(reference, outputs)) / len(docs)
+        chars = sum(len(o) for o in outputs)
+        print(f"{backend:<12}{len(docs) / elapsed:>10.1f}{pages / elapsed:>10.1f}{fidelity:>10.3f}{chars:>12}")
+
+    extractor.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir')
+    parser.add_argument('--backends', nargs='+', default=list(PDF_BACKENDS), choices=PDF_BACKENDS)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.corpus_dir, args.backends, args.repeat)
+
+if __name__ == '__main__':
+    main()
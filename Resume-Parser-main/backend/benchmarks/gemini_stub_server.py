@@ -0,0 +1,140 @@
+"""
+Local stand-in for the Gemini REST API (generateContent only)
+
+Usage (from backend/):
+    python -m benchmarks.gemini_stub_server [--port 8765] [--latency 0.3] [--malformed-every 0]
+
+then point the backend at it:
+    GEMINI_API_KEY=stub GEMINI_API_ENDPOINT=http://127.0.0.1:8765 uvicorn main:app
+
+Answers POST /v1beta/models/<model>:generateContent with the same response
+envelope as Gemini. Skill prompts are answered deterministically from the
+skill index (known skills that appear in the text); batched prompts get one
+entry per <doc id="N">. Every `malformed-every`-th batched answer is broken
+JSON, to exercise the per-document fallback. Anything else gets an empty JSON
+object. Nothing leaves the machine and no API key is checked.
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from matcher.skill_index import default_index, skill_key
+
+_DOC = re.compile(r'<doc id="(\d+)">\n(.*?)\n</doc>', re.DOTALL)
+_TOKEN = re.compile(r"[A-Za-z][A-Za-z0-9+#.\-]*")
+
+def stub_skills(text):
+    """Known skills mentioned in a text, in order of first mention"""
+    index = default_index()
+    found = []
+    tokens = _TOKEN.findall(text)
+    # Two-word skills first ("Machine Learning"), then single tokens
+    for a, b in zip(tokens, tokens[1:] + ['']):
+        for candidate in (f"{a} {b}", a.rstrip('.')):
+            skill_id = index.aliases.get(skill_key(candidate))
+            if skill_id is not None:
+                name = index.name(skill_id)
+                if name not in found:
+                    found.append(name)
+                break
+    return found
+
+class StubGeminiServer:
+    def __init__(self, host='127.0.0.1', port=0, latency=0.3, malformed_every=0):
+        """
+        Args:
+            port: 0 picks a free port (see .endpoint)
+            latency: Seconds before every answer (network plus generation time)
+            malformed_every: Every n-th batched answer is invalid JSON (0 = never)
+        """
+        self.latency = latency
+        self.malformed_every = malformed_every
+        self.requests = 0
+        self.batched_requests = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def endpoint(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def answer(self, prompt):
+        docs = _DOC.findall(prompt)
+        with self.lock:
+            self.requests += 1
+            if docs:
+                self.batched_requests += 1
+                malformed = self.malformed_every and self.batched_requests % self.malformed_every == 0
+        time.sleep(self.latency)
+        if docs:
+            if malformed:
+                return '{"0": ["Python", '
+            return json.dumps({doc_id: stub_skills(text) for doc_id, text in docs})
+        if 'skills' in prompt and 'Text:' in prompt:
+            return json.dumps(stub_skills(prompt.split('Text:', 1)[1].split('Return only', 1)[0]))
+        return '{}'
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if ':generateContent' not in self.path:
+                    self.send_error(404)
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                prompt = ''.join(
+                    part.get('text', '')
+                    for content in body.get('contents', [])
+                    for part in content.get('parts', [])
+                )
+                payload = json.dumps({
+                    'candidates': [{
+                        'content': {'parts': [{'text': server.answer(prompt)}], 'role': 'model'},
+                        'finishReason': 'STOP',
+                        'index': 0
+                    }]
+                }).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.3)
+    parser.add_argument('--malformed-every', type=int, default=0)
+    args = parser.parse_args()
+    server = StubGeminiServer(args.host, args.port, args.latency, args.malformed_every)
+    print(f"[SUCCESS] Gemini stand-in listening on {server.endpoint}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == '__main__':
+    main()
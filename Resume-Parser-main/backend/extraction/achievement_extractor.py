@@ -1,30 +1,28 @@
 import re
 
+from extraction.resume_document import (
+    ACHIEVEMENT_HEADERS,
+    ACHIEVEMENT_KEYWORDS,
+    ACHIEVEMENT_STOPS,
+    ResumeDocument,
+)
+
 class AchievementExtractor:
     def __init__(self):
-        self.keywords = ['award', 'honor', 'distinction', 'achievement', 'scholarship', 'placed', 'won']
+        self.keywords = ACHIEVEMENT_KEYWORDS
         
     def extract(self, text):
+        doc = ResumeDocument.of(text)
         achievements = []
-        lines = text.split('\n')
-        in_section = False
+        keyword_lines = doc.lines_with_any(self.keywords)
         
-        for line in lines:
-            line_clean = line.strip().lower()
-            if any(kw in line_clean for kw in ['achievements', 'honors', 'awards']):
-                in_section = True
-                continue
-            
+        for i, in_section in doc.walk_section(ACHIEVEMENT_HEADERS, ACHIEVEMENT_STOPS):
             if in_section:
-                if any(kw in line_clean for kw in ['experience', 'education', 'skills', 'projects']):
-                    in_section = False
-                    continue
-                
-                if len(line.strip()) > 5:
-                    achievements.append(line.strip())
+                if len(doc.stripped[i]) > 5:
+                    achievements.append(doc.stripped[i])
             else:
                 # Catch individual achievement lines even if not in section
-                if any(kw in line_clean for kw in self.keywords) and len(line_clean) < 100:
-                    achievements.append(line.strip())
+                if i in keyword_lines and len(doc.lower_lines[i]) < 100:
+                    achievements.append(doc.stripped[i])
                     
         return list(set(achievements))[:10]
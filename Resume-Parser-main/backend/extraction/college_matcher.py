@@ -0,0 +1,171 @@
+"""
+College Matcher - finds NIRF institution names in free text in one pass
+Names are matched as token sequences with an Aho-Corasick automaton, so
+scanning a whole resume costs O(tokens) however many colleges are indexed.
+A token-level inverted index answers the reverse question (which indexed
+names contain a short query such as "Jadavpur University").
+"""
+
+import re
+from collections import deque
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Common short forms, expanded before matching ("IIT Bombay" -> "indian institute of technology bombay")
+ABBREVIATIONS = {
+    'iit': ('indian', 'institute', 'of', 'technology'),
+    'iits': ('indian', 'institute', 'of', 'technology'),
+    'nit': ('national', 'institute', 'of', 'technology'),
+    'iiit': ('indian', 'institute', 'of', 'information', 'technology'),
+    'iim': ('indian', 'institute', 'of', 'management'),
+    'iisc': ('indian', 'institute', 'of', 'science'),
+    'iiser': ('indian', 'institute', 'of', 'science', 'education', 'and', 'research'),
+    'aiims': ('all', 'india', 'institute', 'of', 'medical', 'sciences'),
+    'univ': ('university',),
+}
+_ABBREVIATION_KEYS = frozenset(ABBREVIATIONS)
+
+# Tokens that say nothing about which institution is meant on their own
+GENERIC_TOKENS = frozenset({
+    'of', 'and', 'the', 'for', 'in', 'at', 'institute', 'institutes', 'university', 'college',
+    'technology', 'science', 'sciences', 'engineering', 'national', 'indian', 'india',
+    'deemed', 'to', 'be', 'school', 'studies', 'research', 'education', 'management'
+})
+
+def tokenize(text, expand=True):
+    """Lowercase word tokens ('&' reads as 'and'), with ABBREVIATIONS expanded"""
+    tokens = _TOKEN.findall((text or '').lower().replace('&', ' and '))
+    if not expand or _ABBREVIATION_KEYS.isdisjoint(tokens):
+        return tokens
+    expanded = []
+    for token in tokens:
+        expanded.extend(ABBREVIATIONS.get(token, (token,)))
+    return expanded
+
+def name_variants(name):
+    """
+    Token sequences a college name is found by: the full name, the name
+    without a parenthesised part, and the part before the first comma
+    ("Indian Institute of Science, Bengaluru" -> "Indian Institute of Science")
+    """
+    variants = [tokenize(name, expand=False)]
+    without_parens = re.sub(r"\([^)]*\)", " ", name)
+    for variant in (without_parens, without_parens.split(',')[0]):
+        tokens = tokenize(variant, expand=False)
+        # A single word ("Christ") or a short generic phrase ("College of Engineering")
+        # is too ambiguous unless it is the whole name
+        specific = len(tokens) >= 4 or any(t not in GENERIC_TOKENS for t in tokens)
+        if len(tokens) >= 2 and specific and tokens not in variants:
+            variants.append(tokens)
+    return [v for v in variants if v]
+
+class CollegeMatcher:
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        # Per state: (length in tokens, value) of every name ending there
+        self._out = [[]]
+        self._index = {}
+        self._names = []
+        self.longest = 0
+        self._built = False
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, tokens, value):
+        """Index one token sequence; the first value added for a sequence wins"""
+        tokens = tuple(tokens)
+        if not tokens:
+            return
+        state = 0
+        for token in tokens:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        if self._out[state] and self._out[state][0][0] == len(tokens):
+            return
+        self._out[state].insert(0, (len(tokens), value))
+        position = len(self._names)
+        self._names.append((tokens, value))
+        self.longest = max(self.longest, len(tokens))
+        for token in set(tokens):
+            self._index.setdefault(token, []).append(position)
+        self._built = False
+
+    def build(self):
+        """Compute failure links (breadth-first) and merge their outputs"""
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # Longest names first, so a state's first output is its longest match
+                self._out[nxt] = self._out[nxt] + [o for o in self._out[self._fail[nxt]] if o not in self._out[nxt]]
+        self._built = True
+        return self
+
+    def find_all(self, text):
+        """
+        Every indexed name mentioned in text, leftmost-longest and
+        non-overlapping, in order of appearance: [(start_token, value)]
+        """
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        matches = []
+        state = 0
+        for position, token in enumerate(tokenize(text)):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            # Every name ending here, not just the longest: a shorter one may
+            # start after the previous pick ends
+            for length, value in out[state]:
+                matches.append((position - length + 1, position + 1, value))
+
+        # Keep the leftmost match, preferring the longest at equal starts
+        matches.sort(key=lambda m: (m[0], -m[1]))
+        found = []
+        end = 0
+        for start, stop, value in matches:
+            if start >= end:
+                found.append((start, value))
+                end = stop
+        return found
+
+    def find_containing(self, text):
+        """
+        Values of indexed names that contain text as a contiguous token run
+        ("jadavpur" -> "jadavpur university"); [] for generic-only queries
+        """
+        tokens = tokenize(text)
+        if not tokens or len(tokens) > self.longest or all(t in GENERIC_TOKENS for t in tokens):
+            return []
+        postings = sorted((self._index.get(t, ()) for t in set(tokens)), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        n = len(tokens)
+        query = tuple(tokens)
+        found = []
+        for position in sorted(candidates):
+            name, value = self._names[position]
+            if any(name[i:i + n] == query for i in range(len(name) - n + 1)):
+                found.append(value)
+        return found
@@ -3,49 +3,85 @@ College Ranker - 2% of total score
 Handles multiple NIRF ranking files across different categories
 """
 
-import pandas as pd
+import csv
 import os
 import glob
+import hashlib
 import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+from extraction import nirf_snapshot
+from extraction.college_matcher import CollegeMatcher, name_variants
+
+# Lookups longer than this are cached under a digest instead of the text itself
+_CACHE_KEY_CHARS = 256
+
 class CollegeRanker:
     """
     Assigns tier based on college rankings from multiple NIRF files
     Supports: Engineering, Medical, Innovation, Architecture, etc.
     """
     
-    def __init__(self, rankings_dir=None):
+    def __init__(self, rankings_dir=None, cache_size=4096, snapshot_path=None, rebuild_snapshot=False):
         """
         Initialize with multiple NIRF ranking files
         
         Args:
             rankings_dir: Path to folder containing all NIRF CSV files
                          If None, uses default hardcoded rankings
+            cache_size: Lookups remembered (least recently used evicted first)
+            snapshot_path: Compiled rankings (see extraction.nirf_snapshot);
+                           defaults to <rankings_dir>/nirf_rankings.snapshot
+            rebuild_snapshot: Parse the CSVs and rewrite the snapshot even if it is current
         """
         self.rankings = {}  # college_name -> (rank, category)
         self.category_files = []
         
         if rankings_dir and os.path.exists(rankings_dir):
-            self._load_all_rankings(rankings_dir)
+            self._load_all_rankings(rankings_dir, snapshot_path, rebuild_snapshot)
         else:
             self._load_default_rankings()
+
+        # Every name variant -> its rankings entry, matched in one pass over a text
+        self.matcher = self._build_matcher()
         
-        # Cache for faster lookups
-        self.tier_cache = {}
+        # Bounded cache for faster lookups (misses are cached too)
+        self.cache_size = cache_size
+        self.tier_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
         
         print(f"[SUCCESS] Loaded {len(self.rankings)} college rankings from {len(self.category_files)} categories")
     
-    def _load_all_rankings(self, rankings_dir):
+    def _load_all_rankings(self, rankings_dir, snapshot_path=None, rebuild_snapshot=False):
         """
-        Load all CSV files from the rankings directory
+        Load the compiled snapshot if it matches the CSVs in the rankings
+        directory; otherwise parse every CSV and (re)write the snapshot
         """
-        csv_files = glob.glob(os.path.join(rankings_dir, "*.csv"))
+        csv_files = sorted(glob.glob(os.path.join(rankings_dir, "*.csv")))
+        snapshot_path = snapshot_path or os.path.join(rankings_dir, nirf_snapshot.SNAPSHOT_NAME)
+
+        compiled = None if rebuild_snapshot else nirf_snapshot.load(snapshot_path, csv_files)
+        if compiled is not None:
+            entries, self.category_files = compiled
+            for name, rank, category in entries:
+                self._add_ranking(name, rank, category)
+            return
         
         for csv_file in csv_files:
             category = self._get_category_from_filename(csv_file)
             self.category_files.append(category)
             self._load_rankings_file(csv_file, category)
+
+        if not csv_files:
+            return
+        entries = [(info['original_name'], info['rank'], info['category']) for info in self.rankings.values()]
+        try:
+            nirf_snapshot.save(snapshot_path, csv_files, entries, self.category_files)
+        except OSError as e:
+            # Read-only deployments keep working, they just parse the CSVs on every start
+            print(f"[WARNING] Could not write NIRF snapshot {snapshot_path}: {e}")
     
     def _get_category_from_filename(self, filename):
         """
@@ -56,9 +92,26 @@ class CollegeRanker:
         base = os.path.basename(filename)
         # Remove extension and split
         parts = base.replace('.csv', '').split('_')
-        if len(parts) >= 2:
+        if len(parts) >= 2 and parts[0].upper() == 'NIRF':
             return parts[1]  # Returns: Engineering, Innovation, Medical, etc.
-        return "General"
+        # Files named after the category alone: Engineering.csv, State_Public_University.csv
+        return ' '.join(parts) if parts[0] else "General"
+
+    def _add_ranking(self, original_name, rank, category):
+        college_name = self._clean_college_name(original_name)
+        if not college_name or rank == 0:
+            return
+        # A college listed in several categories keeps its best rank
+        existing = self.rankings.get(college_name)
+        if existing is not None and existing['rank'] <= rank:
+            return
+
+        # Store with category context
+        self.rankings[college_name] = {
+            'rank': rank,
+            'category': category,
+            'original_name': original_name
+        }
     
     def _load_rankings_file(self, csv_path, category):
         """
@@ -66,79 +119,87 @@ class CollegeRanker:
         Handles different column name variations
         """
         try:
-            df = pd.read_csv(csv_path)
+            with open(csv_path, newline='', encoding='utf-8-sig') as f:
+                rows = list(csv.reader(f))
+            header, rows = (rows[0], rows[1:]) if rows else ([], [])
             
             # Try to identify college name and rank columns
-            college_col = self._find_college_column(df)
-            rank_col = self._find_rank_column(df)
+            college_col = self._find_college_column(header, rows)
+            rank_col = self._find_rank_column(header, rows)
             
-            if college_col and rank_col:
-                for _, row in df.iterrows():
-                    college_name = self._clean_college_name(str(row[college_col]))
-                    try:
-                        rank_val = row[rank_col]
-                        # Handle potential non-numeric rank strings
-                        if isinstance(rank_val, str):
-                            rank_match = re.search(r'(\d+)', rank_val)
-                            rank = int(rank_match.group(1)) if rank_match else 0
-                        else:
-                            rank = int(rank_val)
-                            
-                        if rank == 0: continue
-
-                        # Store with category context
-                        self.rankings[college_name] = {
-                            'rank': rank,
-                            'category': category,
-                            'original_name': str(row[college_col])
-                        }
-                    except (ValueError, TypeError, AttributeError):
+            if college_col is not None and rank_col is not None:
+                for row in rows:
+                    if len(row) <= max(college_col, rank_col):
                         continue
+                    # Handle potential non-numeric rank strings ("12", "12.0", "=12")
+                    rank_match = re.search(r'(\d+)', row[rank_col])
+                    if rank_match:
+                        self._add_ranking(row[college_col].strip(), int(rank_match.group(1)), category)
                         
-                print(f"  [+] Loaded {len(df)} colleges from {category} rankings")
+                print(f"  [+] Loaded {len(rows)} colleges from {category} rankings")
             else:
                 print(f"  [-] Could not identify columns in {os.path.basename(csv_path)}")
                 
         except Exception as e:
             print(f"  [-] Error loading {csv_path}: {e}")
+
+    @staticmethod
+    def _is_numeric_column(rows, col):
+        values = [row[col] for row in rows[:20] if len(row) > col and row[col].strip()]
+        if not values:
+            return False
+        try:
+            for value in values:
+                float(value)
+        except ValueError:
+            return False
+        return True
     
-    def _find_college_column(self, df):
+    def _find_college_column(self, header, rows):
         """
-        Find the college name column (handles variations)
+        Find the college name column index (handles variations)
         """
         possible_names = [
-            'college', 'institute', 'university', 'name',
-            'College', 'Institute', 'University', 'Name',
-            'institution', 'Institution'
+            'name', 'college', 'institute', 'university', 'institution'
         ]
+
+        # An exact header wins over a partial one ('Name' before 'Institute ID')
+        for name in possible_names:
+            for i, col in enumerate(header):
+                if col.strip().lower() == name:
+                    return i
         
-        for col in df.columns:
-            col_str = str(col).lower()
-            if any(name.lower() in col_str for name in possible_names):
-                return col
+        for i, col in enumerate(header):
+            col_str = col.lower()
+            # Identifier columns ('Institute ID') hold codes, not names
+            if re.search(r'\bid\b|code', col_str):
+                continue
+            if any(name in col_str for name in possible_names):
+                return i
         
         # If no match, use first string column
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                return col
+        for i in range(len(header)):
+            if not self._is_numeric_column(rows, i):
+                return i
         
         return None
     
-    def _find_rank_column(self, df):
+    def _find_rank_column(self, header, rows):
         """
-        Find the rank column (handles variations)
+        Find the rank column index (handles variations)
         """
-        possible_names = ['rank', 'Rank', 'RANK', 'score', 'Score', 'position']
-        
-        for col in df.columns:
-            col_str = str(col).lower()
-            if any(name.lower() in col_str for name in possible_names):
-                return col
+        possible_names = ['rank', 'position', 'score']
+
+        # Prefer a rank column over a score column wherever they appear
+        for name in possible_names:
+            for i, col in enumerate(header):
+                if name in col.lower():
+                    return i
         
         # If no match, use first numeric column
-        for col in df.columns:
-            if pd.api.types.is_numeric_dtype(df[col]):
-                return col
+        for i in range(len(header)):
+            if self._is_numeric_column(rows, i):
+                return i
         
         return None
     
@@ -203,6 +264,44 @@ class CollegeRanker:
         for idx, college in enumerate(tier2_colleges, 51):
             self.rankings[college] = {'rank': idx, 'category': 'default', 'original_name': college}
     
+    def _build_matcher(self):
+        matcher = CollegeMatcher()
+        variants = {key: name_variants(info.get('original_name', key)) for key, info in self.rankings.items()}
+        # Full names first, so a shortened variant never shadows another college's full name
+        for variant_index in (0, 1, 2):
+            for key, names in variants.items():
+                if variant_index < len(names):
+                    matcher.add(names[variant_index], key)
+        return matcher.build()
+
+    def find_colleges(self, text):
+        """Every ranked college mentioned in text, in order of appearance"""
+        return [self.rankings[key] for _, key in self.matcher.find_all(text)]
+
+    def _cache_key(self, text):
+        # Whole resumes are keyed by digest; cleaning them first would cost more than the hash
+        if len(text) <= _CACHE_KEY_CHARS:
+            return self._clean_college_name(text)
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def _lookup(self, text):
+        # Direct match
+        cleaned = self._clean_college_name(text) if len(text) <= _CACHE_KEY_CHARS else None
+        if cleaned in self.rankings:
+            return self.rankings[cleaned]
+
+        # First college named in the text (an education entry or a whole resume)
+        mentions = self.matcher.find_all(text)
+        if mentions:
+            return self.rankings[mentions[0][1]]
+
+        # A short query that is part of a stored name ("jadavpur" -> "jadavpur university")
+        if cleaned is not None and len(cleaned) > 5:
+            contained = self.matcher.find_containing(cleaned)
+            if contained:
+                return min((self.rankings[key] for key in contained), key=lambda info: info['rank'])
+        return None
+    
     def get_college_info(self, college_name):
         """
         Get ranking info for a college
@@ -210,25 +309,21 @@ class CollegeRanker:
         if not college_name:
             return None
             
-        cleaned = self._clean_college_name(college_name)
+        key = self._cache_key(college_name)
         
         # Check cache first
-        if cleaned in self.tier_cache:
-            return self.tier_cache[cleaned]
-        
-        # Direct match
-        if cleaned in self.rankings:
-            info = self.rankings[cleaned]
-            self.tier_cache[cleaned] = info
-            return info
-        
-        # Partial match (search in all stored colleges)
-        for stored_name, info in self.rankings.items():
-            if (stored_name in cleaned or cleaned in stored_name) and len(cleaned) > 5:
-                self.tier_cache[cleaned] = info
-                return info
-        
-        return None
+        with self._cache_lock:
+            if key in self.tier_cache:
+                self.tier_cache.move_to_end(key)
+                return self.tier_cache[key]
+
+        info = self._lookup(college_name)
+
+        with self._cache_lock:
+            self.tier_cache[key] = info
+            while len(self.tier_cache) > self.cache_size:
+                self.tier_cache.popitem(last=False)
+        return info
     
     def get_tier(self, college_name):
         """
@@ -1,24 +1,21 @@
 import re
 
+from extraction.resume_document import DEGREE_KEYWORDS, ResumeDocument
+
 class DegreeClassifier:
     def __init__(self):
-        self.degree_map = {
-            'phd': ['ph.d', 'doctorate', 'phd'],
-            'masters': ['m.tech', 'm.e.', 'msc', 'master', 'mba', 'm.s.'],
-            'bachelors': ['b.tech', 'b.e.', 'bsc', 'bachelor', 'b.s.'],
-            'diploma': ['diploma']
-        }
+        self.degree_map = DEGREE_KEYWORDS
         
     def get_highest_degree(self, text):
-        text_lower = text.lower()
+        doc = ResumeDocument.of(text)
         
-        if any(kw in text_lower for kw in self.degree_map['phd']):
+        if doc.contains_any(self.degree_map['phd']):
             return 'phd'
-        if any(kw in text_lower for kw in self.degree_map['masters']):
+        if doc.contains_any(self.degree_map['masters']):
             return 'masters'
-        if any(kw in text_lower for kw in self.degree_map['bachelors']):
+        if doc.contains_any(self.degree_map['bachelors']):
             return 'bachelors'
-        if any(kw in text_lower for kw in self.degree_map['diploma']):
+        if doc.contains_any(self.degree_map['diploma']):
             return 'diploma'
             
         return 'unknown'
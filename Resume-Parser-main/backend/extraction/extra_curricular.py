@@ -1,32 +1,27 @@
 import re
 
+from extraction.resume_document import (
+    EXTRA_CURRICULAR_HEADERS,
+    EXTRA_CURRICULAR_KEYWORDS,
+    EXTRA_CURRICULAR_STOPS,
+    ResumeDocument,
+)
+
 class ExtraCurricularExtractor:
     def __init__(self):
-        self.keywords = [
-            'volunteer', 'club', 'society', 'sports', 'captain', 'leader',
-            'coordinated', 'organized', 'event', 'non-profit', 'ngo'
-        ]
+        self.keywords = EXTRA_CURRICULAR_KEYWORDS
         
     def extract(self, text):
+        doc = ResumeDocument.of(text)
         activities = []
-        lines = text.split('\n')
-        in_section = False
+        keyword_lines = doc.lines_with_any(self.keywords)
         
-        for line in lines:
-            line_clean = line.strip().lower()
-            if any(kw in line_clean for kw in ['extra-curricular', 'volunteering', 'co-curricular']):
-                in_section = True
-                continue
-            
+        for i, in_section in doc.walk_section(EXTRA_CURRICULAR_HEADERS, EXTRA_CURRICULAR_STOPS):
             if in_section:
-                if any(kw in line_clean for kw in ['experience', 'education', 'skills', 'projects', 'achievements']):
-                    in_section = False
-                    continue
-                
-                if len(line.strip()) > 5:
-                    activities.append(line.strip())
+                if len(doc.stripped[i]) > 5:
+                    activities.append(doc.stripped[i])
             else:
-                if any(kw in line_clean for kw in self.keywords) and len(line_clean) < 100:
-                    activities.append(line.strip())
+                if i in keyword_lines and len(doc.lower_lines[i]) < 100:
+                    activities.append(doc.stripped[i])
                     
         return list(set(activities))[:5]
@@ -0,0 +1,145 @@
+"""
+NIRF Snapshot - the parsed ranking CSVs compiled into one compact binary file
+CollegeRanker loads the snapshot (a few hundred microseconds, no pandas)
+instead of re-parsing every CSV on each process start. The header records
+every source CSV's name, size and mtime plus a SHA-256 of their contents:
+matching stats are trusted as-is, changed stats fall back to the hash (a
+fresh checkout or `touch` does not force a rebuild), and a changed hash makes
+the caller recompile and rewrite the snapshot.
+
+    python -m extraction.nirf_snapshot [rankings_dir] [--output path]
+
+Layout (little-endian):
+    b'NIRFSNAP', uint32 version, uint32 header length, JSON header
+    count x (uint32 name bytes, uint16 rank, uint16 category index)
+    UTF-8 names, back to back
+"""
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+
+MAGIC = b'NIRFSNAP'
+VERSION = 1
+SNAPSHOT_NAME = 'nirf_rankings.snapshot'
+
+_PREFIX = struct.Struct('<8sII')
+_RECORD = struct.Struct('<IHH')
+
+def source_stats(csv_files):
+    """[[basename, size, mtime_ns]] for each source CSV"""
+    stats = []
+    for path in csv_files:
+        st = os.stat(path)
+        stats.append([os.path.basename(path), st.st_size, st.st_mtime_ns])
+    return stats
+
+def source_hash(csv_files):
+    digest = hashlib.sha256()
+    for path in csv_files:
+        digest.update(os.path.basename(path).encode('utf-8') + b'\0')
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def save(path, csv_files, entries, categories):
+    """
+    Write a snapshot atomically (readers never see a partial file)
+
+    Args:
+        entries: [(original_name, rank, category)]
+        categories: Category names in load order
+    """
+    category_ids = {c: i for i, c in enumerate(categories)}
+    for _, _, category in entries:
+        category_ids.setdefault(category, len(category_ids))
+    header = json.dumps({
+        'sources': source_stats(csv_files),
+        'sha256': source_hash(csv_files),
+        'categories': categories,
+        'category_table': sorted(category_ids, key=category_ids.get),
+        'count': len(entries)
+    }).encode('utf-8')
+
+    records = bytearray()
+    names = bytearray()
+    for name, rank, category in entries:
+        encoded = name.encode('utf-8')
+        records += _RECORD.pack(len(encoded), min(rank, 0xFFFF), category_ids[category])
+        names += encoded
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.nirf-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_PREFIX.pack(MAGIC, VERSION, len(header)))
+            f.write(header)
+            f.write(records)
+            f.write(names)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _read_header(data):
+    magic, version, header_len = _PREFIX.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        return None, 0
+    start = _PREFIX.size
+    return json.loads(data[start:start + header_len]), start + header_len
+
+def is_current(header, csv_files):
+    """Whether the snapshot was built from exactly these CSVs (stats first, then contents)"""
+    if [s[0] for s in header['sources']] != [os.path.basename(p) for p in csv_files]:
+        return False
+    if header['sources'] == source_stats(csv_files):
+        return True
+    return header['sha256'] == source_hash(csv_files)
+
+def load(path, csv_files):
+    """
+    (entries, categories) from a snapshot that is current for csv_files;
+    None if it is missing, unreadable, from another version or stale
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        header, offset = _read_header(data)
+        if header is None or not is_current(header, csv_files):
+            return None
+    except (OSError, ValueError, struct.error):
+        return None
+
+    table = header['category_table']
+    count = header['count']
+    names_offset = offset + count * _RECORD.size
+    entries = []
+    for name_len, rank, category in _RECORD.iter_unpack(data[offset:names_offset]):
+        name = data[names_offset:names_offset + name_len].decode('utf-8')
+        names_offset += name_len
+        entries.append((name, rank, table[category]))
+    return entries, header['categories']
+
+def main():
+    import argparse
+
+    from extraction.college_ranker import CollegeRanker
+
+    default_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('rankings_dir', nargs='?', default=default_dir)
+    parser.add_argument('--output', help=f"Snapshot path (default: <rankings_dir>/{SNAPSHOT_NAME})")
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(args.rankings_dir, SNAPSHOT_NAME)
+    # Compile from the CSVs even if a current snapshot exists
+    ranker = CollegeRanker(args.rankings_dir, snapshot_path=output, rebuild_snapshot=True)
+    print(f"[SUCCESS] Wrote {len(ranker.rankings)} colleges to {output} ({os.path.getsize(output)} bytes)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""
+Numeric Patterns - one precompiled scan for CGPA, school marks, profile links and experience years
+Every pattern the numeric extractors used is folded into a single regex of
+optional named lookaheads, tried only at positions where one of them can start.
+A pattern's lookahead at a position matches exactly what re.search/re.finditer
+would have matched there, so one finditer pass reproduces all of them.
+"""
+
+import re
+
+# Upper bound on the free-text gap in the school-marks patterns (was an
+# unbounded '.*?', which retried the rest of the line from every trigger)
+SPAN_LIMIT = 200
+
+_NUM = r"(\d+(?:\.\d+)?)"
+_DENOM = r"(10(?:\.0)?|4(?:\.0)?)"
+_GAP = rf"[^\n]{{0,{SPAN_LIMIT}}}?"
+
+# name -> (pattern, mode). 'first' keeps the leftmost match (re.search),
+# 'all' keeps every non-overlapping match (re.finditer). Order is priority.
+PATTERNS = {
+    # CGPA ratio forms ("CGPA: 8.2/10", "3.6/4.0")
+    'cgpa_ratio_labelled': (rf"(?:cgpa|gpa)\s*[:\-]?\s*{_NUM}\s*/\s*{_DENOM}", 'first'),
+    'cgpa_ratio': (rf"{_NUM}\s*/\s*{_DENOM}\s*(?:cgpa|gpa)?", 'first'),
+    # CGPA plain forms ("CGPA - 8", "8.5 CGPA", "Grade: 8")
+    'cgpa_labelled': (rf"(?:cgpa|gpa)\s*(?:of\s*)?[:\-]?\s*{_NUM}", 'first'),
+    'cgpa_suffixed': (rf"{_NUM}\s*(?:cgpa|gpa)\b", 'first'),
+    'cgpa_grade': (rf"(?:grade|grade\s*point\s*average)\s*[:\-]?\s*{_NUM}", 'first'),
+    # School marks (10th/12th percentages or CGPA)
+    'school_percent': (rf"(?:10th|12th|ssc|hsc){_GAP}(\d{{2}}(?:\.\d+)?)\s*%", 'all'),
+    'school_percent_suffixed': (r"(\d{2}(?:\.\d+)?)\s*%\s*(?:in|for)\s*(?:10th|12th)", 'all'),
+    'school_cgpa': (rf"(?:10th|12th){_GAP}(\d\.\d+)\s*cgpa", 'all'),
+    # Online presence
+    'github': (r"github\.com/([\w-]+)", 'first'),
+    'linkedin': (r"linkedin\.com/in/([\w-]+)", 'first'),
+    'portfolio': (r"(?:portfolio|website)[:\s]+(https?://[^\s,]+)", 'first'),
+    # "5+ years of experience"
+    'experience_years': (r"(\d+(?:\.\d+)?)\+?\s*years?\s*(?:of\s*)?experience", 'first'),
+}
+
+CGPA_RATIO_PATTERNS = ('cgpa_ratio_labelled', 'cgpa_ratio')
+CGPA_PATTERNS = ('cgpa_labelled', 'cgpa_suffixed', 'cgpa_grade')
+SCHOOL_PATTERNS = ('school_percent', 'school_percent_suffixed', 'school_cgpa')
+
+# Necessary start of every pattern: a number followed by '/', '%', a GPA label,
+# '+' or 'year', or one of the keywords. Keeps the scan off dates and phone numbers.
+_TRIGGER = (
+    r"(?=\d[\d.]*\+?\s*(?:/|%|c?gpa|year)"
+    r"|cgpa|gpa|grade|10th|12th|ssc|hsc|github|linkedin|portfolio|website)"
+)
+
+def _compile_combined():
+    parts = [_TRIGGER]
+    for name, (pattern, _) in PATTERNS.items():
+        # (?:(?=...)|) - try the pattern here, carry on either way
+        parts.append(f"(?:(?=(?P<{name}>{pattern}))|)")
+    return re.compile(''.join(parts), re.IGNORECASE)
+
+_COMBINED = _compile_combined()
+# name -> (group index of the whole match, indices of its capture groups)
+_GROUPS = {}
+for _name, (_pattern, _) in PATTERNS.items():
+    _index = _COMBINED.groupindex[_name]
+    _GROUPS[_name] = (_index, tuple(range(_index + 1, _index + 1 + re.compile(_pattern).groups)))
+
+class NumericScan:
+    """
+    Matches of every numeric pattern in one resume, from a single pass.
+    Build it once per resume; the extractors accept it in place of the text.
+    """
+
+    def __init__(self, text):
+        self.text = text or ''
+        self.hits = {name: [] for name in PATTERNS}
+        last_end = {name: 0 for name in PATTERNS}
+        pending = set(PATTERNS)
+
+        for match in _COMBINED.finditer(self.text):
+            for name in tuple(pending):
+                index, groups = _GROUPS[name]
+                start = match.start(index)
+                # finditer semantics: skip matches overlapping the previous one
+                if start < 0 or start < last_end[name]:
+                    continue
+                self.hits[name].append(tuple(match.group(g) for g in groups))
+                last_end[name] = match.end(index)
+                if PATTERNS[name][1] == 'first':
+                    pending.discard(name)
+
+    @classmethod
+    def of(cls, text_or_scan):
+        if isinstance(text_or_scan, cls):
+            return text_or_scan
+        return cls(text_or_scan)
+
+    def first(self, name):
+        hits = self.hits[name]
+        return hits[0] if hits else None
+
+    def all(self, name):
+        return self.hits[name]
+
+    def cgpa(self):
+        # Prefer explicit ratio forms first so we can normalize /4.0 → /10
+        for name in CGPA_RATIO_PATTERNS:
+            groups = self.first(name)
+            if not groups:
+                continue
+            try:
+                val = float(groups[0])
+                den = float(groups[1])
+            except ValueError:
+                continue
+
+            # Normalize only when the scale is explicitly /4 or /4.0
+            if abs(den - 4.0) < 1e-6:
+                val = val * 2.5
+
+            # Clamp to plausible ranges; keep within [0, 10]
+            if 0 < val <= 10.0:
+                return round(val, 2)
+
+        # Non-ratio forms
+        for name in CGPA_PATTERNS:
+            groups = self.first(name)
+            if not groups:
+                continue
+            try:
+                val = float(groups[0])
+            except ValueError:
+                continue
+
+            # Without an explicit scale we avoid converting /4 GPAs
+            if 0 < val <= 10.0:
+                return round(val, 2)
+
+        return 0.0
+
+    def school_marks_avg(self):
+        marks = []
+        for name in SCHOOL_PATTERNS:
+            for groups in self.all(name):
+                try:
+                    val = float(groups[0])
+                    if val <= 10: # Probably CGPA
+                        marks.append(val * 10)
+                    else:
+                        marks.append(val)
+                except ValueError:
+                    continue
+
+        if marks:
+            return sum(marks) / len(marks)
+        return 0.0
+
+    def online_presence(self):
+        presence = {
+            'github': None,
+            'linkedin': None,
+            'portfolio': None
+        }
+
+        github = self.first('github')
+        if github:
+            presence['github'] = f"https://github.com/{github[0]}"
+
+        linkedin = self.first('linkedin')
+        if linkedin:
+            presence['linkedin'] = f"https://linkedin.com/in/{linkedin[0]}"
+
+        portfolio = self.first('portfolio')
+        if portfolio:
+            presence['portfolio'] = portfolio[0]
+
+        return presence
+
+    def experience_years(self):
+        groups = self.first('experience_years')
+        if groups:
+            return float(groups[0])
+        return 0
+
+    def fields(self):
+        """All numeric fields together, keyed as in the parsed resume record"""
+        return {
+            'cgpa': self.cgpa(),
+            'school_marks_avg': self.school_marks_avg(),
+            'online_presence': self.online_presence(),
+            'experience_years': self.experience_years(),
+        }
@@ -1,5 +1,7 @@
 import re
 
+from extraction.resume_document import PROJECT_HEADERS, PROJECT_STOPS, ResumeDocument
+
 class ProjectExtractor:
     def __init__(self):
         self.project_keywords = [
@@ -9,30 +11,18 @@ class ProjectExtractor:
         
     def extract(self, text):
         """
-        Extract project-like sections from text.
+        Extract project-like sections from text (or a ResumeDocument).
         Returns a list of project descriptions.
         """
+        doc = ResumeDocument.of(text)
         # Search for project headers or bullet points under project sections
         projects = []
         
-        # Simple heuristic: Look for lines starting with bullet points or keywords in a project section
-        lines = text.split('\n')
-        in_project_section = False
-        for line in lines:
-            line_clean = line.strip().lower()
-            if any(kw in line_clean for kw in ['projects', 'key projects', 'notable projects']):
-                in_project_section = True
-                continue
-            
-            if in_project_section:
-                # If we hit another major section, stop
-                if any(kw in line_clean for kw in ['experience', 'education', 'skills', 'achievements']):
-                    in_project_section = False
-                    continue
-                
-                # If it's a non-empty line and looks like a project title or description
-                if len(line.strip()) > 10:
-                    projects.append(line.strip())
+        # Simple heuristic: non-trivial lines between a project header and the next major section
+        for i, in_project_section in doc.walk_section(PROJECT_HEADERS, PROJECT_STOPS):
+            # If it's a non-empty line and looks like a project title or description
+            if in_project_section and len(doc.stripped[i]) > 10:
+                projects.append(doc.stripped[i])
         
         # Limit to reasonable number
         return projects[:10]
@@ -0,0 +1,174 @@
+"""
+Resume Document - one segmentation pass shared by every extractor
+Builds the line list, lowercase lines, a keyword -> lines hit index and the
+detected section spans, so extractors do set lookups instead of rescanning text.
+"""
+
+import re
+from bisect import bisect_right
+
+# Section headings the extractors switch on, and the headings that end them
+PROJECT_HEADERS = ['projects', 'key projects', 'notable projects']
+PROJECT_STOPS = ['experience', 'education', 'skills', 'achievements']
+ACHIEVEMENT_HEADERS = ['achievements', 'honors', 'awards']
+ACHIEVEMENT_STOPS = ['experience', 'education', 'skills', 'projects']
+EXTRA_CURRICULAR_HEADERS = ['extra-curricular', 'volunteering', 'co-curricular']
+EXTRA_CURRICULAR_STOPS = ['experience', 'education', 'skills', 'projects', 'achievements']
+
+# Line-level keywords
+ACHIEVEMENT_KEYWORDS = ['award', 'honor', 'distinction', 'achievement', 'scholarship', 'placed', 'won']
+EXTRA_CURRICULAR_KEYWORDS = [
+    'volunteer', 'club', 'society', 'sports', 'captain', 'leader',
+    'coordinated', 'organized', 'event', 'non-profit', 'ngo'
+]
+INTERNSHIP_KEYWORDS = ['intern']
+DEGREE_KEYWORDS = {
+    'phd': ['ph.d', 'doctorate', 'phd'],
+    'masters': ['m.tech', 'm.e.', 'msc', 'master', 'mba', 'm.s.'],
+    'bachelors': ['b.tech', 'b.e.', 'bsc', 'bachelor', 'b.s.'],
+    'diploma': ['diploma']
+}
+
+# Generic section spans exposed on every document (a heading is a short line
+# containing one of these words)
+SECTION_HEADINGS = {
+    'projects': PROJECT_HEADERS,
+    'achievements': ACHIEVEMENT_HEADERS,
+    'extra_curricular': EXTRA_CURRICULAR_HEADERS,
+    'education': ['education', 'academic'],
+    'experience': ['experience', 'employment', 'internships'],
+    'skills': ['skills'],
+}
+MAX_HEADING_LENGTH = 40
+
+def _build_vocabulary():
+    words = set(
+        PROJECT_HEADERS + PROJECT_STOPS + ACHIEVEMENT_HEADERS + ACHIEVEMENT_STOPS
+        + EXTRA_CURRICULAR_HEADERS + EXTRA_CURRICULAR_STOPS
+        + ACHIEVEMENT_KEYWORDS + EXTRA_CURRICULAR_KEYWORDS + INTERNSHIP_KEYWORDS
+    )
+    for keywords in DEGREE_KEYWORDS.values():
+        words.update(keywords)
+    for keywords in SECTION_HEADINGS.values():
+        words.update(keywords)
+    return sorted(words, key=len, reverse=True)
+
+VOCABULARY = _build_vocabulary()
+# Zero-width lookahead so overlapping keywords are all seen; longest first, and
+# every shorter keyword contained in a match is implied by it
+_VOCAB_PATTERN = re.compile('(?=(' + '|'.join(re.escape(w) for w in VOCABULARY) + '))')
+_IMPLIED = {w: tuple(k for k in VOCABULARY if k in w) for w in VOCABULARY}
+
+class ResumeDocument:
+    """
+    Segmented view of a resume's text. Build it once per resume and hand it
+    to every extractor; plain strings are still accepted via ResumeDocument.of().
+    """
+
+    def __init__(self, text):
+        self.text = text or ''
+        self.lines = self.text.split('\n')
+        self.stripped = [line.strip() for line in self.lines]
+        self.lower_text = self.text.lower()
+        # str.lower() never adds or removes newlines, so line numbers line up
+        self.lower_lines = [line.strip() for line in self.lower_text.split('\n')]
+
+        self._keyword_lines = {w: set() for w in VOCABULARY}
+        self._offsets = [0]
+        for line in self.lower_text.split('\n')[:-1]:
+            self._offsets.append(self._offsets[-1] + len(line) + 1)
+        for match in _VOCAB_PATTERN.finditer(self.lower_text):
+            line_no = self._line_at(match.start())
+            for word in _IMPLIED[match.group(1)]:
+                self._keyword_lines[word].add(line_no)
+
+        self.sections = self._detect_sections()
+
+    def _line_at(self, offset):
+        return bisect_right(self._offsets, offset) - 1
+
+    @classmethod
+    def of(cls, text_or_doc):
+        if isinstance(text_or_doc, cls):
+            return text_or_doc
+        return cls(text_or_doc)
+
+    def lines_with(self, keyword):
+        """Indices of lines containing keyword (case-insensitive substring)"""
+        lines = self._keyword_lines.get(keyword)
+        if lines is None:
+            # Outside the shared vocabulary: index it on first use
+            lines = set()
+            start = self.lower_text.find(keyword)
+            while start != -1:
+                lines.add(self._line_at(start))
+                start = self.lower_text.find(keyword, start + 1)
+            self._keyword_lines[keyword] = lines
+        return lines
+
+    def lines_with_any(self, keywords):
+        found = set()
+        for keyword in keywords:
+            found |= self.lines_with(keyword)
+        return found
+
+    def contains(self, keyword):
+        return bool(self.lines_with(keyword))
+
+    def contains_any(self, keywords):
+        return any(self.lines_with(keyword) for keyword in keywords)
+
+    def walk_section(self, headers, stops):
+        """
+        Replays the extractors' section state machine over the hit index:
+        a line with a header keyword opens the section, a line with a stop keyword
+        closes it, and both are skipped. Yields (line_index, in_section).
+        """
+        header_lines = self.lines_with_any(headers)
+        stop_lines = self.lines_with_any(stops)
+        in_section = False
+        for i in range(len(self.lines)):
+            if i in header_lines:
+                in_section = True
+                continue
+            if in_section and i in stop_lines:
+                in_section = False
+                continue
+            yield i, in_section
+
+    def _detect_sections(self):
+        """Map section name -> list of (start, end) line spans, end exclusive"""
+        headings = {}
+        for name, keywords in SECTION_HEADINGS.items():
+            for i in self.lines_with_any(keywords):
+                if len(self.lower_lines[i]) <= MAX_HEADING_LENGTH:
+                    headings.setdefault(i, name)
+
+        sections = {}
+        starts = sorted(headings)
+        for n, start in enumerate(starts):
+            end = starts[n + 1] if n + 1 < len(starts) else len(self.lines)
+            sections.setdefault(headings[start], []).append((start + 1, end))
+        return sections
+
+    def section_text(self, name):
+        return '\n'.join(
+            '\n'.join(self.lines[start:end]) for start, end in self.sections.get(name, [])
+        )
+
+    def segments(self):
+        """
+        Ordered (section name, text) pieces covering the whole document, each
+        section including its heading line; text before the first heading is 'header'
+        """
+        spans = sorted(
+            (start, end, name) for name, section_spans in self.sections.items()
+            for start, end in section_spans
+        )
+        pieces = []
+        first_heading = spans[0][0] - 1 if spans else len(self.lines)
+        if first_heading > 0:
+            pieces.append(('header', '\n'.join(self.lines[:first_heading])))
+        for start, end, name in spans:
+            pieces.append((name, '\n'.join(self.lines[start - 1:end])))
+        return pieces
@@ -0,0 +1,174 @@
+"""
+Text Extractor - turns uploaded PDF/DOCX/TXT content into plain text
+Content may be bytes or any seekable file-like object (e.g. an mmap of a spooled upload)
+PDF backends:
+    pdfplumber - full character/layout objects per page (original behaviour, slowest)
+    pdfminer   - direct pdfminer interpretation, no layout analysis; lines are
+                 rebuilt from character positions
+    parallel   - pdfminer mode with page ranges spread over worker processes,
+                 used for long documents only
+"""
+
+import io
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import docx2txt
+import pdfplumber
+from pdfminer.converter import PDFConverter
+from pdfminer.layout import LTChar, LTContainer
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+
+PDF_BACKENDS = ('pdfplumber', 'pdfminer', 'parallel')
+
+def _as_stream(content):
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return io.BytesIO(content)
+    content.seek(0)
+    return content
+
+def _as_bytes(content):
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return bytes(content)
+    content.seek(0)
+    return content.read()
+
+class _LineTextConverter(PDFConverter):
+    """
+    Writes characters in content-stream order, starting a new line when the
+    baseline moves and inserting a space at visible horizontal gaps.
+    Skips pdfminer's layout analysis (LAParams) entirely.
+    """
+
+    def __init__(self, rsrcmgr, outfp):
+        PDFConverter.__init__(self, rsrcmgr, outfp, laparams=None)
+
+    def _chars(self, item):
+        for child in item:
+            if isinstance(child, LTChar):
+                yield child
+            elif isinstance(child, LTContainer):
+                # Form XObjects arrive as nested figures
+                yield from self._chars(child)
+
+    def receive_layout(self, ltpage):
+        prev = None
+        for item in self._chars(ltpage):
+            text = item.get_text()
+            if prev is not None:
+                size = max(prev.size, 1.0)
+                if abs(item.y0 - prev.y0) > size * 0.5:
+                    self.outfp.write('\n')
+                elif item.x0 - prev.x1 > size * 0.15 and not text.isspace() and not prev.get_text().isspace():
+                    self.outfp.write(' ')
+            self.outfp.write(text)
+            prev = item
+        self.outfp.write('\n')
+
+def _pdfminer_pages(content, pagenos=None):
+    """Extract text for the given 0-based page numbers (all pages when None)"""
+    rsrcmgr = PDFResourceManager(caching=True)
+    out = io.StringIO()
+    device = _LineTextConverter(rsrcmgr, out)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    f = _as_stream(content)
+    for page in PDFPage.get_pages(f, pagenos=set(pagenos) if pagenos is not None else None):
+        interpreter.process_page(page)
+    device.close()
+    return out.getvalue().strip('\n')
+
+def _count_pages(content):
+    return sum(1 for _ in PDFPage.get_pages(_as_stream(content)))
+
+class TextExtractor:
+    """
+    Pluggable text extraction used by ResumePipeline
+    """
+
+    def __init__(self, pdf_backend='pdfplumber', parallel_min_pages=8, max_workers=None, start_method=None):
+        """
+        Args:
+            pdf_backend: One of PDF_BACKENDS
+            parallel_min_pages: Shorter PDFs use the single-process pdfminer path
+            max_workers: Processes for the parallel backend (defaults to CPU count)
+            start_method: multiprocessing start method for the parallel backend's pool;
+                          defaults to forkserver (spawn where unavailable), since
+                          forking the multithreaded server can deadlock a child
+        """
+        if pdf_backend not in PDF_BACKENDS:
+            raise ValueError(f"Unknown PDF backend '{pdf_backend}', expected one of {PDF_BACKENDS}")
+        self.pdf_backend = pdf_backend
+        self.parallel_min_pages = parallel_min_pages
+        self.max_workers = max_workers or os.cpu_count() or 1
+        if start_method is None:
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self.start_method = start_method
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def extract(self, filename, content):
+        if filename.lower().endswith('.pdf'):
+            return self.extract_pdf(content)
+        elif filename.lower().endswith('.docx'):
+            return self.extract_docx(content)
+        return _as_bytes(content).decode('utf-8', errors='ignore')
+
+    def extract_pdf(self, content, backend=None):
+        backend = backend or self.pdf_backend
+        if backend == 'pdfminer':
+            return _pdfminer_pages(content)
+        if backend == 'parallel':
+            return self._extract_pdf_parallel(content)
+        return self._extract_pdf_pdfplumber(content)
+
+    def _extract_pdf_pdfplumber(self, content):
+        with pdfplumber.open(_as_stream(content)) as pdf:
+            text = []
+            for page in pdf.pages:
+                page_text = page.extract_text()
+                if page_text:
+                    text.append(page_text)
+            return '\n'.join(text)
+
+    def _extract_pdf_parallel(self, content):
+        # Daemonic pool workers (the batch process backend) can't start children
+        if multiprocessing.current_process().daemon or self.max_workers < 2:
+            return _pdfminer_pages(content)
+
+        page_count = _count_pages(content)
+        if page_count < self.parallel_min_pages:
+            return _pdfminer_pages(content)
+
+        per_worker = math.ceil(page_count / self.max_workers)
+        ranges = [
+            list(range(start, min(start + per_worker, page_count)))
+            for start in range(0, page_count, per_worker)
+        ]
+        pool = self._get_pool()
+        # Worker processes need a picklable copy of the document
+        content = _as_bytes(content)
+        parts = pool.map(_pdfminer_pages, [content] * len(ranges), ranges)
+        return '\n'.join(part for part in parts if part)
+
+    def _get_pool(self):
+        # Request threads race to extract the first long PDF; only one may create the pool
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method)
+                )
+            return self._pool
+
+    def extract_docx(self, content):
+        return docx2txt.process(_as_stream(content))
+
+    def close(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -1,15 +1,21 @@
+import asyncio
 import os
 import time
 import io
+import json
 from typing import List, Optional
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
-import pandas as pd
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
-from batch.processor import BatchResumeProcessor
-from matcher.jd_parser import JDParser
-from matcher.tfidf_matcher import TFIDFJobMatcher
+from batch.processor import BACKENDS, MATCH_COMPONENTS, BatchResumeProcessor
+from batch.parse_cache import ParseCache
+from batch.ingest import close_all, spool_uploads
+from matcher.embedding_store import EmbeddingStore
+from matcher.job_profile import job_id_for
+from storage.candidate_pool import CandidatePool
+from storage.job_store import JobProfileStore
+from storage.llm_cache import LLMResponseCache
 
 # Load environment variables from .env for local/dev.
 # On Render/Railway/Fly, env vars should be injected by the platform.
@@ -36,7 +42,150 @@ app.add_middleware(
 # Initialize Processor
 # Using relative path to model as defined in implementation plan
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "model")
-processor = BatchResumeProcessor(model_path=MODEL_PATH)
+# PDF text extraction backend: "pdfplumber" (default), "pdfminer" or "parallel"
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pdfplumber")
+# Uploads larger than the spool threshold, or past the per-request memory
+# ceiling, are spooled to temp files instead of being held in memory
+UPLOAD_SPOOL_THRESHOLD = int(float(os.getenv("UPLOAD_SPOOL_THRESHOLD_MB", "2")) * 1024 * 1024)
+UPLOAD_MEMORY_CEILING = int(float(os.getenv("UPLOAD_MEMORY_CEILING_MB", "64")) * 1024 * 1024)
+
+def _build_parse_cache():
+    """Persistent parse cache; PARSE_CACHE_MAX_MB=0 disables it"""
+    max_mb = int(os.getenv("PARSE_CACHE_MAX_MB", "512"))
+    if max_mb <= 0:
+        return None
+    path = os.getenv("PARSE_CACHE_PATH") or os.path.join(os.path.dirname(__file__), ".cache", "parse_cache.sqlite3")
+    try:
+        return ParseCache(
+            path,
+            MODEL_PATH,
+            max_bytes=max_mb * 1024 * 1024,
+            ai_enabled=bool(os.getenv("GEMINI_API_KEY")),
+            pdf_backend=PDF_BACKEND
+        )
+    except Exception as e:
+        # e.g. read-only filesystem on serverless deployments
+        print(f"[WARNING] Parse cache disabled: {e}")
+        return None
+
+def _build_embedding_cache():
+    """Bounded embedding cache; EMBEDDING_STORE_PATH adds the persistent float16 store"""
+    return EmbeddingStore(
+        max_bytes=int(float(os.getenv("EMBEDDING_CACHE_MAX_MB", "64")) * 1024 * 1024),
+        disk_path=os.getenv("EMBEDDING_STORE_PATH") or None,
+        disk_max_bytes=int(float(os.getenv("EMBEDDING_STORE_MAX_MB", "256")) * 1024 * 1024),
+    )
+
+def _build_candidate_pool():
+    """Persistent candidate pool for /pool; CANDIDATE_POOL_ENABLED=0 disables it"""
+    if os.getenv("CANDIDATE_POOL_ENABLED", "1") == "0":
+        return None
+    path = os.getenv("CANDIDATE_POOL_PATH") or os.path.join(os.path.dirname(__file__), ".cache", "candidates.sqlite3")
+    options = dict(
+        brute_force_max=int(os.getenv("POOL_BRUTE_FORCE_MAX", "20000")),
+        nprobe=int(os.getenv("POOL_IVF_NPROBE", "8")),
+    )
+    try:
+        return CandidatePool(path, **options)
+    except Exception as e:
+        print(f"[WARNING] Candidate pool not persistent, keeping candidates in memory: {e}")
+        return CandidatePool(":memory:", **options)
+
+def _build_llm_cache():
+    """Persistent Gemini response cache; LLM_CACHE_MAX_MB=0 disables it"""
+    max_mb = float(os.getenv("LLM_CACHE_MAX_MB", "64"))
+    if max_mb <= 0 or not os.getenv("GEMINI_API_KEY"):
+        return None
+    path = os.getenv("LLM_CACHE_PATH") or os.path.join(os.path.dirname(__file__), ".cache", "llm_cache.sqlite3")
+    try:
+        return LLMResponseCache(
+            path,
+            max_bytes=int(max_mb * 1024 * 1024),
+            ttl_seconds=float(os.getenv("LLM_CACHE_TTL_HOURS", "168")) * 3600
+        )
+    except Exception as e:
+        print(f"[WARNING] LLM response cache disabled: {e}")
+        return None
+
+def _build_job_store():
+    """Registered job profiles; falls back to an in-memory store when the path is not writable"""
+    path = os.getenv("JOB_STORE_PATH") or os.path.join(os.path.dirname(__file__), ".cache", "jobs.sqlite3")
+    cache_size = int(os.getenv("JOB_PROFILE_CACHE_SIZE", "256"))
+    try:
+        return JobProfileStore(path, cache_size=cache_size)
+    except Exception as e:
+        print(f"[WARNING] Job store not persistent, keeping job profiles in memory: {e}")
+        return JobProfileStore(":memory:", cache_size=cache_size)
+
+job_store = _build_job_store()
+
+# Batch execution engine: "thread" (default) or "process" for multi-core parsing
+processor = BatchResumeProcessor(
+    model_path=MODEL_PATH,
+    backend=os.getenv("BATCH_BACKEND", "thread"),
+    max_workers=int(os.getenv("BATCH_WORKERS", "0")) or None,
+    start_method=os.getenv("BATCH_START_METHOD") or None,
+    nlp_batch_size=int(os.getenv("NLP_BATCH_SIZE", "32")),
+    nlp_n_process=int(os.getenv("NLP_N_PROCESS", "1")),
+    parse_cache=_build_parse_cache(),
+    pdf_backend=PDF_BACKEND,
+    embedding_cache=_build_embedding_cache(),
+    candidate_pool=_build_candidate_pool(),
+    ranking_sessions=int(os.getenv("RANKING_SESSIONS_MAX", "64")),
+    ranking_ttl=int(os.getenv("RANKING_TTL_SECONDS", "1800")),
+    semantic_backend=os.getenv("SEMANTIC_BACKEND", "torch"),
+    semantic_onnx_dir=os.getenv("SEMANTIC_ONNX_DIR") or None,
+    llm_cache=_build_llm_cache(),
+    insights_workers=int(os.getenv("INSIGHTS_WORKERS", "4")),
+    insights_jobs=int(os.getenv("INSIGHTS_JOBS_MAX", "64")),
+    insights_ttl=int(os.getenv("INSIGHTS_TTL_SECONDS", "1800")),
+    job_store=job_store,
+)
+
+# Heavy components (spaCy, NIRF rankings, Gemini, TF-IDF, semantic model) load
+# on a background thread after startup; WARMUP_ON_STARTUP=0 loads them on first use
+@app.on_event("startup")
+def start_warmup():
+    if os.getenv("WARMUP_ON_STARTUP", "1") != "0":
+        processor.warm_up()
+
+@app.on_event("shutdown")
+def shutdown_processor():
+    processor.close()
+    job_store.close()
+
+STREAM_FORMATS = ("ndjson", "sse")
+MAX_PAGE_SIZE = 500
+
+def _page_limit(limit):
+    """None/0 = unpaged (everything in one response, as before)"""
+    if not limit or limit <= 0:
+        return None
+    return min(limit, MAX_PAGE_SIZE)
+
+async def _spool(files):
+    return await spool_uploads(files, UPLOAD_MEMORY_CEILING, UPLOAD_SPOOL_THRESHOLD)
+
+def _stream_response(events, stream_format="ndjson", uploads=None):
+    """Serialize processor events as NDJSON lines or server-sent events"""
+    async def body():
+        try:
+            async for event in events:
+                if stream_format == "sse":
+                    yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+                else:
+                    yield json.dumps(event, default=str) + "\n"
+        except Exception as e:
+            error = {"type": "error", "detail": str(e)}
+            if stream_format == "sse":
+                yield f"event: error\ndata: {json.dumps(error)}\n\n"
+            else:
+                yield json.dumps(error) + "\n"
+        finally:
+            close_all(uploads or [])
+
+    media_type = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type)
 
 @app.get("/")
 async def root():
@@ -48,18 +197,34 @@ async def root():
 
 @app.get("/health")
 async def health_check():
+    """Liveness plus per-component readiness; never triggers a model load"""
+    readiness = processor.components.status()
     return {
-        "status": "healthy",
+        "status": "degraded" if readiness["degraded"] else "healthy",
+        "ready": readiness["ready"],
         "model_loaded": processor.is_model_loaded(),
-        "api_version": "2.0.0"
+        "ai_scheduler": processor.ai_status(),
+        "api_version": "2.0.0",
+        **{k: v for k, v in readiness.items() if k != "ready"}
     }
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    200 once every required component is loaded and the optional ones (spaCy NER,
+    semantic model, Gemini, process workers) have finished loading, even if some
+    came up degraded (listed in 'degraded'); 503 while warming up
+    """
+    readiness = processor.components.status()
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=readiness)
+
 @app.post("/parse")
 async def parse_resume(file: UploadFile = File(...)):
     """Parse a single resume with detailed scoring"""
+    uploads = []
     try:
-        content = await file.read()
-        result = await processor._process_single(file.filename, content)
+        uploads = await _spool([file])
+        result = await processor._process_single(file.filename, uploads[0])
         
         if not result:
             raise HTTPException(status_code=400, detail="Failed to parse resume")
@@ -67,39 +232,80 @@ async def parse_resume(file: UploadFile = File(...)):
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        close_all(uploads)
 
 @app.post("/batch-parse")
-async def batch_parse(files: List[UploadFile] = File(...)):
-    """Parse multiple resumes and rank them"""
+async def batch_parse(
+    files: List[UploadFile] = File(...),
+    backend: Optional[str] = Form(None),
+    limit: Optional[int] = Form(None)
+):
+    """Parse multiple resumes and rank them (top `limit` only, further pages via /rankings)"""
+    uploads = []
     try:
-        file_data = []
-        for file in files:
-            content = await file.read()
-            file_data.append((file.filename, content))
+        uploads = await _spool(files)
+        file_data = [(upload.filename, upload) for upload in uploads]
             
-        results = await processor.process_batch(file_data)
+        results = await processor.process_batch(file_data, backend=backend, limit=_page_limit(limit))
         return results
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        close_all(uploads)
+
+@app.post("/batch-parse/stream")
+async def batch_parse_stream(
+    files: List[UploadFile] = File(...),
+    backend: Optional[str] = Form(None),
+    stream_format: str = Form("ndjson"),
+    progress_every: int = Form(10)
+):
+    """Parse multiple resumes, streaming each candidate as soon as it is ready"""
+    if backend and backend not in BACKENDS:
+        raise HTTPException(status_code=400, detail=f"backend must be one of {BACKENDS}")
+    if stream_format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"stream_format must be one of {STREAM_FORMATS}")
+
+    uploads = await _spool(files)
+    file_data = [(upload.filename, upload) for upload in uploads]
+
+    events = processor.stream_batch(file_data, backend=backend, progress_every=max(progress_every, 1))
+    return _stream_response(events, stream_format, uploads=uploads)
 
 @app.post("/match-job")
 async def match_with_job(
     files: List[UploadFile] = File(...),
     job_description: str = Form(...),
-    include_ai_insights: bool = Form(True)
+    include_ai_insights: bool = Form(True),
+    backend: Optional[str] = Form(None),
+    limit: Optional[int] = Form(None),
+    defer_ai_insights: bool = Form(False)
 ):
-    """Match resumes against job description"""
+    """
+    Match resumes against job description (top `limit` only, further pages via /rankings).
+    With defer_ai_insights the response comes back without AI insights; fetch
+    or stream them from /insights/{insights_id}
+    """
     if not job_description:
         # Try to get from form body if not in query
         raise HTTPException(status_code=400, detail="Job description required")
     
+    uploads = []
     try:
-        file_data = []
-        for file in files:
-            content = await file.read()
-            file_data.append((file.filename, content))
+        uploads = await _spool(files)
+        file_data = [(upload.filename, upload) for upload in uploads]
             
-        results = await processor.match_with_jd(file_data, job_description, include_ai_insights=include_ai_insights)
+        results = await processor.match_with_jd(
+            file_data,
+            job_description,
+            include_ai_insights=include_ai_insights,
+            backend=backend,
+            limit=_page_limit(limit),
+            defer_ai_insights=defer_ai_insights
+        )
         
         # Add metadata for the UI if needed
         return {
@@ -107,12 +313,242 @@ async def match_with_job(
             "job_description_parsed": True,
             **results
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        close_all(uploads)
+
+@app.post("/match-job/stream")
+async def match_with_job_stream(
+    files: List[UploadFile] = File(...),
+    job_description: str = Form(...),
+    include_ai_insights: bool = Form(True),
+    backend: Optional[str] = Form(None),
+    stream_format: str = Form("ndjson"),
+    progress_every: int = Form(10)
+):
+    """Match resumes against a job description, streaming each match as it completes"""
+    if not job_description:
+        raise HTTPException(status_code=400, detail="Job description required")
+    if backend and backend not in BACKENDS:
+        raise HTTPException(status_code=400, detail=f"backend must be one of {BACKENDS}")
+    if stream_format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"stream_format must be one of {STREAM_FORMATS}")
+
+    uploads = await _spool(files)
+    file_data = [(upload.filename, upload) for upload in uploads]
+
+    events = processor.stream_match_with_jd(
+        file_data,
+        job_description,
+        include_ai_insights=include_ai_insights,
+        backend=backend,
+        progress_every=max(progress_every, 1)
+    )
+    return _stream_response(events, stream_format, uploads=uploads)
+
+@app.get("/rankings")
+async def ranking_page(cursor: str, limit: int = 20):
+    """
+    Next page of a ranking returned by /batch-parse, /match-job or /jobs/{job_id}/match
+    with a limit; match rankings get AI insights (or an insights_id) per page as requested
+    """
+    try:
+        return await processor.next_page(cursor, _page_limit(limit) or 20)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except KeyError as e:
+        raise HTTPException(status_code=410, detail=str(e.args[0]))
+
+@app.get("/insights/{insights_id}")
+async def get_insights(
+    insights_id: str,
+    stream: bool = False,
+    stream_format: str = "ndjson",
+    offset: int = 0
+):
+    """
+    Deferred AI insights of a /match-job request: the results completed so far
+    (from `offset` on), or with stream=true one event per candidate as it completes
+    """
+    try:
+        job = processor.insights.get(insights_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    if not stream:
+        return job.snapshot(max(offset, 0))
+    if stream_format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"stream_format must be one of {STREAM_FORMATS}")
+    return _stream_response(job.stream(), stream_format)
+
+@app.post("/jobs")
+async def register_job(job_description: str = Form(...)):
+    """Compile a job description once; later uploads are matched with /jobs/{job_id}/match"""
+    if not job_description or not job_description.strip():
+        raise HTTPException(status_code=400, detail="Job description required")
+    try:
+        profile = job_store.get(job_id_for(job_description))
+        if profile is None:
+            await processor.ensure_ready(*MATCH_COMPONENTS)
+            profile = await asyncio.get_running_loop().run_in_executor(
+                processor.executor, processor.build_job_profile, job_description
+            )
+            job_store.put(profile)
+        return profile.summary()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/jobs")
+async def list_jobs():
+    return {"jobs": job_store.list()}
+
+def _get_job(job_id):
+    profile = job_store.get(job_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job_id '{job_id}'")
+    return profile
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    profile = _get_job(job_id)
+    return {**profile.summary(), "job_description": profile.text}
+
+@app.delete("/jobs/{job_id}")
+async def delete_job(job_id: str):
+    if not job_store.delete(job_id):
+        raise HTTPException(status_code=404, detail=f"Unknown job_id '{job_id}'")
+    return {"deleted": job_id}
+
+@app.post("/jobs/{job_id}/match")
+async def match_registered_job(
+    job_id: str,
+    files: List[UploadFile] = File(...),
+    include_ai_insights: bool = Form(True),
+    backend: Optional[str] = Form(None),
+    limit: Optional[int] = Form(None),
+    defer_ai_insights: bool = Form(False)
+):
+    """Match resumes against a registered job profile"""
+    profile = _get_job(job_id)
+
+    uploads = []
+    try:
+        uploads = await _spool(files)
+        file_data = [(upload.filename, upload) for upload in uploads]
+
+        results = await processor.match_with_jd(
+            file_data,
+            profile,
+            include_ai_insights=include_ai_insights,
+            backend=backend,
+            limit=_page_limit(limit),
+            defer_ai_insights=defer_ai_insights
+        )
+        return {
+            "status": "success",
+            "job_id": job_id,
+            **results
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        close_all(uploads)
+
+@app.post("/jobs/{job_id}/match/stream")
+async def match_registered_job_stream(
+    job_id: str,
+    files: List[UploadFile] = File(...),
+    include_ai_insights: bool = Form(True),
+    backend: Optional[str] = Form(None),
+    stream_format: str = Form("ndjson"),
+    progress_every: int = Form(10)
+):
+    """Streaming variant of /jobs/{job_id}/match"""
+    profile = _get_job(job_id)
+    if backend and backend not in BACKENDS:
+        raise HTTPException(status_code=400, detail=f"backend must be one of {BACKENDS}")
+    if stream_format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"stream_format must be one of {STREAM_FORMATS}")
+
+    uploads = await _spool(files)
+    file_data = [(upload.filename, upload) for upload in uploads]
+
+    events = processor.stream_match_with_jd(
+        file_data,
+        profile,
+        include_ai_insights=include_ai_insights,
+        backend=backend,
+        progress_every=max(progress_every, 1)
+    )
+    return _stream_response(events, stream_format, uploads=uploads)
+
+def _require_pool():
+    if processor.candidate_pool is None:
+        raise HTTPException(status_code=404, detail="Candidate pool is disabled")
+    return processor.candidate_pool
+
+@app.post("/pool")
+async def add_to_pool(
+    files: List[UploadFile] = File(...),
+    backend: Optional[str] = Form(None)
+):
+    """Parse resumes and keep them in the candidate pool for later /pool/search calls"""
+    _require_pool()
+    uploads = []
+    try:
+        uploads = await _spool(files)
+        file_data = [(upload.filename, upload) for upload in uploads]
+        return await processor.add_to_pool(file_data, backend=backend)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        close_all(uploads)
+
+@app.get("/pool")
+async def pool_stats():
+    return _require_pool().stats()
+
+@app.delete("/pool/{candidate_id}")
+async def remove_from_pool(candidate_id: str):
+    if not _require_pool().remove(candidate_id):
+        raise HTTPException(status_code=404, detail=f"Unknown candidate_id '{candidate_id}'")
+    return {"deleted": candidate_id}
+
+@app.post("/pool/search")
+async def search_pool(
+    job_description: Optional[str] = Form(None),
+    job_id: Optional[str] = Form(None),
+    k: int = Form(20),
+    include_ai_insights: bool = Form(False)
+):
+    """Top-k pooled candidates for a job description or a registered job_id"""
+    _require_pool()
+    if job_id:
+        job = _get_job(job_id)
+    elif job_description and job_description.strip():
+        job = job_description
+    else:
+        raise HTTPException(status_code=400, detail="job_description or job_id required")
+
+    try:
+        return await processor.search_pool(job, k=max(k, 1), include_ai_insights=include_ai_insights)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/export")
 async def export_results(results: List[dict]):
     """Export results as CSV"""
+    # Only this endpoint needs pandas; keep it out of startup
+    import pandas as pd
+
     try:
         df = pd.DataFrame(results)
         # Flatten score dict for CSV
@@ -1,4 +1,11 @@
-from .jd_parser import JDParser
-from .tfidf_matcher import TFIDFJobMatcher
-
 __all__ = ['JDParser', 'TFIDFJobMatcher']
+
+def __getattr__(name):
+    # Resolved on first access so importing matcher.* does not pull in scikit-learn
+    if name == 'JDParser':
+        from .jd_parser import JDParser
+        return JDParser
+    if name == 'TFIDFJobMatcher':
+        from .tfidf_matcher import TFIDFJobMatcher
+        return TFIDFJobMatcher
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,287 @@
+"""
+Embedding Store - bounded cache for sentence embeddings
+In-memory LRU keyed by a hash of (model, text) with a byte limit, backed by an
+optional float16 memory-mapped file on disk (SQLite index) that survives
+restarts and is shared by every process pointing at the same path.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+class MemmapEmbeddingFile:
+    """
+    Fixed number of float16 rows in one memory-mapped file, with a SQLite
+    index of key -> row. When every row is taken the least recently used one is reused.
+    Writers in different processes are serialised by SQLite's write lock, and
+    readers copy vectors while holding it too: the memmap is not transactional,
+    so a writer in another process could otherwise reuse a slot between the
+    index lookup and the copy.
+    """
+
+    def __init__(self, path, dim, max_bytes=256 * 1024 * 1024):
+        """
+        Args:
+            path: SQLite index file; vectors go to path + '.f16' (one path per model)
+            dim: Embedding dimension
+            max_bytes: Size of the vector file (decides the number of rows)
+        """
+        self.path = path
+        self.dim = dim
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rows ("
+            " key TEXT PRIMARY KEY,"
+            " slot INTEGER NOT NULL UNIQUE,"
+            " accessed REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS rows_accessed ON rows (accessed)")
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            meta = dict(self.conn.execute("SELECT name, value FROM meta").fetchall())
+            if meta.get('dim') == dim:
+                self.capacity = meta['capacity']
+            else:
+                # New file, or a model with a different dimension: start over
+                self.capacity = max(1, max_bytes // (dim * 2))
+                self.conn.execute("DELETE FROM rows")
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('dim', ?)", (dim,))
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('capacity', ?)", (self.capacity,))
+            vectors_path = path + '.f16'
+            with open(vectors_path, 'ab') as f:
+                # Sparse until rows are written
+                f.truncate(self.capacity * dim * 2)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            self.conn.close()
+            raise
+
+        self.vectors = np.memmap(vectors_path, dtype=np.float16, mode='r+', shape=(self.capacity, dim))
+
+    def get_many(self, keys):
+        """dict key -> float32 vector for the keys present on disk"""
+        if not keys:
+            return {}
+        found = {}
+        with self.lock:
+            # Slot lookup, vector copy and LRU touch in one write transaction
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ','.join('?' * len(chunk))
+                    rows = self.conn.execute(
+                        f"SELECT key, slot FROM rows WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    for key, slot in rows:
+                        found[key] = np.array(self.vectors[slot], dtype=np.float32)
+                if found:
+                    now = time.time()
+                    self.conn.executemany("UPDATE rows SET accessed = ? WHERE key = ?", [(now, k) for k in found])
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return found
+
+    def put_many(self, items):
+        """items: list of (key, vector)"""
+        if not items:
+            return
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                used = self.conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+                now = time.time()
+                for key, vector in items:
+                    if self.conn.execute("SELECT 1 FROM rows WHERE key = ?", (key,)).fetchone():
+                        continue
+                    if used < self.capacity:
+                        # Rows are only ever freed by reuse, so slots 0..used-1 are taken
+                        slot = used
+                        used += 1
+                    else:
+                        old_key, slot = self.conn.execute(
+                            "SELECT key, slot FROM rows ORDER BY accessed LIMIT 1"
+                        ).fetchone()
+                        self.conn.execute("DELETE FROM rows WHERE key = ?", (old_key,))
+                    self.vectors[slot] = vector
+                    self.conn.execute("INSERT INTO rows (key, slot, accessed) VALUES (?, ?, ?)", (key, slot, now))
+                # Vectors are on disk before the index points at them
+                self.vectors.flush()
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.vectors.flush()
+            self.conn.close()
+
+class EmbeddingStore:
+    """
+    Byte-bounded LRU of float32 embeddings keyed by SHA-256 of (namespace, text),
+    so resume bodies are never kept as dictionary keys.
+    Misses fall through to the optional memmap file, and new vectors are written to both.
+    """
+
+    def __init__(self, namespace='', max_bytes=64 * 1024 * 1024, disk_path=None,
+                 disk_max_bytes=256 * 1024 * 1024):
+        """
+        Args:
+            namespace: Usually the model name, so models never share vectors
+            max_bytes: Upper bound on the in-memory vectors
+            disk_path: SQLite index path for the persistent store (None = memory only)
+            disk_max_bytes: Size of the persistent vector file
+        """
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.disk_path = disk_path
+        self.disk_max_bytes = disk_max_bytes
+        self.disk = None
+        self._disk_lock = threading.Lock()
+
+    def key_for(self, text):
+        digest = hashlib.sha256(self.namespace.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8', errors='surrogatepass'))
+        return digest.hexdigest()
+
+    def _open_disk(self, dim=None):
+        """The disk store, opened once (dim=None: only if one already exists on disk)"""
+        if self.disk is not None or not self.disk_path:
+            return self.disk
+        with self._disk_lock:
+            if self.disk is None and self.disk_path:
+                dim = dim or self._disk_dim()
+                if not dim:
+                    return None
+                try:
+                    self.disk = MemmapEmbeddingFile(self.disk_path, dim, max_bytes=self.disk_max_bytes)
+                except Exception as e:
+                    # e.g. read-only filesystem on serverless deployments
+                    print(f"[WARNING] Embedding store disabled, keeping embeddings in memory only: {e}")
+                    self.disk_path = None
+        return self.disk
+
+    def _disk_dim(self):
+        """Dimension recorded by an existing store, so a fresh process can read before writing"""
+        if not self.disk_path or not os.path.exists(self.disk_path):
+            return None
+        try:
+            conn = sqlite3.connect(self.disk_path)
+            try:
+                row = conn.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+            finally:
+                conn.close()
+            return row[0] if row else None
+        except sqlite3.Error:
+            return None
+
+    def _remember(self, key, vector):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.current_bytes -= old.nbytes
+        if vector.nbytes > self.max_bytes:
+            return
+        self._entries[key] = vector
+        self.current_bytes += vector.nbytes
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.nbytes
+
+    def get_many(self, texts):
+        """List aligned with texts: a float32 vector, or None when not stored anywhere"""
+        keys = [self.key_for(t) for t in texts]
+        results = [None] * len(texts)
+        missing = {}
+        with self.lock:
+            for i, key in enumerate(keys):
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    results[i] = vector
+                else:
+                    missing.setdefault(key, []).append(i)
+
+        if missing and self.disk_path:
+            if self._open_disk() is not None:
+                try:
+                    found = self.disk.get_many(list(missing))
+                except Exception as e:
+                    print(f"[WARNING] Embedding store read failed: {e}")
+                    found = {}
+                with self.lock:
+                    for key, vector in found.items():
+                        self._remember(key, vector)
+                        for i in missing.pop(key):
+                            results[i] = vector
+
+        with self.lock:
+            self.misses += sum(len(positions) for positions in missing.values())
+            self.hits += len(texts) - sum(len(positions) for positions in missing.values())
+        return results
+
+    def put_many(self, texts, vectors):
+        items = []
+        with self.lock:
+            for text, vector in zip(texts, vectors):
+                vector = np.asarray(vector, dtype=np.float32)
+                key = self.key_for(text)
+                self._remember(key, vector)
+                items.append((key, vector))
+
+        if items and self._open_disk(items[0][1].shape[-1]) is not None:
+            try:
+                self.disk.put_many(items)
+            except Exception as e:
+                print(f"[WARNING] Embedding store write failed: {e}")
+
+    def get(self, text):
+        return self.get_many([text])[0]
+
+    def put(self, text, vector):
+        self.put_many([text], [vector])
+
+    def stats(self):
+        with self.lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk': self.disk_path if self.disk is not None else None,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def close(self):
+        with self._disk_lock:
+            disk, self.disk = self.disk, None
+        if disk is not None:
+            disk.close()
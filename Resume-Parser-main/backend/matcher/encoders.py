@@ -0,0 +1,143 @@
+"""
+Sentence Encoders - interchangeable inference backends for the semantic model
+    torch - SentenceTransformer in fp32 (original behaviour)
+    int8  - the same model with torch dynamic int8 quantisation of every Linear layer (CPU)
+    onnx  - the transformer exported once to ONNX and run with onnxruntime
+            (graph optimisations on), followed by the model's own mean pooling
+            and L2 normalisation
+Every encoder exposes encode(texts, convert_to_numpy=True, batch_size=32) and
+returns NumPy arrays. Only onnx runs without torch: torch is needed once, to
+export the graph, and the exported file can be shipped to torch-free hosts.
+"""
+
+import os
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer  # type: ignore
+except Exception:
+    SentenceTransformer = None
+
+try:
+    import torch  # type: ignore
+except Exception:
+    torch = None
+
+try:
+    import onnxruntime  # type: ignore
+except Exception:
+    onnxruntime = None
+
+try:
+    from transformers import AutoModel, AutoTokenizer  # type: ignore
+except Exception:
+    AutoModel = None
+    AutoTokenizer = None
+
+ENCODER_BACKENDS = ('torch', 'int8', 'onnx')
+
+def hub_id(model_name):
+    """sentence-transformers short names live under the sentence-transformers org"""
+    return model_name if '/' in model_name or os.path.isdir(model_name) else f"sentence-transformers/{model_name}"
+
+class QuantizedSentenceEncoder:
+    """SentenceTransformer with dynamic int8 Linear layers; always runs on CPU"""
+
+    def __init__(self, model_name):
+        model = SentenceTransformer(model_name, device='cpu')
+        self.max_seq_length = model.max_seq_length
+        self.model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def encode(self, texts, convert_to_numpy=True, batch_size=32):
+        return self.model.encode(texts, convert_to_numpy=convert_to_numpy, batch_size=batch_size)
+
+class OnnxSentenceEncoder:
+    """
+    ONNX Runtime encoder (onnxruntime + the transformers tokenizer). The graph
+    is exported on first use to onnx_dir/<model>.onnx, which needs torch, and
+    reused afterwards; with the file in place torch does not have to be installed.
+    """
+
+    def __init__(self, model_name, onnx_dir=None, max_seq_length=256, threads=None, normalize=True):
+        if onnxruntime is None or AutoTokenizer is None:
+            raise RuntimeError("onnx backend needs onnxruntime and transformers installed")
+        self.model_id = hub_id(model_name)
+        self.max_seq_length = max_seq_length
+        self.normalize = normalize
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_id)
+
+        onnx_dir = onnx_dir or os.path.join(os.path.dirname(__file__), '..', '.cache', 'onnx')
+        self.path = os.path.join(onnx_dir, self.model_id.replace('/', '__') + '.onnx')
+        if not os.path.exists(self.path):
+            self._export(self.path)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(self.path, options, providers=['CPUExecutionProvider'])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _export(self, path):
+        if torch is None or AutoModel is None:
+            raise RuntimeError("exporting the ONNX graph needs torch and transformers installed")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        model = AutoModel.from_pretrained(self.model_id)
+        model.eval()
+        sample = self.tokenizer(["export sample"], return_tensors='pt')
+        names = [n for n in ('input_ids', 'attention_mask', 'token_type_ids') if n in sample]
+        dynamic = {n: {0: 'batch', 1: 'sequence'} for n in names}
+        dynamic['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+        # Write to a temp name first so a crashed export never leaves a broken graph behind
+        tmp_path = path + '.tmp'
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                tuple(sample[n] for n in names),
+                tmp_path,
+                input_names=names,
+                output_names=['last_hidden_state'],
+                dynamic_axes=dynamic,
+                opset_version=14
+            )
+        os.replace(tmp_path, path)
+        print(f"[SUCCESS] Exported ONNX graph to {path}")
+
+    def encode(self, texts, convert_to_numpy=True, batch_size=32):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        out = []
+        # Sort by length so each batch pads to similar lengths
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), batch_size):
+            batch = [texts[i] for i in order[start:start + batch_size]]
+            tokens = self.tokenizer(batch, padding=True, truncation=True,
+                                    max_length=self.max_seq_length, return_tensors='np')
+            feeds = {n: tokens[n].astype(np.int64) for n in self.input_names if n in tokens}
+            hidden = self.session.run(None, feeds)[0]
+            # Mean pooling over real tokens
+            mask = tokens['attention_mask'][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            if self.normalize:
+                pooled = pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+            out.append(pooled.astype(np.float32))
+
+        embeddings = np.empty((len(texts), out[0].shape[1] if out else 0), dtype=np.float32)
+        if out:
+            embeddings[order] = np.concatenate(out)
+        return embeddings[0] if single else embeddings
+
+def build_encoder(model_name, backend='torch', device='cpu', onnx_dir=None):
+    """Encoder for one of ENCODER_BACKENDS"""
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown semantic backend '{backend}', expected one of {ENCODER_BACKENDS}")
+    if backend == 'onnx':
+        return OnnxSentenceEncoder(model_name, onnx_dir=onnx_dir)
+    if SentenceTransformer is None or torch is None:
+        raise RuntimeError(f"{backend} backend needs sentence-transformers and torch installed")
+    if backend == 'int8':
+        return QuantizedSentenceEncoder(model_name)
+    model = SentenceTransformer(model_name)
+    model.to(device)
+    return model
@@ -0,0 +1,96 @@
+"""
+Job Profile - a job description compiled once for repeated matching
+Holds the parsed requirements, the TF-IDF terms of the JD, and (when the
+semantic model is available) the JD and JD-skill embeddings.
+"""
+
+import hashlib
+import time
+
+import numpy as np
+
+def job_id_for(text):
+    """Stable id: the same JD text always maps to the same profile"""
+    return hashlib.sha256((text or '').strip().encode('utf-8')).hexdigest()[:16]
+
+class JobProfile:
+    def __init__(self, text, requirements, tfidf_terms, jd_embedding=None,
+                 skill_embeddings=None, embedding_model=None, job_id=None, created_at=None):
+        """
+        Args:
+            text: Original job description
+            requirements: JDParser.parse_job_description output (without full_text)
+            tfidf_terms: TFIDFJobMatcher.analyze(text)
+            jd_embedding: (dim,) float32 embedding of the whole JD, or None
+            skill_embeddings: (len(skills), dim) float32 embeddings of the required skills, or None
+            embedding_model: Name of the model that produced the embeddings
+        """
+        self.job_id = job_id or job_id_for(text)
+        self.text = text
+        self.requirements = requirements
+        self.tfidf_terms = tfidf_terms
+        self.jd_embedding = jd_embedding
+        self.skill_embeddings = skill_embeddings
+        self.embedding_model = embedding_model
+        self.created_at = created_at or time.time()
+
+    @property
+    def skills(self):
+        return self.requirements.get('required_skills', [])
+
+    @property
+    def years_experience(self):
+        return self.requirements.get('years_experience', 0.0)
+
+    @property
+    def title(self):
+        return self.requirements.get('title', 'Job Position')
+
+    def has_embeddings(self, model_name):
+        return self.jd_embedding is not None and self.embedding_model == model_name
+
+    def summary(self):
+        """Public view returned by the /jobs endpoints"""
+        return {
+            'job_id': self.job_id,
+            'title': self.title,
+            'required_skills': self.skills,
+            'years_experience': self.years_experience,
+            'created_at': self.created_at,
+            'semantic_ready': self.jd_embedding is not None
+        }
+
+    def to_record(self):
+        """(fields dict, jd_embedding bytes, skill_embeddings bytes) for storage"""
+        fields = {
+            'job_id': self.job_id,
+            'text': self.text,
+            'requirements': self.requirements,
+            'tfidf_terms': self.tfidf_terms,
+            'embedding_model': self.embedding_model,
+            'created_at': self.created_at,
+            'dim': int(self.jd_embedding.shape[-1]) if self.jd_embedding is not None else None
+        }
+        jd_blob = self.jd_embedding.astype(np.float32).tobytes() if self.jd_embedding is not None else None
+        skills_blob = self.skill_embeddings.astype(np.float32).tobytes() if self.skill_embeddings is not None else None
+        return fields, jd_blob, skills_blob
+
+    @classmethod
+    def from_record(cls, fields, jd_blob=None, skills_blob=None):
+        dim = fields.get('dim')
+        jd_embedding = None
+        skill_embeddings = None
+        if dim and jd_blob:
+            jd_embedding = np.frombuffer(jd_blob, dtype=np.float32).copy()
+        if dim and skills_blob:
+            skill_embeddings = np.frombuffer(skills_blob, dtype=np.float32).reshape(-1, dim).copy()
+        return cls(
+            fields['text'],
+            fields['requirements'],
+            fields['tfidf_terms'],
+            jd_embedding=jd_embedding,
+            skill_embeddings=skill_embeddings,
+            embedding_model=fields.get('embedding_model'),
+            job_id=fields['job_id'],
+            created_at=fields.get('created_at')
+        )
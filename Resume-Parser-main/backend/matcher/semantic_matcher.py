@@ -2,23 +2,21 @@
 Semantic Job Matcher using Sentence-Transformers
 Understands synonyms: "Web Dev" ~ "Frontend Developer"
 Runs locally - FREE and FAST
+Every encoder returns NumPy arrays and the similarity math is NumPy only, so
+the onnx backend runs without torch installed.
 """
 
 from __future__ import annotations
 
 from typing import List, Dict
-import re
 
-try:
-    from sentence_transformers import SentenceTransformer, util  # type: ignore
-except Exception:
-    SentenceTransformer = None
-    util = None
+import numpy as np
 
-try:
-    import torch  # type: ignore
-except Exception:
-    torch = None
+from extraction.resume_document import ResumeDocument
+from matcher.embedding_store import EmbeddingStore
+from matcher.encoders import build_encoder, torch
+from matcher.skill_index import default_index, skill_key
+from matcher.vector_index import normalize_rows
 
 class SemanticJobMatcher:
     """
@@ -26,45 +24,72 @@ class SemanticJobMatcher:
     No API calls - runs entirely locally
     """
     
-    def __init__(self, model_name='all-MiniLM-L6-v2'):
+    def __init__(self, model_name='all-MiniLM-L6-v2', embedding_cache=None,
+                 chunk_words=128, chunk_overlap=32, max_pool_weight=0.5,
+                 backend='torch', onnx_dir=None):
+        """
+        Args:
+            backend: Inference backend - torch (fp32), int8 (dynamic quantisation, CPU)
+                     or onnx (onnxruntime, CPU); see matcher.encoders
+            onnx_dir: Where the exported ONNX graph is kept (onnx backend only)
+            embedding_cache: Optional EmbeddingStore (e.g. with a disk path);
+                             defaults to a 64MB in-memory LRU
+            chunk_words: Words per resume chunk (the model truncates at 256 word pieces)
+            chunk_overlap: Words shared by consecutive chunks of one section
+            max_pool_weight: Resume similarity = w * best chunk + (1 - w) * mean chunk
+        """
+        self.chunk_words = chunk_words
+        self.chunk_overlap = min(chunk_overlap, chunk_words - 1)
+        self.max_pool_weight = max_pool_weight
         self.available = False
         self.model = None
         self.device = 'cpu'
-        self.embedding_cache = {}
-
-        if SentenceTransformer is None or util is None or torch is None:
-            print("[WARNING] sentence-transformers/torch not available - semantic matching disabled")
-            return
+        self.backend = backend
+        self.model_name = model_name if backend == 'torch' else f"{model_name}@{backend}"
+        self.embedding_cache = embedding_cache or EmbeddingStore()
+        # Vectors are only valid for the model (and backend) that produced them
+        self.embedding_cache.namespace = self.model_name
 
         try:
-            print(f"[PROCESS] Loading semantic model: {model_name}...")
-            self.model = SentenceTransformer(model_name)
-            self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
-            self.model.to(self.device)
+            print(f"[PROCESS] Loading semantic model: {model_name} ({backend})...")
+            # Quantised and ONNX graphs are CPU-only
+            if backend == 'torch' and torch is not None and torch.cuda.is_available():
+                self.device = 'cuda'
+            # Raises if the backend's packages (torch/sentence-transformers or onnxruntime) are missing
+            self.model = build_encoder(model_name, backend, device=self.device, onnx_dir=onnx_dir)
             self.available = True
-            print(f"[SUCCESS] Semantic model loaded on {self.device}")
+            print(f"[SUCCESS] Semantic model loaded on {self.device} ({backend})")
         except Exception as e:
             print(f"[WARNING] Semantic model init failed - semantic matching disabled: {e}")
             self.available = False
         
-    def _normalize_skill(self, s: str) -> str:
-        s = (s or "").lower().strip()
-        s = re.sub(r"[^a-z0-9\.\+\#\s]", " ", s)
-        s = re.sub(r"\s+", " ", s).strip()
-        return s
-    
+    def warm_up(self):
+        """One throwaway encode (bypassing the cache) so the first request is not slow"""
+        if self.available:
+            self.model.encode(["warmup"], convert_to_numpy=True)
+
     def get_embedding(self, text: str):
         """Get or compute embedding with caching"""
         if not self.available:
             return None
 
-        if text in self.embedding_cache:
-            return self.embedding_cache[text]
-        
-        embedding = self.model.encode(text, convert_to_tensor=True)
-        self.embedding_cache[text] = embedding
-        return embedding
+        return self.get_embeddings([text])[0]
     
+    def get_embeddings(self, texts: List[str]):
+        """Stacked (len(texts), dim) float32 embeddings, encoding all uncached ones in a single batch"""
+        if not self.available:
+            return None
+
+        vectors = self.embedding_cache.get_many(texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+        if missing:
+            encoded = self.model.encode(missing, convert_to_numpy=True)
+            self.embedding_cache.put_many(missing, encoded)
+            fresh = dict(zip(missing, encoded))
+            vectors = [fresh[t] if v is None else v for t, v in zip(texts, vectors)]
+
+        return np.stack(vectors).astype(np.float32, copy=False)
+
     def compute_similarity(self, text1: str, text2: str) -> float:
         """Compute semantic similarity between two texts"""
         if not self.available:
@@ -74,15 +99,72 @@ class SemanticJobMatcher:
         emb2 = self.get_embedding(text2)
         
         # Cosine similarity
-        similarity = util.pytorch_cos_sim(emb1, emb2).item()
-        return float(similarity)
+        return float(normalize_rows(emb1) @ normalize_rows(emb2))
     
-    def _basic_skill_overlap(self, resume_skills: List[str], jd_skills: List[str]) -> Dict:
-        jd_norm = [self._normalize_skill(s) for s in jd_skills if s]
-        res_norm = [self._normalize_skill(s) for s in resume_skills if s]
+    def chunk_resume(self, text: str) -> List[str]:
+        """
+        Split a resume into section-aligned windows of at most chunk_words words,
+        so no part of a long resume is lost to the model's truncation
+        """
+        step = self.chunk_words - self.chunk_overlap
+        chunks = []
+        for _, section in ResumeDocument.of(text).segments():
+            words = section.split()
+            for start in range(0, max(len(words) - self.chunk_overlap, 1), step):
+                window = words[start:start + self.chunk_words]
+                if window:
+                    chunks.append(' '.join(window))
+        return chunks or [text or ""]
+
+    def _chunk_similarities(self, resume_text: str, jd_embedding):
+        """Cosine similarity of every resume chunk to the JD (chunk embeddings are cached)"""
+        chunks = self.chunk_resume(resume_text)
+        chunk_emb = normalize_rows(self.get_embeddings(chunks))
+        jd_emb = normalize_rows(np.asarray(jd_embedding, dtype=np.float32).reshape(-1))
+        return chunk_emb @ jd_emb
+
+    def resume_similarity(self, resume_text: str, jd_text: str = "", jd_embedding=None) -> Dict:
+        """
+        Chunked resume-vs-JD similarity pooled over chunks:
+            {'similarity', 'max', 'mean', 'chunks'}
+        """
+        if not self.available:
+            return {'similarity': 0.0, 'max': 0.0, 'mean': 0.0, 'chunks': 0}
+
+        if jd_embedding is None:
+            jd_embedding = self.get_embedding(jd_text)
+        sims = self._chunk_similarities(resume_text, jd_embedding)
+        best = float(sims.max())
+        mean = float(sims.mean())
+        return {
+            'similarity': self.max_pool_weight * best + (1 - self.max_pool_weight) * mean,
+            'max': best,
+            'mean': mean,
+            'chunks': int(sims.shape[0])
+        }
+
+    def embed_resumes(self, texts: List[str]):
+        """
+        One L2-normalised vector per resume: the mean of its normalised chunk
+        embeddings, as a (len(texts), dim) float32 array. All chunks of all
+        resumes go through a single encode batch.
+        """
+        if not self.available:
+            return None
 
-        jd_set = set(jd_norm)
-        res_set = set(res_norm)
+        chunked = [self.chunk_resume(t) for t in texts]
+        flat = [chunk for chunks in chunked for chunk in chunks]
+        emb = normalize_rows(self.get_embeddings(flat))
+        vectors = []
+        offset = 0
+        for chunks in chunked:
+            vectors.append(emb[offset:offset + len(chunks)].mean(axis=0))
+            offset += len(chunks)
+        return normalize_rows(np.stack(vectors))
+
+    def _basic_skill_overlap(self, resume_skills: List[str], jd_skills: List[str]) -> Dict:
+        index = default_index()
+        jd_set = set(index.canonical_key(s) for s in jd_skills if s)
         if not jd_set:
             return {
                 'score': 0,
@@ -93,20 +175,21 @@ class SemanticJobMatcher:
             }
 
         matched = []
+        unmatched = []
         for raw in resume_skills:
-            r = self._normalize_skill(raw)
+            r = index.canonical_key(raw)
             if r and r in jd_set:
                 matched.append({
                     'resume_skill': raw,
                     'matches': raw,
                     'confidence': 100.0
                 })
+            elif r:
+                unmatched.append(raw)
 
-        matched_count = len(set(self._normalize_skill(m['matches']) for m in matched))
+        matched_count = len(set(index.canonical_key(m['matches']) for m in matched))
         match_score = (matched_count / len(jd_set)) * 100 if jd_set else 0
 
-        unmatched = [s for s in resume_skills if self._normalize_skill(s) and self._normalize_skill(s) not in jd_set]
-
         return {
             'score': round(match_score, 2),
             'matched_skills': matched,
@@ -118,10 +201,12 @@ class SemanticJobMatcher:
     def compare_skill_sets(self, 
                           resume_skills: List[str], 
                           jd_skills: List[str],
-                          threshold: float = 0.7) -> Dict:
+                          threshold: float = 0.7,
+                          jd_skill_embeddings=None) -> Dict:
         """
         Semantic skill matching - understands synonyms
         e.g., "React.js" ~ "React" ~ "ReactJS"
+        jd_skill_embeddings: optional precomputed (len(jd_skills), dim) array
         """
         if not self.available:
             return self._basic_skill_overlap(resume_skills, jd_skills)
@@ -134,43 +219,69 @@ class SemanticJobMatcher:
                 'semantic_threshold': threshold
             }
         
-        matched = []
-        missing = []
-        skill_scores = {}
-        
-        # Get embeddings for JD skills
-        jd_embeddings = [self.get_embedding(skill) for skill in jd_skills]
-        
-        for resume_skill in resume_skills:
-            res_emb = self.get_embedding(resume_skill)
-            best_match = None
-            best_score = 0
-            
-            for jd_skill, jd_emb in zip(jd_skills, jd_embeddings):
-                score = util.pytorch_cos_sim(res_emb, jd_emb).item()
-                if score > best_score:
-                    best_score = score
-                    best_match = jd_skill
-            
-            if best_score >= threshold:
-                matched.append({
+        # Skills in the canonical index match by ID (O(1) each). The rest are
+        # embedded: unknown resume skills against every JD skill, known ones
+        # without an ID match against the JD skills the index does not know
+        index = default_index()
+        jd_by_id = {}
+        jd_ids = []
+        for jd_skill in jd_skills:
+            skill_id = index.resolve(jd_skill)
+            jd_ids.append(skill_id)
+            jd_by_id.setdefault(skill_id or skill_key(jd_skill), jd_skill)
+        jd_unknown = np.array([skill_id is None for skill_id in jd_ids])
+
+        outcome = [None] * len(resume_skills)
+        resume_ids = [index.resolve(s) for s in resume_skills]
+        semantic = []
+        for i, (resume_skill, skill_id) in enumerate(zip(resume_skills, resume_ids)):
+            if skill_id is None:
+                semantic.append(i)
+            elif skill_id in jd_by_id:
+                outcome[i] = {
                     'resume_skill': resume_skill,
-                    'matches': best_match,
-                    'confidence': round(best_score * 100, 2)
-                })
-                skill_scores[best_match] = max(skill_scores.get(best_match, 0), best_score)
+                    'matches': jd_by_id[skill_id],
+                    'confidence': 100.0
+                }
+            elif jd_unknown.any():
+                semantic.append(i)
+
+        if semantic:
+            # One encode batch for the uncached skills, one similarity matrix
+            # (resume skills x JD skills) and a row-wise max
+            res_emb = normalize_rows(self.get_embeddings([resume_skills[i] for i in semantic]))
+            if jd_skill_embeddings is not None:
+                jd_emb = normalize_rows(jd_skill_embeddings)
             else:
-                missing.append(resume_skill)
-        
-        # Calculate match score
-        matched_count = len(set(m['matches'] for m in matched))
-        match_score = (matched_count / len(jd_skills)) * 100 if jd_skills else 0
+                jd_emb = normalize_rows(self.get_embeddings(jd_skills))
+            similarities = res_emb @ jd_emb.T
+            # A known resume skill already lost to every known JD skill by ID
+            known_rows = np.array([resume_ids[i] is not None for i in semantic])
+            similarities[np.ix_(known_rows, ~jd_unknown)] = -np.inf
+            best_idx = similarities.argmax(axis=1)
+            best_scores = similarities[np.arange(len(semantic)), best_idx]
+
+            for i, best_score, idx in zip(semantic, best_scores.tolist(), best_idx.tolist()):
+                if best_score >= threshold:
+                    outcome[i] = {
+                        'resume_skill': resume_skills[i],
+                        'matches': jd_skills[idx],
+                        'confidence': round(best_score * 100, 2)
+                    }
+
+        matched = [m for m in outcome if m is not None]
+        missing = [s for s, m in zip(resume_skills, outcome) if m is None]
+
+        # Calculate match score over distinct canonical JD skills
+        matched_count = len(set(index.canonical_key(m['matches']) for m in matched))
+        match_score = (matched_count / len(jd_by_id)) * 100 if jd_by_id else 0
         
         return {
             'score': round(match_score, 2),
             'matched_skills': matched,
             'unmatched_skills': missing[:10],  # Limit for display
-            'semantic_threshold': threshold
+            'semantic_threshold': threshold,
+            'embedded_skills': len(semantic)
         }
     
     def hybrid_match(self,
@@ -178,9 +289,12 @@ class SemanticJobMatcher:
                     jd_text: str,
                     resume_skills: List[str],
                     jd_skills: List[str],
-                    tfidf_score: float) -> Dict:
+                    tfidf_score: float,
+                    jd_embedding=None,
+                    jd_skill_embeddings=None) -> Dict:
         """
         Combine semantic + TF-IDF for best results
+        jd_embedding/jd_skill_embeddings: precomputed vectors (e.g. from a JobProfile)
         """
         if not self.available:
             skill_match = self._basic_skill_overlap(resume_skills, jd_skills)
@@ -195,11 +309,13 @@ class SemanticJobMatcher:
                 'semantic_disabled': True
             }
 
-        # Semantic similarity between full texts
-        semantic_sim = self.compute_similarity(resume_text, jd_text)
+        # Semantic similarity, section-chunked and pooled over chunks
+        chunked = self.resume_similarity(resume_text, jd_text, jd_embedding=jd_embedding)
+        semantic_sim = chunked['similarity']
         
         # Semantic skill matching
-        skill_match = self.compare_skill_sets(resume_skills, jd_skills)
+        skill_match = self.compare_skill_sets(resume_skills, jd_skills,
+                                              jd_skill_embeddings=jd_skill_embeddings)
         
         # Hybrid score (70% semantic, 30% TF-IDF)
         hybrid = (semantic_sim * 0.4 + 
@@ -209,6 +325,11 @@ class SemanticJobMatcher:
         return {
             'hybrid_score': round(hybrid, 2),
             'semantic_similarity': round(semantic_sim * 100, 2),
+            'semantic_chunks': {
+                'count': chunked['chunks'],
+                'max': round(chunked['max'] * 100, 2),
+                'mean': round(chunked['mean'] * 100, 2)
+            },
             'skill_match': skill_match,
             'tfidf_contribution': round(tfidf_score * 100, 2)
         }
@@ -0,0 +1,206 @@
+"""
+Skill Index - canonical skill IDs for free-form skill strings
+"ReactJS", "React.js" and "react" all resolve to the same ID with one dict
+lookup on a normalised key. The vocabulary is compiled from the SKILL_TERMS
+regexes in training/make_prelabels.py (plus a few common aliases) into
+matcher/skill_terms.json:
+
+    python -m matcher.skill_index [path/to/make_prelabels.py]
+"""
+
+import importlib.util
+import itertools
+import json
+import os
+import re
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse  # type: ignore
+
+INDEX_PATH = os.path.join(os.path.dirname(__file__), 'skill_terms.json')
+PRELABELS_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'training', 'make_prelabels.py')
+
+_KEY_DROP = re.compile(r"[^a-z0-9+#]")
+_VERSION_SUFFIX = re.compile(r"[\s\-_]*v?\d+(?:\.\d+)*$", re.IGNORECASE)
+
+# Spellings that the SKILL_TERMS regexes do not generate, keyed by any existing alias
+EXTRA_ALIASES = {
+    'javascript': ['JS', 'ECMAScript', 'ES6'],
+    'typescript': ['TS'],
+    'go': ['Golang'],
+    'c++': ['CPP'],
+    'c#': ['CSharp'],
+    'python': ['Python3', 'Py'],
+    'kubernetes': ['K8s'],
+    'postgresql': ['Postgres', 'psql'],
+    'mongodb': ['Mongo'],
+    'elasticsearch': ['Elastic'],
+    'scikitlearn': ['sklearn'],
+    'pytorch': ['Torch'],
+    'opencv': ['cv2'],
+    'nodejs': ['Node', 'NodeJS'],
+    'vuejs': ['Vue', 'Vue.js'],
+    'nextjs': ['NextJS'],
+    'reactjs': ['React JS'],
+    'aws': ['Amazon Web Services'],
+    'gcp': ['Google Cloud', 'Google Cloud Platform'],
+    'azure': ['Microsoft Azure'],
+    'machinelearning': ['ML'],
+    'deeplearning': ['DL'],
+    'nlp': ['Natural Language Processing'],
+    'restapi': ['REST', 'RESTful', 'RESTful API', 'REST APIs', 'RESTful APIs'],
+    'materialui': ['MUI'],
+    'excel': ['MS Excel', 'Microsoft Excel'],
+    'powerbi': ['Microsoft Power BI'],
+    'oop': ['Object Oriented Programming', 'Object-Oriented Programming'],
+    'datastructures': ['DSA', 'Data Structures and Algorithms'],
+}
+
+# Display names where the regex does not spell the usual form (the ID follows the name)
+DISPLAY_NAMES = {
+    'vuejs': 'Vue.js',
+}
+
+def skill_key(skill):
+    """Normalised lookup key: lowercase, only letters, digits, '+' and '#'"""
+    return _KEY_DROP.sub('', (skill or '').lower())
+
+class SkillIndex:
+    def __init__(self, skills=None, aliases=None):
+        """
+        Args:
+            skills: {skill_id: {'name': display name, 'aliases': [...]}}
+            aliases: {normalised key: skill_id}
+        """
+        self.skills = skills or {}
+        self.aliases = aliases or {}
+
+    def __len__(self):
+        return len(self.skills)
+
+    def resolve(self, skill):
+        """Canonical skill ID, or None for skills outside the vocabulary"""
+        key = skill_key(skill)
+        skill_id = self.aliases.get(key)
+        if skill_id is None and key:
+            # "Python 3.10", "HTML5", "Angular 14"
+            skill_id = self.aliases.get(skill_key(_VERSION_SUFFIX.sub('', skill)))
+        return skill_id
+
+    def canonical_key(self, skill):
+        """Skill ID for known skills, the normalised key for unknown ones"""
+        return self.resolve(skill) or skill_key(skill)
+
+    def name(self, skill_id):
+        return self.skills.get(skill_id, {}).get('name', skill_id)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['skills'], data['aliases'])
+
+    def save(self, path=INDEX_PATH):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'skills': self.skills, 'aliases': self.aliases}, f, indent=1, sort_keys=True)
+            f.write('\n')
+
+_default = None
+
+def default_index():
+    """The shipped index, loaded once; empty (every skill unknown) if the file is missing"""
+    global _default
+    if _default is None:
+        try:
+            _default = SkillIndex.load()
+        except Exception as e:
+            print(f"[WARNING] Skill index unavailable - skills compared as free text: {e}")
+            _default = SkillIndex()
+    return _default
+
+# --- Build step --------------------------------------------------------------
+
+def _expand(parsed):
+    """Every string a finite regex matches ('?' and alternations only)"""
+    options = [[]]
+    for op, av in parsed:
+        if op == sre_parse.LITERAL:
+            choices = [chr(av)]
+        elif op == sre_parse.AT:
+            choices = ['']
+        elif op == sre_parse.IN:
+            choices = [chr(v) for kind, v in av if kind == sre_parse.LITERAL]
+        elif op == sre_parse.SUBPATTERN:
+            choices = _expand(av[-1])
+        elif op == sre_parse.BRANCH:
+            choices = [s for branch in av[1] for s in _expand(branch)]
+        elif op == sre_parse.MAX_REPEAT and av[0] == 0 and av[1] == 1:
+            # Optional punctuation is kept in the first (display) form, optional letters dropped
+            inner = _expand(av[2])
+            choices = inner + [''] if all(not c.isalnum() for c in ''.join(inner)) else [''] + inner
+        else:
+            raise ValueError(f"Unsupported regex construct {op}")
+        options.append(choices)
+    return [''.join(parts) for parts in itertools.product(*options[1:])] or ['']
+
+def expand_pattern(pattern):
+    return _expand(sre_parse.parse(pattern))
+
+def build_index(skill_terms, extra_aliases=EXTRA_ALIASES, display_names=DISPLAY_NAMES):
+    """Compile SKILL_TERMS regexes into a SkillIndex; patterns sharing any key merge"""
+    skills = {}
+    aliases = {}
+    for pattern in skill_terms:
+        forms = [f for f in expand_pattern(pattern) if skill_key(f)]
+        if not forms:
+            continue
+        keys = [skill_key(f) for f in forms]
+        # A form already known (e.g. 'Git' listed twice) joins the existing skill
+        skill_id = next((aliases[k] for k in keys if k in aliases), keys[0])
+        skills.setdefault(skill_id, {'name': forms[0], 'aliases': []})
+        for form in forms:
+            _add_alias(skills, aliases, skill_id, form)
+
+    for existing, extras in extra_aliases.items():
+        skill_id = aliases.get(existing)
+        if skill_id is not None:
+            for form in extras:
+                _add_alias(skills, aliases, skill_id, form)
+
+    for key, name in display_names.items():
+        skill_id = aliases.get(key)
+        if skill_id is None:
+            continue
+        new_id = skill_key(name)
+        if new_id != skill_id and new_id not in skills:
+            skills[new_id] = skills.pop(skill_id)
+            aliases.update({k: new_id for k, v in aliases.items() if v == skill_id})
+            skill_id = new_id
+        skills[skill_id]['name'] = name
+    return SkillIndex(skills, aliases)
+
+def _add_alias(skills, aliases, skill_id, form):
+    """One alias per distinct key; a key keeps the first skill that claimed it"""
+    key = skill_key(form)
+    if key not in aliases:
+        aliases[key] = skill_id
+        skills[skill_id]['aliases'].append(form)
+
+def load_skill_terms(prelabels_path=PRELABELS_PATH):
+    spec = importlib.util.spec_from_file_location('make_prelabels', prelabels_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.SKILL_TERMS
+
+def main():
+    import sys
+
+    prelabels_path = sys.argv[1] if len(sys.argv) > 1 else PRELABELS_PATH
+    index = build_index(load_skill_terms(prelabels_path))
+    index.save()
+    print(f"[SUCCESS] Wrote {len(index)} skills / {len(index.aliases)} aliases to {INDEX_PATH}")
+
+if __name__ == '__main__':
+    main()
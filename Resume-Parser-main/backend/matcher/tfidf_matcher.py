@@ -6,15 +6,23 @@ NO new AI models - uses sklearn TF-IDF
 from __future__ import annotations
 
 import re
-from typing import Dict, List, Set, Union
+from typing import Dict, List, Optional, Set, Union
+
+from matcher.skill_index import default_index
 
 try:
+    import numpy as np  # type: ignore
+    from sklearn.base import clone  # type: ignore
     from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore
     from sklearn.metrics.pairwise import cosine_similarity  # type: ignore
 except Exception:
     TfidfVectorizer = None
     cosine_similarity = None
 
+def _pre_analyzed(doc):
+    """Analyzer for documents that are already lists of terms"""
+    return doc
+
 class TFIDFJobMatcher:
     """
     Job matching using TF-IDF and cosine similarity
@@ -66,24 +74,7 @@ class TFIDFJobMatcher:
         Calculate cosine similarity between resume and JD
         Returns score between 0-1
         """
-        try:
-            if not self.available:
-                # Lightweight fallback when sklearn isn't installed
-                return float(self._jaccard_similarity(resume_text, jd_text))
-
-            # Create document pair
-            documents = [resume_text, jd_text]
-            
-            # Fit and transform
-            tfidf_matrix = self.vectorizer.fit_transform(documents)
-            
-            # Calculate cosine similarity
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            
-            return float(similarity)
-        except Exception as e:
-            print(f"Error in similarity calculation: {e}")
-            return 0.0
+        return self.match_batch([resume_text], jd_text, top_n=0)['similarities'][0]
     
     def get_key_terms(self, text: str, top_n: int = 10) -> List[str]:
         """
@@ -94,39 +85,101 @@ class TFIDFJobMatcher:
             if not self.available:
                 return []
 
-            # Transform single document
-            tfidf_matrix = self.vectorizer.fit_transform([text])
+            # Transform single document (max_df would prune every term of a one-document corpus)
+            vectorizer = clone(self.vectorizer).set_params(max_df=1.0, min_df=1)
+            tfidf_matrix = vectorizer.fit_transform([text])
             
             # Get feature names
-            feature_names = self.vectorizer.get_feature_names_out()
-            
-            # Get scores for first document
-            scores = tfidf_matrix.toarray()[0]
+            feature_names = vectorizer.get_feature_names_out()
             
-            # Sort and get top terms
-            top_indices = scores.argsort()[-top_n:][::-1]
-            top_terms = [feature_names[i] for i in top_indices if scores[i] > 0]
-            
-            return top_terms
-        except:
+            # Top terms of the first (only) row
+            return self._row_top_terms(tfidf_matrix, 0, feature_names, top_n)
+        except ValueError:
+            # Empty or stop-word-only text
+            return []
+    
+    def analyze(self, text: str) -> List[str]:
+        """Stop-worded unigram+bigram terms of text, as the vectorizer sees them"""
+        if not self.available:
             return []
+        return self.vectorizer.build_analyzer()(text or "")
+
+    def match_batch(self, resume_texts: List[str], jd_text: str, top_n: int = 5,
+                    jd_terms: Optional[List[str]] = None) -> Dict:
+        """
+        Fit TF-IDF once over all resumes plus the JD, so IDF reflects the batch.
+        Returns cosine similarity of every resume to the JD (one sparse
+        matrix-vector product) and top terms per document from the same matrix:
+            {'similarities': [float], 'resume_terms': [[str]], 'job_terms': [str]}
+        jd_terms: the JD already run through analyze() (e.g. from a JobProfile)
+        """
+        n = len(resume_texts)
+        empty = {'similarities': [0.0] * n, 'resume_terms': [[] for _ in range(n)], 'job_terms': []}
+        if n == 0:
+            return empty
+
+        if not self.available:
+            return {
+                'similarities': [float(self._jaccard_similarity(t, jd_text)) for t in resume_texts],
+                'resume_terms': [[] for _ in range(n)],
+                'job_terms': []
+            }
+
+        try:
+            analyzer = self.vectorizer.build_analyzer()
+            documents = [analyzer(t or "") for t in resume_texts]
+            documents.append(jd_terms if jd_terms is not None else analyzer(jd_text or ""))
+            # Fresh copy of the configured vectorizer (safe to use from several
+            # threads) fed the pre-analyzed terms. No document-frequency pruning:
+            # with a handful of resumes max_df would drop exactly the terms they
+            # share with the JD, so scores would depend on the batch size
+            vectorizer = clone(self.vectorizer).set_params(
+                analyzer=_pre_analyzed, stop_words=None, ngram_range=(1, 1), max_df=1.0, min_df=1
+            )
+            tfidf_matrix = vectorizer.fit_transform(documents)
+        except ValueError as e:
+            # e.g. every term is a stop word
+            print(f"Error in batch similarity calculation: {e}")
+            return empty
+
+        # Rows are L2-normalised, so the dot product is the cosine similarity
+        similarities = (tfidf_matrix[:n] @ tfidf_matrix[n].T).toarray().ravel()
+        feature_names = vectorizer.get_feature_names_out()
+        terms = [self._row_top_terms(tfidf_matrix, i, feature_names, top_n) for i in range(n + 1)]
+
+        return {
+            'similarities': [float(v) for v in similarities],
+            'resume_terms': terms[:n],
+            'job_terms': terms[n]
+        }
+
+    def _row_top_terms(self, tfidf_matrix, row: int, feature_names, top_n: int) -> List[str]:
+        start, end = tfidf_matrix.indptr[row], tfidf_matrix.indptr[row + 1]
+        scores = tfidf_matrix.data[start:end]
+        columns = tfidf_matrix.indices[start:end]
+        top = np.argsort(-scores, kind='stable')[:top_n]
+        return [str(feature_names[columns[i]]) for i in top if scores[i] > 0]
     
     def calculate_skill_match(self, resume_skills: Union[Set[str], List[str]], jd_skills: Union[Set[str], List[str]]) -> Dict:
         """
         Calculate skill-based match (more accurate than TF-IDF alone)
+        Skills are compared by canonical ID, so "ReactJS" matches "React.js"
         """
-        resume_skills_set = set([s.lower() for s in resume_skills])
-        jd_skills_set = set([s.lower() for s in jd_skills])
+        index = default_index()
+        jd_by_key = {}
+        for s in jd_skills:
+            jd_by_key.setdefault(index.canonical_key(s), s.lower())
+        resume_keys = set(index.canonical_key(s) for s in resume_skills)
         
-        if not jd_skills_set:
+        if not jd_by_key:
             return {'score': 0, 'matched': [], 'missing': []}
         
         # Find matches
-        matched = resume_skills_set & jd_skills_set
-        missing = jd_skills_set - resume_skills_set
+        matched = [s for key, s in jd_by_key.items() if key in resume_keys]
+        missing = [s for key, s in jd_by_key.items() if key not in resume_keys]
         
         # Calculate score
-        score = len(matched) / len(jd_skills_set) if jd_skills_set else 0
+        score = len(matched) / len(jd_by_key) if jd_by_key else 0
         
         return {
             'score': round(score * 100, 2),
@@ -150,12 +203,16 @@ class TFIDFJobMatcher:
                            resume_skills: Union[Set[str], List[str]],
                            jd_skills: Union[Set[str], List[str]],
                            resume_exp: float,
-                           jd_exp: float) -> Dict:
+                           jd_exp: float,
+                           tfidf_score: Optional[float] = None,
+                           top_terms: Optional[Dict] = None) -> Dict:
         """
         Complete matching with all components
+        tfidf_score/top_terms may be passed in from match_batch to skip refitting
         """
         # 1. TF-IDF similarity (overall content match)
-        tfidf_score = self.calculate_similarity(resume_text, jd_text)
+        if tfidf_score is None:
+            tfidf_score = self.calculate_similarity(resume_text, jd_text)
         
         # 2. Skill match (keyword based)
         skill_match = self.calculate_skill_match(resume_skills, jd_skills)
@@ -174,7 +231,7 @@ class TFIDFJobMatcher:
             'tfidf_similarity': round(tfidf_score * 100, 2),
             'skill_match': skill_match,
             'experience_match': round(exp_match, 2),
-            'top_terms': {
+            'top_terms': top_terms if top_terms is not None else {
                 'resume': self.get_key_terms(resume_text, 5),
                 'job': self.get_key_terms(jd_text, 5)
             }
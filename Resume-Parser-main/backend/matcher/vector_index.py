@@ -0,0 +1,178 @@
+"""
+Vector Index - cosine top-k search over L2-normalised embeddings (NumPy only)
+Small pools are searched exhaustively; large ones through an IVF index
+(spherical k-means coarse quantiser, only the closest lists are scanned).
+"""
+
+import math
+
+import numpy as np
+
+def normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+def top_k(scores, k):
+    """Indices of the k highest scores, best first"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(len(scores))
+    return idx[np.argsort(-scores[idx], kind='stable')]
+
+class IVFIndex:
+    """
+    Inverted-file index: every vector is filed under its nearest centroid and a
+    query scans only the nprobe lists whose centroids are closest to it.
+    """
+
+    def __init__(self, vectors, nlist=None, nprobe=8, iterations=10, seed=0):
+        """
+        Args:
+            vectors: (n, dim) L2-normalised float32 matrix
+            nlist: Number of lists (defaults to sqrt(n))
+            nprobe: Lists scanned per query (higher = better recall, slower)
+        """
+        n = len(vectors)
+        self.nlist = max(1, min(n, nlist or int(math.sqrt(n))))
+        self.nprobe = max(1, min(nprobe, self.nlist))
+        rng = np.random.default_rng(seed)
+
+        # Train on a sample; ~64 points per list is plenty for a coarse quantiser
+        sample = vectors
+        if n > self.nlist * 64:
+            sample = vectors[rng.choice(n, self.nlist * 64, replace=False)]
+        centroids = sample[rng.choice(len(sample), self.nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = self._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            counts = np.bincount(assign, minlength=self.nlist)
+            empty = counts == 0
+            if empty.any():
+                # Re-seed empty lists with random points
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = normalize_rows(sums)
+        self.centroids = centroids
+
+        assign = self._assign(vectors, centroids)
+        self.order = np.argsort(assign, kind='stable')
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=self.nlist))])
+
+    @staticmethod
+    def _assign(vectors, centroids, chunk=65536):
+        out = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), chunk):
+            out[start:start + chunk] = np.argmax(vectors[start:start + chunk] @ centroids.T, axis=1)
+        return out
+
+    def candidates(self, query):
+        """Row indices in the nprobe lists closest to query"""
+        probe = top_k(self.centroids @ query, self.nprobe)
+        return np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in probe])
+
+class VectorIndex:
+    """
+    Exact search up to brute_force_max vectors, IVF above that. Vectors added
+    after the IVF build are scanned exactly until they exceed rebuild_ratio of the pool.
+    Removed rows are tombstoned (skipped by search) until compact() drops them.
+    """
+
+    def __init__(self, brute_force_max=20000, nprobe=8, rebuild_ratio=0.1):
+        self.brute_force_max = brute_force_max
+        self.nprobe = nprobe
+        self.rebuild_ratio = rebuild_ratio
+        self.vectors = np.empty((0, 0), dtype=np.float32)
+        self._pending = []
+        self._removed = np.zeros(0, dtype=bool)
+        self._removed_count = 0
+        self._ivf = None
+        self._ivf_size = 0
+
+    @property
+    def rows(self):
+        """Row count including tombstoned rows (positions run 0..rows-1)"""
+        return len(self.vectors) + sum(len(p) for p in self._pending)
+
+    def __len__(self):
+        return self.rows - self._removed_count
+
+    @property
+    def kind(self):
+        return 'ivf' if len(self) > self.brute_force_max else 'exact'
+
+    @property
+    def needs_compaction(self):
+        return self._removed_count > self.rebuild_ratio * max(self.rows, 1)
+
+    def reset(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.vectors = normalize_rows(vectors) if len(vectors) else np.empty((0, 0), dtype=np.float32)
+        self._pending = []
+        self._removed = np.zeros(len(self.vectors), dtype=bool)
+        self._removed_count = 0
+        self._ivf = None
+        self._ivf_size = 0
+
+    def add(self, vectors):
+        """Append rows; their positions continue after the existing ones"""
+        vectors = normalize_rows(vectors)
+        if len(vectors):
+            self._pending.append(vectors)
+
+    def remove(self, row):
+        """Tombstone one row; positions of the other rows do not change"""
+        self._consolidate()
+        if not self._removed[row]:
+            self._removed[row] = True
+            self._removed_count += 1
+
+    def compact(self):
+        """
+        Drop tombstoned rows; returns the old positions of the rows kept, in
+        their new order. The IVF lists are retrained on the next large search.
+        """
+        self._consolidate()
+        keep = np.flatnonzero(~self._removed)
+        if self._removed_count:
+            self.reset(self.vectors[keep])
+        return keep
+
+    def _consolidate(self):
+        if self._pending:
+            parts = ([self.vectors] if len(self.vectors) else []) + self._pending
+            self.vectors = np.vstack(parts)
+            self._pending = []
+            self._removed = np.concatenate([
+                self._removed, np.zeros(len(self.vectors) - len(self._removed), dtype=bool)
+            ])
+
+    def search(self, query, k):
+        """(indices, scores) of the k most similar live rows, best first"""
+        self._consolidate()
+        n = len(self.vectors)
+        if n == 0 or k <= 0 or len(self) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        query = normalize_rows(query)
+
+        if len(self) <= self.brute_force_max:
+            scores = self.vectors @ query
+            if self._removed_count:
+                scores[self._removed] = -np.inf
+            idx = top_k(scores, min(k, len(self)))
+            return idx, scores[idx]
+
+        if self._ivf is None or n - self._ivf_size > self.rebuild_ratio * self._ivf_size:
+            self._ivf = IVFIndex(self.vectors, nprobe=self.nprobe)
+            self._ivf_size = n
+        # Rows added since the build are scanned exactly
+        idx = np.concatenate([self._ivf.candidates(query), np.arange(self._ivf_size, n)])
+        if self._removed_count:
+            idx = idx[~self._removed[idx]]
+        scores = self.vectors[idx] @ query
+        best = top_k(scores, k)
+        return idx[best], scores[best]
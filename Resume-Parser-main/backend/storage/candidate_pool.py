@@ -0,0 +1,208 @@
+"""
+Candidate Pool - parsed resumes kept across requests (SQLite, stdlib + NumPy)
+Each candidate keeps its extracted fields and, when the semantic model is
+loaded, its resume embedding; the embeddings are served from a VectorIndex.
+Adds, replacements and removals update the in-memory index in place
+(removed rows are tombstoned and compacted away before a later search).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from matcher.vector_index import VectorIndex
+
+def candidate_id_for(full_text):
+    """Same extracted text -> same candidate, so re-adding a resume replaces it"""
+    return hashlib.sha256((full_text or '').encode('utf-8')).hexdigest()[:16]
+
+class CandidatePool:
+    def __init__(self, path=':memory:', brute_force_max=20000, nprobe=8):
+        """
+        Args:
+            path: SQLite file (parent directories are created), or ':memory:'
+            brute_force_max: Pools up to this size are searched exactly, larger ones via IVF
+            nprobe: IVF lists scanned per query
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.index = VectorIndex(brute_force_max=brute_force_max, nprobe=nprobe)
+        # Row i of the index belongs to candidate self._index_ids[i] (None once removed)
+        self._index_ids = []
+        self._rows = {}
+        self.embedding_model = None
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS candidates ("
+            " candidate_id TEXT PRIMARY KEY,"
+            " filename TEXT NOT NULL,"
+            " record BLOB NOT NULL,"
+            " embedding BLOB,"
+            " embedding_model TEXT,"
+            " added REAL NOT NULL)"
+        )
+        self._load_index()
+
+    def _load_index(self, model_name=None):
+        """Rebuild the in-memory index from the embeddings of one model"""
+        if model_name is None:
+            row = self.conn.execute(
+                "SELECT embedding_model FROM candidates WHERE embedding IS NOT NULL"
+                " ORDER BY added DESC LIMIT 1"
+            ).fetchone()
+            model_name = row[0] if row else None
+        rows = self.conn.execute(
+            "SELECT candidate_id, embedding FROM candidates"
+            " WHERE embedding IS NOT NULL AND embedding_model = ? ORDER BY added",
+            (model_name,)
+        ).fetchall()
+        self.embedding_model = model_name
+        self._index_ids = [r[0] for r in rows]
+        self._rows = {candidate_id: i for i, candidate_id in enumerate(self._index_ids)}
+        vectors = [np.frombuffer(r[1], dtype=np.float32) for r in rows]
+        self.index.reset(np.stack(vectors) if vectors else [])
+
+    def _unindex(self, candidate_id):
+        """(Lock held) Tombstone a candidate's row"""
+        row = self._rows.pop(candidate_id, None)
+        if row is not None:
+            self.index.remove(row)
+            self._index_ids[row] = None
+
+    def _index(self, candidate_id, vector, embedding_model):
+        """(Lock held) Index a candidate's embedding; a new model starts a fresh index"""
+        if embedding_model != self.embedding_model:
+            # Only one model's embeddings are searchable at a time; the newest wins
+            self._load_index(embedding_model)
+            return
+        self._unindex(candidate_id)
+        self._rows[candidate_id] = len(self._index_ids)
+        self._index_ids.append(candidate_id)
+        self.index.add(vector[None, :])
+
+    def _compact(self):
+        """(Lock held) Drop tombstoned rows once they are a large enough share of the index"""
+        if self.index.needs_compaction:
+            self._index_ids = [self._index_ids[i] for i in self.index.compact().tolist()]
+            self._rows = {candidate_id: i for i, candidate_id in enumerate(self._index_ids)}
+
+    def add(self, candidate_id, record, embedding=None, embedding_model=None):
+        """Insert or replace one candidate; record is the parsed resume dict"""
+        payload = {k: v for k, v in record.items() if k not in ('rank', 'job_match', 'ai_insights')}
+        blob = zlib.compress(json.dumps(payload, default=str).encode('utf-8'), 1)
+        vector = np.asarray(embedding, dtype=np.float32) if embedding is not None else None
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO candidates VALUES (?, ?, ?, ?, ?, ?)",
+                (candidate_id, record.get('filename', ''), blob,
+                 vector.tobytes() if vector is not None else None,
+                 embedding_model if vector is not None else None, time.time())
+            )
+            if vector is not None:
+                self._index(candidate_id, vector, embedding_model)
+            else:
+                self._unindex(candidate_id)
+
+    def set_embeddings(self, candidate_ids, embeddings, embedding_model):
+        """Store (and index) embeddings for candidates already in the pool"""
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        with self.lock:
+            for candidate_id, vector in zip(candidate_ids, vectors):
+                cursor = self.conn.execute(
+                    "UPDATE candidates SET embedding = ?, embedding_model = ? WHERE candidate_id = ?",
+                    (vector.tobytes(), embedding_model, candidate_id)
+                )
+                if cursor.rowcount:
+                    self._index(candidate_id, vector, embedding_model)
+
+    def remove(self, candidate_id):
+        with self.lock:
+            cursor = self.conn.execute("DELETE FROM candidates WHERE candidate_id = ?", (candidate_id,))
+            if cursor.rowcount:
+                self._unindex(candidate_id)
+            return cursor.rowcount > 0
+
+    def get_many(self, candidate_ids):
+        """Parsed records for the given ids, in the same order (missing ids are skipped)"""
+        if not candidate_ids:
+            return []
+        with self.lock:
+            found = {}
+            for start in range(0, len(candidate_ids), 500):
+                chunk = candidate_ids[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for candidate_id, blob in self.conn.execute(
+                    f"SELECT candidate_id, record FROM candidates WHERE candidate_id IN ({placeholders})",
+                    chunk
+                ):
+                    found[candidate_id] = blob
+        records = []
+        for candidate_id in candidate_ids:
+            if candidate_id in found:
+                record = json.loads(zlib.decompress(found[candidate_id]))
+                record['candidate_id'] = candidate_id
+                records.append(record)
+        return records
+
+    def ids(self, limit=None):
+        """Candidate ids, newest first"""
+        with self.lock:
+            sql = "SELECT candidate_id FROM candidates ORDER BY added DESC"
+            rows = self.conn.execute(sql + (" LIMIT ?" if limit else ""), (limit,) if limit else ()).fetchall()
+        return [r[0] for r in rows]
+
+    def unembedded_ids(self, embedding_model, limit=None):
+        """
+        Candidates the vector index can't find for embedding_model, newest first:
+        added without an embedding or embedded by another model (every candidate
+        when embedding_model is None)
+        """
+        if embedding_model is None:
+            return self.ids(limit=limit)
+        with self.lock:
+            sql = ("SELECT candidate_id FROM candidates WHERE embedding IS NULL OR embedding_model IS NOT ?"
+                   " ORDER BY added DESC")
+            params = (embedding_model,)
+            if limit:
+                sql += " LIMIT ?"
+                params += (limit,)
+            rows = self.conn.execute(sql, params).fetchall()
+        return [r[0] for r in rows]
+
+    def search(self, query_embedding, k, embedding_model):
+        """[(candidate_id, cosine similarity)] of the k nearest embedded candidates"""
+        with self.lock:
+            if embedding_model != self.embedding_model:
+                return []
+            self._compact()
+            idx, scores = self.index.search(np.asarray(query_embedding, dtype=np.float32), k)
+            return [(self._index_ids[i], float(s)) for i, s in zip(idx.tolist(), scores.tolist())]
+
+    def stats(self):
+        with self.lock:
+            total = self.conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+            return {
+                'candidates': total,
+                'embedded': len(self._rows),
+                'embedding_model': self.embedding_model,
+                'index': self.index.kind
+            }
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
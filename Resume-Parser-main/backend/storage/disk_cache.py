@@ -0,0 +1,118 @@
+"""
+Disk LRU Cache - small key/value store on SQLite (stdlib only)
+Bounded by total value size; least recently used entries are evicted first.
+Entries may also carry an expiry time (TTL) after which they read as missing.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+class DiskLRUCache:
+    """
+    Persistent bytes cache shared by the parse cache and other memoisation layers.
+    Safe to use from several threads of one process.
+    """
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024, ttl_seconds=None):
+        """
+        Args:
+            path: SQLite file (parent directories are created)
+            max_bytes: Upper bound on the summed size of stored values
+            ttl_seconds: Default lifetime of an entry (None = until evicted)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        # Files created before TTL support lack the expiry column
+        columns = [r[1] for r in self.conn.execute("PRAGMA table_info(entries)")]
+        if 'expires' not in columns:
+            self.conn.execute("ALTER TABLE entries ADD COLUMN expires REAL")
+        row = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        self.total_bytes = row[0]
+        self.purge_expired()
+
+    def get(self, key, with_expiry=False):
+        """Stored bytes or None; (value, expires) pairs with with_expiry=True"""
+        with self.lock:
+            row = self.conn.execute("SELECT value, size, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is not None and row[2] is not None and row[2] <= now:
+                self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.total_bytes -= row[1]
+                row = None
+            if row is None:
+                return (None, None) if with_expiry else None
+            self.conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            return (row[0], row[2]) if with_expiry else row[0]
+
+    def set(self, key, value, ttl_seconds=None):
+        """ttl_seconds overrides the cache-wide default for this entry"""
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        now = time.time()
+        with self.lock:
+            old = self.conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed, expires) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now + ttl if ttl else None)
+            )
+            self.total_bytes += size - (old[0] if old else 0)
+            self._evict()
+
+    def purge_expired(self):
+        """Drop every expired entry; returns how many were removed"""
+        with self.lock:
+            now = time.time()
+            row = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE expires <= ?", (now,)
+            ).fetchone()
+            if row[0]:
+                self.conn.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+                self.total_bytes -= row[1]
+            return row[0]
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes:
+            rows = self.conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self.total_bytes = 0
+                return
+            for key, size in rows:
+                self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.total_bytes -= size
+                if self.total_bytes <= self.max_bytes:
+                    return
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM entries")
+            self.total_bytes = 0
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,104 @@
+"""
+Job Profile Store - registered job descriptions on SQLite (stdlib only)
+Profiles are kept until deleted; recently used ones stay loaded in memory.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from matcher.job_profile import JobProfile
+
+class JobProfileStore:
+    def __init__(self, path=':memory:', cache_size=256):
+        """
+        Args:
+            path: SQLite file (parent directories are created), or ':memory:'
+            cache_size: Profiles kept loaded (least recently used evicted first)
+        """
+        self.path = path
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        self._profiles = OrderedDict()
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_profiles ("
+            " job_id TEXT PRIMARY KEY,"
+            " fields TEXT NOT NULL,"
+            " jd_embedding BLOB,"
+            " skill_embeddings BLOB,"
+            " created REAL NOT NULL)"
+        )
+
+    def put(self, profile):
+        fields, jd_blob, skills_blob = profile.to_record()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO job_profiles VALUES (?, ?, ?, ?, ?)",
+                (profile.job_id, json.dumps(fields), jd_blob, skills_blob, profile.created_at)
+            )
+            self._remember(profile)
+        return profile
+
+    def _remember(self, profile):
+        self._profiles[profile.job_id] = profile
+        self._profiles.move_to_end(profile.job_id)
+        while len(self._profiles) > self.cache_size:
+            self._profiles.popitem(last=False)
+
+    def update(self, profile):
+        """Rewrite a registered profile (e.g. once its embeddings are filled in); False if it was deleted"""
+        fields, jd_blob, skills_blob = profile.to_record()
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE job_profiles SET fields = ?, jd_embedding = ?, skill_embeddings = ? WHERE job_id = ?",
+                (json.dumps(fields), jd_blob, skills_blob, profile.job_id)
+            )
+            return cursor.rowcount > 0
+
+    def get(self, job_id):
+        with self.lock:
+            profile = self._profiles.get(job_id)
+            if profile is not None:
+                self._profiles.move_to_end(job_id)
+                return profile
+            row = self.conn.execute(
+                "SELECT fields, jd_embedding, skill_embeddings FROM job_profiles WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            profile = JobProfile.from_record(json.loads(row[0]), row[1], row[2])
+            self._remember(profile)
+            return profile
+
+    def list(self):
+        """Summaries of every profile, newest first, without loading the embeddings"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT fields, length(jd_embedding) > 0 FROM job_profiles ORDER BY created DESC"
+            ).fetchall()
+        summaries = []
+        for fields, has_embedding in rows:
+            fields = json.loads(fields)
+            summary = JobProfile.from_record(fields).summary()
+            summary['semantic_ready'] = bool(fields.get('dim') and has_embedding)
+            summaries.append(summary)
+        return summaries
+
+    def delete(self, job_id):
+        with self.lock:
+            self._profiles.pop(job_id, None)
+            cursor = self.conn.execute("DELETE FROM job_profiles WHERE job_id = ?", (job_id,))
+            return cursor.rowcount > 0
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
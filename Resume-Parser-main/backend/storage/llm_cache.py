@@ -0,0 +1,118 @@
+"""
+LLM Response Cache - parsed Gemini responses keyed on a hash of the prompt inputs
+Disk-backed (DiskLRUCache with TTL and size eviction) with a small in-memory
+LRU in front, so a repeated resume/JD pair is answered without a model call.
+Hits and misses are counted globally and per request (see track_request).
+"""
+
+import contextvars
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from storage.disk_cache import DiskLRUCache
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def record(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def as_dict(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 3) if lookups else None
+        }
+
+# Counters of the request being served; asyncio tasks inherit them from the request
+_request_stats = contextvars.ContextVar('llm_cache_request_stats', default=None)
+
+def track_request():
+    """CacheStats for the current request, started on first call in this context"""
+    stats = _request_stats.get()
+    if stats is None:
+        stats = CacheStats()
+        _request_stats.set(stats)
+    return stats
+
+class LLMResponseCache:
+    def __init__(self, path, max_bytes=64 * 1024 * 1024, ttl_seconds=7 * 24 * 3600, memory_items=1024):
+        """
+        Args:
+            path: SQLite file (parent directories are created)
+            max_bytes: Size bound of the disk store (least recently used evicted first)
+            ttl_seconds: Lifetime of a cached response
+            memory_items: Responses also kept decoded in memory
+        """
+        self.store = DiskLRUCache(path, max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+        self.ttl_seconds = ttl_seconds
+        self.memory_items = memory_items
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = CacheStats()
+
+    @staticmethod
+    def key_for(*parts):
+        """Hash of the prompt inputs (template version, model, truncated texts...)"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\x1f')
+        return digest.hexdigest()
+
+    def _record(self, hit):
+        self.stats.record(hit)
+        request = _request_stats.get()
+        if request is not None:
+            request.record(hit)
+
+    def get(self, key):
+        """Cached response object, or None"""
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self.memory.move_to_end(key)
+                    self._record(True)
+                    return entry[1]
+                del self.memory[key]
+        try:
+            blob, expires = self.store.get(key, with_expiry=True)
+            value = json.loads(blob) if blob is not None else None
+        except Exception as e:
+            print(f"[WARNING] LLM cache read failed: {e}")
+            value = None
+        if value is not None:
+            self._remember(key, value, expires)
+        self._record(value is not None)
+        return value
+
+    def set(self, key, value):
+        try:
+            self.store.set(key, json.dumps(value).encode('utf-8'))
+        except Exception as e:
+            print(f"[WARNING] LLM cache write failed: {e}")
+        self._remember(key, value, time.time() + self.ttl_seconds if self.ttl_seconds else None)
+
+    def _remember(self, key, value, expires):
+        # The in-memory copy expires together with the disk entry
+        with self.lock:
+            self.memory[key] = (expires if expires is not None else float('inf'), value)
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.memory_items:
+                self.memory.popitem(last=False)
+
+    def close(self):
+        self.store.close()
@@ -0,0 +1,219 @@
+"""
+AI scheduler admission control: token bucket refill, timeouts, priority
+ordering and the batch reserve, the circuit breaker's trip / probe / close
+cycle, and splitting the budget across processes
+"""
+
+import asyncio
+import threading
+import time
+import types
+
+import pytest
+
+import ai_scheduler
+from ai_scheduler import (BATCH, INTERACTIVE, AIScheduler, CircuitBreaker, CircuitOpen,
+                          RateLimited, TokenBucket)
+
+class FakeClock:
+    """Stands in for the scheduler's `time` module: sleeping only advances the clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ai_scheduler, 'time', clock)
+    return clock
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+def test_bucket_refills_at_its_rate(clock):
+    bucket = TokenBucket(60)
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+
+    clock.now += 30
+    assert bucket.wait_time(30) == 0.0
+    assert bucket.wait_time(40) == pytest.approx(10.0)
+    # Leaving a 10% reserve costs another 6 tokens
+    assert bucket.wait_time(30, reserve=0.1) == pytest.approx(6.0)
+
+    clock.now += 3600
+    bucket.wait_time(1)
+    assert bucket.level == 60
+    bucket.take(10)
+    bucket.give_back(50)
+    assert bucket.level == 60
+
+def test_unlimited_scheduler_admits_at_once():
+    scheduler = AIScheduler()
+    assert scheduler.acquire(10 ** 9, priority=BATCH, timeout=0) == 10 ** 9
+    assert asyncio.run(scheduler.aacquire(5, timeout=0)) == 5
+    assert scheduler.counters['admitted'] == 2
+
+def test_acquire_times_out():
+    scheduler = AIScheduler(requests_per_minute=60)
+    scheduler.requests.take(60)
+    started = time.monotonic()
+    with pytest.raises(RateLimited):
+        scheduler.acquire(1, timeout=0.05)
+    assert 0.05 <= time.monotonic() - started < 0.5
+    with pytest.raises(RateLimited):
+        asyncio.run(scheduler.aacquire(1, timeout=0.05))
+    assert scheduler.counters['rate_limited'] == 2
+    assert scheduler.waiting == []
+    assert scheduler.status()['queued'] == {'interactive': 0, 'batch': 0}
+
+def test_cancelled_async_waiter_leaves_the_queue():
+    scheduler = AIScheduler(requests_per_minute=60)
+    scheduler.requests.take(60)
+
+    async def cancel():
+        task = asyncio.ensure_future(scheduler.aacquire(1))
+        await asyncio.sleep(0.02)
+        assert len(scheduler.waiting) == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+    assert scheduler.waiting == []
+    assert scheduler.counters['rate_limited'] == 0
+
+def test_batch_cannot_drain_the_reserve(clock):
+    scheduler = AIScheduler(requests_per_minute=100, tokens_per_minute=10000, batch_reserve=0.1)
+    scheduler.requests.level = 11
+    assert scheduler.acquire(100, priority=BATCH, timeout=0) == 100
+    # 10 requests left: all of it is the interactive reserve
+    with pytest.raises(RateLimited):
+        scheduler.acquire(100, priority=BATCH, timeout=0)
+    assert scheduler.acquire(100, priority=INTERACTIVE, timeout=0) == 100
+    assert scheduler.requests.level == 9
+    # A prompt over the whole budget is clamped instead of never being admitted
+    assert scheduler.acquire(50000, timeout=0) == 9000
+
+def test_interactive_admitted_before_batch():
+    # One request every 0.1s, so every waiter is queued before the first is admitted
+    scheduler = AIScheduler(requests_per_minute=600, batch_reserve=0.0)
+    scheduler.requests.take(scheduler.requests.level)
+    admitted = []
+
+    def call(name, priority):
+        scheduler.acquire(1, priority=priority, timeout=5)
+        admitted.append(name)
+
+    threads = [threading.Thread(target=call, args=args)
+               for args in (('batch-1', BATCH), ('batch-2', BATCH), ('interactive', INTERACTIVE))]
+    with scheduler.lock:
+        for thread in threads:
+            thread.start()
+            time.sleep(0.02)
+    for thread in threads:
+        thread.join(5)
+    # Interactive first, FIFO within a priority
+    assert admitted == ['interactive', 'batch-1', 'batch-2']
+    assert scheduler.counters['admitted'] == 3
+
+def test_breaker_opens_probes_and_closes(clock):
+    scheduler = AIScheduler(failure_threshold=3, cooldown=1.0)
+    scheduler.breaker.max_cooldown = 3.0
+    probes = []
+
+    def probe():
+        probes.append(clock.now)
+        if len(probes) < 3:
+            raise ConnectionError("still down")
+
+    scheduler.set_probe(probe)
+    # Failures that are not consecutive do not trip it
+    scheduler.record_failure(TimeoutError("slow"))
+    scheduler.record_failure(TimeoutError("slow"))
+    scheduler.record_success(0)
+    scheduler.record_failure(TimeoutError("slow"))
+    scheduler.record_failure(TimeoutError("slow"))
+    assert scheduler.breaker.state == 'closed'
+
+    # Hold the probe thread back until the open state has been checked
+    release = threading.Event()
+    sleep = clock.sleep
+    clock.sleep = lambda seconds: (release.wait(5), sleep(seconds))
+    scheduler.record_failure(TimeoutError("slow"))
+    assert scheduler.breaker.state == 'open'
+    assert scheduler.breaker.trips == 1
+    with pytest.raises(CircuitOpen):
+        scheduler.acquire(100)
+    with pytest.raises(CircuitOpen):
+        asyncio.run(scheduler.aacquire(100))
+    assert scheduler.counters['circuit_open'] == 2
+    assert scheduler.status()['circuit']['last_error'] == "TimeoutError: slow"
+
+    release.set()
+    _wait_for(lambda: scheduler.breaker.state == 'closed')
+    # Failed probes back off (doubling, capped) before the one that succeeds
+    assert clock.sleeps == [1.0, 2.0, 3.0]
+    assert len(probes) == 3
+    assert scheduler.breaker.failures == 0
+    assert scheduler.breaker.last_error == "ConnectionError: still down"
+    assert scheduler.acquire(100) == 100
+
+def test_breaker_without_probe_closes_after_cooldown(clock):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=2.0)
+    breaker.record_failure(RuntimeError("quota"))
+    _wait_for(lambda: breaker.allow())
+    assert clock.sleeps == [2.0]
+    assert breaker.trips == 1
+
+def test_record_success_settles_the_token_estimate(clock):
+    scheduler = AIScheduler(tokens_per_minute=10000)
+    reserved = scheduler.acquire(1000)
+    assert scheduler.tokens.level == 9000
+    response = types.SimpleNamespace(usage_metadata=types.SimpleNamespace(total_token_count=300))
+    scheduler.record_success(reserved, response)
+    assert scheduler.tokens.level == 9700
+
+def test_set_share_keeps_what_was_spent(clock):
+    scheduler = AIScheduler(requests_per_minute=100, tokens_per_minute=10000)
+    scheduler.requests.take(10)
+    scheduler.set_share(0.5)
+    assert scheduler.requests.capacity == 50
+    assert scheduler.requests.rate == pytest.approx(50 / 60)
+    assert scheduler.requests.level == 40
+    assert scheduler.tokens.level == 5000
+    scheduler.set_share(0.01)
+    assert scheduler.requests.level == 0
+
+def test_budget_share_splits_the_shared_scheduler(monkeypatch):
+    monkeypatch.setenv('AI_REQUESTS_PER_MINUTE', '120')
+    monkeypatch.setenv('AI_TOKENS_PER_MINUTE', '0')
+    monkeypatch.setattr(ai_scheduler, '_shared', None)
+    monkeypatch.setattr(ai_scheduler, '_shared_share', 1.0)
+
+    # Before first use: the scheduler is built with the share
+    ai_scheduler.set_budget_share(4)
+    scheduler = ai_scheduler.shared_scheduler()
+    assert scheduler is ai_scheduler.shared_scheduler()
+    assert scheduler.requests.capacity == 30
+    assert scheduler.tokens is None
+
+    # After: the existing scheduler is resized
+    ai_scheduler.set_budget_share(2)
+    assert scheduler.requests.capacity == 60
+    ai_scheduler.set_budget_share(0)
+    assert scheduler.requests.capacity == 120
@@ -0,0 +1,117 @@
+"""
+CollegeMatcher against a brute-force token scan, and CollegeRanker against
+the linear substring lookup it replaced wherever that lookup was unambiguous
+"""
+
+import os
+import random
+
+import pytest
+
+from extraction.college_matcher import CollegeMatcher, name_variants, tokenize
+from extraction.college_ranker import CollegeRanker
+
+RANKINGS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+def brute_find_all(names, text):
+    """Leftmost-longest, non-overlapping token matches by trying every start"""
+    first = {}
+    for tokens, value in names:
+        first.setdefault(tuple(tokens), value)
+    tokens = tokenize(text)
+    found = []
+    i = 0
+    while i < len(tokens):
+        length = next((n for n in range(len(tokens) - i, 0, -1) if tuple(tokens[i:i + n]) in first), 0)
+        if length:
+            found.append((i, first[tuple(tokens[i:i + length])]))
+            i += length
+        else:
+            i += 1
+    return found
+
+def brute_find_containing(names, text):
+    query = tuple(tokenize(text))
+    n = len(query)
+    return [value for tokens, value in names
+            if any(tuple(tokens[i:i + n]) == query for i in range(len(tokens) - n + 1))]
+
+def _random_case(rng, vocab='abcdef'):
+    names = [(tuple(rng.choice(vocab) for _ in range(rng.randint(1, 4))), k) for k in range(rng.randint(1, 6))]
+    text = ' '.join(rng.choice(vocab) for _ in range(rng.randint(0, 12)))
+    return names, text
+
+def _matcher(names):
+    matcher = CollegeMatcher()
+    for tokens, value in names:
+        matcher.add(tokens, value)
+    return matcher.build()
+
+def test_find_all_matches_brute_force():
+    rng = random.Random(5)
+    for _ in range(5000):
+        names, text = _random_case(rng)
+        assert _matcher(names).find_all(text) == brute_find_all(names, text), (names, text)
+
+def test_later_mention_after_an_overlapping_match():
+    # 'a b' wins at 0; 'b c d' overlaps it, but 'd' must still be reported
+    names = [(('a', 'b'), 0), (('b', 'c', 'd'), 1), (('d',), 2)]
+    assert _matcher(names).find_all('a b c d') == [(0, 0), (3, 2)]
+
+def test_find_containing_matches_brute_force():
+    rng = random.Random(6)
+    for _ in range(2000):
+        names, text = _random_case(rng, vocab='pqrst')
+        # Distinct sequences only: the index keeps the first value per sequence
+        names = list({tokens: (tokens, value) for tokens, value in reversed(names)}.values())
+        query = ' '.join(text.split()[:3])
+        if not query:
+            continue
+        assert sorted(_matcher(names).find_containing(query)) == sorted(brute_find_containing(names, query))
+
+def test_name_variants():
+    assert name_variants("Indian Institute of Science, Bengaluru") == [
+        ['indian', 'institute', 'of', 'science', 'bengaluru'],
+        ['indian', 'institute', 'of', 'science'],
+    ]
+    # Too generic to stand for one college on its own
+    assert name_variants("College of Engineering, Pune") == [['college', 'of', 'engineering', 'pune']]
+
+@pytest.fixture(scope='module')
+def ranker():
+    return CollegeRanker(RANKINGS_DIR)
+
+def old_lookup(ranker, query):
+    """The pre-index CollegeRanker.get_college_info, over the same rankings"""
+    cleaned = ranker._clean_college_name(query)
+    if cleaned in ranker.rankings:
+        return ranker.rankings[cleaned]
+    for stored_name, info in ranker.rankings.items():
+        if (stored_name in cleaned or cleaned in stored_name) and len(cleaned) > 5:
+            return info
+    return None
+
+def test_ranker_matches_linear_lookup(ranker):
+    compared = 0
+    for info in list(ranker.rankings.values()):
+        for query in (info['original_name'], f"B.Tech in CSE, {info['original_name']}, 2019-2023"):
+            cleaned = ranker._clean_college_name(query)
+            # With several stored names inside the query the old answer depended on dict order
+            if sum(stored in cleaned for stored in ranker.rankings) != 1:
+                continue
+            assert ranker.get_college_info(query) is old_lookup(ranker, query), query
+            compared += 1
+    assert compared > len(ranker.rankings)
+
+def test_tokens_not_substrings(ranker):
+    assert ranker.get_college_info("Built dynamically typed pipelines at a startup") is None
+    assert ranker.get_tier("IIT Bombay") == ranker.get_tier("Indian Institute of Technology Bombay") == 1
+
+def test_cache_is_bounded_and_remembers_misses():
+    ranker = CollegeRanker(None, cache_size=3)
+    for query in ("jadavpur university", "nowhere college", "anna university", "amity university"):
+        ranker.get_college_info(query)
+    assert len(ranker.tier_cache) == 3
+    assert ranker._cache_key("nowhere college") in ranker.tier_cache
+    assert ranker.tier_cache[ranker._cache_key("nowhere college")] is None
+    assert ranker.get_tier("Jadavpur") == 1
@@ -0,0 +1,123 @@
+"""
+Upload spooling: uploads held in memory never exceed the request's ceiling,
+and process workers get spooled uploads by path with identical bytes
+"""
+
+import asyncio
+import hashlib
+import os
+import pickle
+
+from batch.ingest import (MemoryBudget, SpoolFile, content_digest, content_source,
+                          open_payload, spool_uploads, worker_payload)
+from batch.workers import parse_resumes
+
+class FakeUpload:
+    """The part of FastAPI's UploadFile that spooling uses"""
+
+    def __init__(self, filename, data):
+        self.filename = filename
+        self._data = data
+        self._position = 0
+        self.closed = False
+
+    async def read(self, size):
+        chunk = self._data[self._position:self._position + size]
+        self._position += len(chunk)
+        return chunk
+
+    async def close(self):
+        self.closed = True
+
+def _spool(files, memory_ceiling, spool_threshold):
+    uploads = [FakeUpload(name, data) for name, data in files]
+    return uploads, asyncio.run(spool_uploads(uploads, memory_ceiling, spool_threshold))
+
+def test_budget_reserve_and_release():
+    budget = MemoryBudget(10)
+    assert budget.reserve(6)
+    assert not budget.reserve(5)
+    assert budget.used == 6
+    budget.release(6)
+    assert budget.reserve(10)
+    budget.release(100)
+    assert budget.used == 0
+
+def test_memory_ceiling_is_never_exceeded(monkeypatch):
+    peak = []
+    original = MemoryBudget.reserve
+
+    def tracking(self, size):
+        ok = original(self, size)
+        peak.append(self.used)
+        return ok
+
+    monkeypatch.setattr(MemoryBudget, 'reserve', tracking)
+    files = [(f'r{i}.pdf', os.urandom(3000 + 500 * i)) for i in range(6)]
+    uploads, spooled = _spool(files, memory_ceiling=8000, spool_threshold=5000)
+    try:
+        assert max(peak) <= 8000
+        assert all(upload.closed for upload in uploads)
+        # Early uploads fit in memory; the rest went to disk once the ceiling was reached
+        assert not spooled[0].on_disk
+        assert any(s.on_disk for s in spooled)
+        for (name, data), upload in zip(files, spooled):
+            assert bytes(content_source(upload)) == data
+            assert content_digest(upload) == hashlib.sha256(data).hexdigest()
+    finally:
+        for upload in spooled:
+            upload.close()
+
+def test_large_upload_goes_to_disk_and_close_releases_budget():
+    small, large = os.urandom(100), os.urandom(10000)
+    _, spooled = _spool([('small.pdf', small), ('large.pdf', large)], memory_ceiling=1 << 20, spool_threshold=4096)
+    budget = spooled[0]._budget
+    assert not spooled[0].on_disk and spooled[1].on_disk
+    assert budget.used == len(small)
+    for upload in spooled:
+        upload.close()
+    assert budget.used == 0
+
+def test_worker_payload_by_path():
+    data = os.urandom(20000)
+    _, (memory, spooled) = _spool([('a.pdf', b'tiny'), ('b.pdf', data)], memory_ceiling=1 << 20, spool_threshold=1024)
+    try:
+        assert worker_payload(memory) == b'tiny'
+        assert worker_payload(b'raw') == b'raw'
+
+        payload = worker_payload(spooled)
+        assert isinstance(payload, SpoolFile)
+        # Only the path crosses the process boundary, not the upload
+        pickled = pickle.dumps(payload)
+        assert len(pickled) < 1024
+        remote = pickle.loads(pickled)
+        try:
+            assert bytes(open_payload(remote)) == data
+        finally:
+            remote.close()
+    finally:
+        memory.close()
+        spooled.close()
+    assert not os.path.exists(payload.path)
+
+def test_empty_spool_file(tmp_path):
+    path = tmp_path / 'empty.pdf'
+    path.write_bytes(b'')
+    assert open_payload(SpoolFile(str(path), 0)) == b''
+
+def test_missing_spool_file_fails_only_that_resume(tmp_path, monkeypatch):
+    import batch.workers as workers
+
+    class Pipeline:
+        def parse_many(self, files):
+            return [{'filename': name, 'size': len(content)} for name, content in files]
+
+    monkeypatch.setattr(workers, '_pipeline', Pipeline())
+    path = tmp_path / 'ok.pdf'
+    path.write_bytes(b'12345')
+    results = parse_resumes([
+        ('ok.pdf', SpoolFile(str(path), 5)),
+        ('gone.pdf', SpoolFile(str(tmp_path / 'gone.pdf'), 5)),
+        ('mem.pdf', b'abc'),
+    ])
+    assert results == [{'filename': 'ok.pdf', 'size': 5}, None, {'filename': 'mem.pdf', 'size': 3}]
@@ -0,0 +1,60 @@
+"""
+JobProfileStore: the in-memory profile cache is a bounded LRU, and list()
+builds summaries from the stored fields without loading the embeddings
+"""
+
+import numpy as np
+
+from matcher.job_profile import JobProfile
+from storage.job_store import JobProfileStore
+
+def _profile(n, embedded=False):
+    requirements = {'title': f'Role {n}', 'required_skills': ['python', 'sql'], 'years_experience': float(n)}
+    profile = JobProfile(f'Job description {n}', requirements, tfidf_terms=[], created_at=1000.0 + n)
+    if embedded:
+        profile.jd_embedding = np.full(4, n, dtype=np.float32)
+        profile.skill_embeddings = np.ones((2, 4), dtype=np.float32)
+        profile.embedding_model = 'test-model'
+    return profile
+
+def test_profile_cache_is_bounded(tmp_path):
+    store = JobProfileStore(str(tmp_path / 'jobs.sqlite3'), cache_size=2)
+    profiles = [store.put(_profile(n, embedded=True)) for n in range(5)]
+    assert list(store._profiles) == [profiles[3].job_id, profiles[4].job_id]
+
+    # Evicted profiles are reloaded from SQLite, pushing out the least recently used one
+    reloaded = store.get(profiles[0].job_id)
+    assert reloaded is not profiles[0]
+    assert reloaded.summary() == profiles[0].summary()
+    assert np.array_equal(reloaded.jd_embedding, profiles[0].jd_embedding)
+    assert list(store._profiles) == [profiles[4].job_id, profiles[0].job_id]
+
+    # A hit counts as a use
+    assert store.get(profiles[4].job_id) is profiles[4]
+    store.get(profiles[1].job_id)
+    assert list(store._profiles) == [profiles[4].job_id, profiles[1].job_id]
+    store.close()
+
+def test_delete_drops_the_cached_profile():
+    store = JobProfileStore()
+    profile = store.put(_profile(1))
+    assert store.delete(profile.job_id)
+    assert store.get(profile.job_id) is None
+    assert not store.delete(profile.job_id)
+
+def test_list_skips_the_embeddings(monkeypatch):
+    store = JobProfileStore()
+    plain, embedded = store.put(_profile(1)), store.put(_profile(2, embedded=True))
+    expected = [embedded.summary(), plain.summary()]
+
+    original = JobProfile.from_record.__func__
+    blobs = []
+
+    def recording(cls, fields, jd_blob=None, skills_blob=None):
+        blobs.append((jd_blob, skills_blob))
+        return original(cls, fields, jd_blob, skills_blob)
+
+    monkeypatch.setattr(JobProfile, 'from_record', classmethod(recording))
+    assert store.list() == expected
+    assert expected[0]['semantic_ready'] and not expected[1]['semantic_ready']
+    assert blobs == [(None, None), (None, None)]
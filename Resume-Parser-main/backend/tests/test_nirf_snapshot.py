@@ -0,0 +1,117 @@
+"""
+NIRF snapshot round trip: a ranker loaded from the snapshot equals one parsed
+from the CSVs, and the snapshot is reused, rebuilt or bypassed as the CSVs change
+"""
+
+import glob
+import os
+import shutil
+
+import pytest
+
+import extraction.nirf_snapshot as nirf_snapshot
+from extraction.college_ranker import CollegeRanker
+
+RANKINGS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+@pytest.fixture
+def rankings_dir(tmp_path):
+    """The shipped CSVs without the shipped snapshot"""
+    directory = tmp_path / 'data'
+    directory.mkdir()
+    for path in glob.glob(os.path.join(RANKINGS_DIR, '*.csv')):
+        shutil.copy(path, directory)
+    return directory
+
+@pytest.fixture
+def parse_count(monkeypatch):
+    """Number of CSV files the rankers built in the test parsed"""
+    calls = []
+    original = CollegeRanker._load_rankings_file
+
+    def counting(self, csv_path, category):
+        calls.append(csv_path)
+        return original(self, csv_path, category)
+
+    monkeypatch.setattr(CollegeRanker, '_load_rankings_file', counting)
+    return calls
+
+def _state(ranker):
+    return ranker.rankings, ranker.category_files
+
+def test_snapshot_equals_csv_parse(rankings_dir, parse_count):
+    parsed = CollegeRanker(str(rankings_dir))
+    csv_count = len(parse_count)
+    assert csv_count == len(glob.glob(str(rankings_dir / '*.csv')))
+    assert (rankings_dir / nirf_snapshot.SNAPSHOT_NAME).exists()
+
+    loaded = CollegeRanker(str(rankings_dir))
+    assert len(parse_count) == csv_count
+    assert _state(loaded) == _state(parsed)
+    assert loaded.get_rank_details("IIT Madras") == parsed.get_rank_details("IIT Madras")
+
+def test_shipped_snapshot_is_current():
+    csv_files = sorted(glob.glob(os.path.join(RANKINGS_DIR, '*.csv')))
+    assert nirf_snapshot.load(os.path.join(RANKINGS_DIR, nirf_snapshot.SNAPSHOT_NAME), csv_files) is not None
+
+def test_touch_keeps_the_snapshot(rankings_dir, parse_count):
+    parsed = CollegeRanker(str(rankings_dir))
+    parse_count.clear()
+    for path in glob.glob(str(rankings_dir / '*.csv')):
+        os.utime(path, ns=(1, 1))
+    assert _state(CollegeRanker(str(rankings_dir))) == _state(parsed)
+    assert parse_count == []
+
+def test_edited_csv_rebuilds(rankings_dir, parse_count):
+    CollegeRanker(str(rankings_dir))
+    engineering = rankings_dir / 'Engineering.csv'
+    lines = engineering.read_text(encoding='utf-8').split('\n')
+    lines.insert(1, "IR-E-X-0000,Imaginary Institute of Testing,0,0,0,0,0,Pune,Maharashtra,99.0,1")
+    engineering.write_text('\n'.join(lines), encoding='utf-8')
+    parse_count.clear()
+
+    rebuilt = CollegeRanker(str(rankings_dir))
+    assert parse_count
+    assert rebuilt.get_rank_details("Imaginary Institute of Testing")['rank'] == 1
+
+    # The rewritten snapshot is current again
+    parse_count.clear()
+    assert _state(CollegeRanker(str(rankings_dir))) == _state(rebuilt)
+    assert parse_count == []
+
+def test_added_csv_rebuilds(rankings_dir, parse_count):
+    CollegeRanker(str(rankings_dir))
+    (rankings_dir / 'Nursing.csv').write_text("Name,Rank\nImaginary College of Nursing,7\n", encoding='utf-8')
+    parse_count.clear()
+    ranker = CollegeRanker(str(rankings_dir))
+    assert parse_count
+    assert ranker.get_rank_details("Imaginary College of Nursing")['category'] == 'Nursing'
+
+@pytest.mark.parametrize('content', [b'', b'NIRFSNAP', b'garbage' * 100, b'NIRFSNAP\x63\x00\x00\x00\x00\x00\x00\x00'])
+def test_corrupt_snapshot_rebuilds(rankings_dir, parse_count, content):
+    parsed = CollegeRanker(str(rankings_dir))
+    (rankings_dir / nirf_snapshot.SNAPSHOT_NAME).write_bytes(content)
+    parse_count.clear()
+    assert _state(CollegeRanker(str(rankings_dir))) == _state(parsed)
+    assert parse_count
+
+def test_unwritable_snapshot_falls_back_to_csvs(rankings_dir, parse_count, capsys):
+    parsed = CollegeRanker(str(rankings_dir))
+    ranker = CollegeRanker(str(rankings_dir), snapshot_path='/proc/nirf/nirf_rankings.snapshot')
+    assert _state(ranker) == _state(parsed)
+    assert "Could not write NIRF snapshot" in capsys.readouterr().out
+
+def test_save_load_round_trip(tmp_path):
+    csv_path = tmp_path / 'Engineering.csv'
+    csv_path.write_text("Name,Rank\nx,1\n", encoding='utf-8')
+    entries = [
+        ("Indian Institute of Technology Madras", 1, 'Engineering'),
+        ("Université de Test, Pondichéry", 42, 'Overall'),
+        ("Anna University", 7, 'Engineering'),
+    ]
+    path = str(tmp_path / 'rankings.snapshot')
+    nirf_snapshot.save(path, [str(csv_path)], entries, ['Engineering', 'Overall'])
+    assert nirf_snapshot.load(path, [str(csv_path)]) == (entries, ['Engineering', 'Overall'])
+    # Built from a different set of CSVs: stale
+    assert nirf_snapshot.load(path, []) is None
+    assert not glob.glob(str(tmp_path / '.nirf-*'))
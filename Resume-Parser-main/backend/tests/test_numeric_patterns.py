@@ -0,0 +1,115 @@
+"""
+NumericScan (one combined pass) against the separate re.search / re.finditer
+calls the numeric extractors used to make
+"""
+
+import random
+import re
+
+import pytest
+
+from extraction.cgpa_extractor import CGPAExtractor
+from extraction.numeric_patterns import PATTERNS, NumericScan
+from extraction.online_presence import OnlinePresenceExtractor
+from extraction.school_marks import SchoolMarksExtractor
+
+# Reference implementations: the per-extractor regexes before NumericScan
+
+_NUM = r"(\d+(?:\.\d+)?)"
+_DENOM = r"(10(?:\.0)?|4(?:\.0)?)"
+
+def old_cgpa(text):
+    for pattern in (rf"(?:cgpa|gpa)\s*[:\-]?\s*{_NUM}\s*/\s*{_DENOM}",
+                    rf"{_NUM}\s*/\s*{_DENOM}\s*(?:cgpa|gpa)?"):
+        match = re.search(pattern, text, re.IGNORECASE)
+        if not match:
+            continue
+        val, den = float(match.group(1)), float(match.group(2))
+        if abs(den - 4.0) < 1e-6:
+            val = val * 2.5
+        if 0 < val <= 10.0:
+            return round(val, 2)
+    for pattern in (rf"(?:cgpa|gpa)\s*(?:of\s*)?[:\-]?\s*{_NUM}",
+                    rf"{_NUM}\s*(?:cgpa|gpa)\b",
+                    rf"(?:grade|grade\s*point\s*average)\s*[:\-]?\s*{_NUM}"):
+        match = re.search(pattern, text, re.IGNORECASE)
+        if not match:
+            continue
+        val = float(match.group(1))
+        if 0 < val <= 10.0:
+            return round(val, 2)
+    return 0.0
+
+def old_school_marks(text):
+    marks = []
+    for pattern in (r'(?:10th|12th|ssc|hsc).*?(\d{2}(?:\.\d+)?)\s*%',
+                    r'(\d{2}(?:\.\d+)?)\s*%\s*(?:in|for)\s*(?:10th|12th)',
+                    r'(?:10th|12th).*?(\d\.\d+)\s*cgpa'):
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            val = float(match.group(1))
+            marks.append(val * 10 if val <= 10 else val)
+    return sum(marks) / len(marks) if marks else 0.0
+
+def old_online_presence(text):
+    presence = {'github': None, 'linkedin': None, 'portfolio': None}
+    match = re.search(r'github\.com/([\w-]+)', text, re.IGNORECASE)
+    if match:
+        presence['github'] = f"https://github.com/{match.group(1)}"
+    match = re.search(r'linkedin\.com/in/([\w-]+)', text, re.IGNORECASE)
+    if match:
+        presence['linkedin'] = f"https://linkedin.com/in/{match.group(1)}"
+    match = re.search(r'(?:portfolio|website)[:\s]+(https?://[^\s,]+)', text, re.IGNORECASE)
+    if match:
+        presence['portfolio'] = match.group(1)
+    return presence
+
+def old_experience_years(text):
+    match = re.search(r'(\d+(?:\.\d+)?)\+?\s*years?\s*(?:of\s*)?experience', text, re.IGNORECASE)
+    return float(match.group(1)) if match else 0
+
+FRAGMENTS = [
+    'CGPA: 8.2', 'CGPA - 8', '8.5/10', '3.6/4.0', 'GPA 3.8', 'cgpa of 9.1', '7.9 CGPA', 'Grade: 8',
+    'grade point average 3.2', '12/10', '0/4', 'GPA: 3.9 / 4', '11.5 cgpa', '8.25/10 CGPA',
+    '10th: 92%', '12th - 88.6 %', 'SSC 95%', 'HSC (2019) 91.2%', '85% in 10th', '90 % for 12th',
+    '10th 9.4 cgpa', '12th board, CBSE, 9.2 CGPA', '10th',
+    'github.com/jane-doe', 'GitHub.com/JohnS', 'linkedin.com/in/jane_doe', 'LINKEDIN.COM/in/x-y',
+    'Portfolio: https://jane.dev', 'website https://example.com/me, more', 'portfolio:http://a.b',
+    '5+ years of experience', '2.5 years experience', '1 year of Experience', '10 yrs experience',
+    'Phone +91 98765 43210', 'Dates 2019-2023', '2021/22', '50%', 'grade', 'gpa', '3.5', '/', '%',
+    'and', 'with', '\n', '  ', ':', '-',
+]
+
+def _random_texts(count=500, seed=11):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        parts = [rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 12))]
+        texts.append(''.join(p + rng.choice([' ', '\n', ', ', '']) for p in parts))
+    return texts
+
+TEXTS = ['', 'CGPA: 8.2/10\n10th 92% 12th 88%\ngithub.com/jane\n3 years of experience'] + _random_texts()
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_fields_match_reference(text):
+    scan = NumericScan(text)
+    assert scan.cgpa() == old_cgpa(text)
+    assert scan.school_marks_avg() == pytest.approx(old_school_marks(text))
+    assert scan.online_presence() == old_online_presence(text)
+    assert scan.experience_years() == old_experience_years(text)
+
+@pytest.mark.parametrize('text', TEXTS[:50])
+def test_each_pattern_matches_re(text):
+    scan = NumericScan(text)
+    for name, (pattern, mode) in PATTERNS.items():
+        expected = [m.groups() for m in re.finditer(pattern, text, re.IGNORECASE)]
+        if mode == 'first':
+            expected = expected[:1]
+        assert scan.all(name) == expected, name
+
+def test_extractors_accept_text_or_scan():
+    text = TEXTS[1]
+    scan = NumericScan(text)
+    assert CGPAExtractor().extract(text) == CGPAExtractor().extract(scan) == 8.2
+    assert SchoolMarksExtractor().extract_school_marks(scan) == pytest.approx(90.0)
+    assert OnlinePresenceExtractor().extract(scan)['github'] == 'https://github.com/jane'
+    assert scan.fields()['experience_years'] == 3.0
@@ -0,0 +1,105 @@
+"""
+ParseCache keys and versioning: any change to the extractor sources, the NIRF
+CSVs, the model, the AI setting or the PDF backend must miss the old entries
+"""
+
+import os
+import shutil
+
+import pytest
+
+import batch.parse_cache as parse_cache
+from batch.parse_cache import ParseCache, extractor_fingerprint
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RECORD = {
+    'filename': 'a.pdf', 'score': 71.5, 'rank': 1,
+    'full_text': 'Python developer', 'skills': ['python'], 'cgpa': 8.2,
+}
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    """A throwaway copy of the fingerprinted sources"""
+    root = tmp_path / 'backend'
+    for rel in ('extraction', 'batch/pipeline.py', 'matcher/skill_index.py', 'matcher/skill_terms.json'):
+        src = os.path.join(BACKEND_DIR, rel)
+        if os.path.isdir(src):
+            shutil.copytree(src, root / rel, ignore=shutil.ignore_patterns('__pycache__'))
+        elif os.path.exists(src):
+            (root / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(src, root / rel)
+    monkeypatch.setattr(parse_cache, '_BACKEND_DIR', str(root))
+    rankings = tmp_path / 'data'
+    rankings.mkdir()
+    (rankings / 'nirf_2024.csv').write_text("Name,Rank\nIIT Bombay,3\n")
+    return root, rankings
+
+@pytest.fixture
+def cache_factory(tmp_path):
+    caches = []
+
+    def build(**kwargs):
+        kwargs.setdefault('rankings_dir', str(tmp_path / 'data'))
+        cache = ParseCache(str(tmp_path / 'cache.sqlite3'), str(tmp_path / 'model'), **kwargs)
+        caches.append(cache)
+        return cache
+
+    yield build
+    for cache in caches:
+        cache.close()
+
+def test_fingerprint_is_stable(sources):
+    _, rankings = sources
+    assert extractor_fingerprint(str(rankings)) == extractor_fingerprint(str(rankings))
+
+def test_editing_an_extractor_changes_the_fingerprint(sources):
+    root, rankings = sources
+    before = extractor_fingerprint(str(rankings))
+    with open(root / 'extraction' / 'cgpa_extractor.py', 'a') as f:
+        f.write("\n# tweak\n")
+    assert extractor_fingerprint(str(rankings)) != before
+
+def test_editing_the_pipeline_or_rankings_changes_the_fingerprint(sources):
+    root, rankings = sources
+    before = extractor_fingerprint(str(rankings))
+    with open(root / 'batch' / 'pipeline.py', 'a') as f:
+        f.write("\n")
+    after_pipeline = extractor_fingerprint(str(rankings))
+    (rankings / 'nirf_2025.csv').write_text("Name,Rank\nIIT Delhi,2\n")
+    assert len({before, after_pipeline, extractor_fingerprint(str(rankings))}) == 3
+
+def test_settings_are_part_of_the_version(sources, cache_factory):
+    versions = {
+        cache_factory().version,
+        cache_factory(ai_enabled=True).version,
+        cache_factory(pdf_backend='pdfminer').version,
+    }
+    assert len(versions) == 3
+    # The parallel backend extracts the same text as pdfminer
+    assert cache_factory(pdf_backend='parallel').version == cache_factory(pdf_backend='pdfminer').version
+    assert all(v.startswith(parse_cache.EXTRACTOR_VERSION + ':') for v in versions)
+
+def test_round_trip_drops_per_upload_fields(sources, cache_factory):
+    cache = cache_factory()
+    key = cache.key_for(b'%PDF-1.4 resume bytes')
+    assert key == cache.key_for(b'%PDF-1.4 resume bytes')
+    assert cache.get(key) is None
+    cache.set(key, RECORD)
+    assert cache.get(key) == {'full_text': 'Python developer', 'skills': ['python'], 'cgpa': 8.2}
+
+def test_old_entries_miss_after_a_source_change(sources, cache_factory):
+    root, _ = sources
+    cache = cache_factory()
+    key = cache.key_for(b'same bytes')
+    cache.set(key, RECORD)
+    with open(root / 'extraction' / 'skill_filter.py', 'a') as f:
+        f.write("\n")
+    fresh = cache_factory()
+    assert fresh.key_for(b'same bytes') != key
+    assert fresh.get(fresh.key_for(b'same bytes')) is None
+
+def test_degraded_records_are_not_stored(sources, cache_factory):
+    cache = cache_factory(ai_enabled=True)
+    key = cache.key_for(b'gemini was down')
+    cache.set(key, {**RECORD, 'ai_skills_ok': False})
+    assert cache.get(key) is None
@@ -0,0 +1,70 @@
+"""
+Paged match rankings: every page from next_page gets AI insights (or an
+insights job) the same way as the first page of the request
+"""
+
+import asyncio
+
+import pytest
+
+from batch.processor import BatchResumeProcessor
+from matcher.job_profile import JobProfile
+
+class FakeInsightsQueue:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, records, jd_text):
+        self.submitted.append(([r['filename'] for r in records], jd_text))
+        return {'insights_id': f"job{len(self.submitted)}", 'total': len(records)}
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def processor(tmp_path):
+    processor = BatchResumeProcessor(model_path=str(tmp_path / 'model'), rankings_dir=None)
+    processor.insights = FakeInsightsQueue()
+    processor.insight_calls = []
+
+    async def attach(records, profile):
+        processor.insight_calls.append([r['filename'] for r in records])
+        for res in records:
+            res['ai_insights'] = {'for': profile.text}
+        return records
+
+    processor._attach_insights_async = attach
+    yield processor
+    processor.close()
+
+def _session(processor, **context):
+    records = [{'filename': f"r{i}.pdf", 'job_match': {'score': 100 - i}} for i in range(7)]
+    profile = JobProfile("Python developer", requirements={}, tfidf_terms=[])
+    page, info = processor.rankings.create(records, key=lambda x: x['job_match']['score'], limit=3,
+                                           context={**context, 'profile': profile})
+    return page, info['next_cursor']
+
+def test_later_pages_get_insights(processor):
+    _, cursor = _session(processor, include_ai_insights=True, defer_ai_insights=False)
+    result = asyncio.run(processor.next_page(cursor, 3))
+    assert [r['filename'] for r in result['results']] == ['r3.pdf', 'r4.pdf', 'r5.pdf']
+    assert all(r['ai_insights'] == {'for': "Python developer"} for r in result['results'])
+    # Reading the same page again does not call Gemini again
+    asyncio.run(processor.next_page(cursor, 3))
+    assert processor.insight_calls == [['r3.pdf', 'r4.pdf', 'r5.pdf']]
+
+def test_later_pages_get_deferred_insights_jobs(processor):
+    _, cursor = _session(processor, include_ai_insights=True, defer_ai_insights=True)
+    result = asyncio.run(processor.next_page(cursor, 3))
+    assert result['insights']['insights_id'] == 'job1'
+    assert processor.insights.submitted == [(['r3.pdf', 'r4.pdf', 'r5.pdf'], "Python developer")]
+    assert processor.insight_calls == []
+
+def test_pages_without_insights(processor):
+    _, cursor = _session(processor, include_ai_insights=False)
+    result = asyncio.run(processor.next_page(cursor, 3))
+    assert 'insights' not in result and not any('ai_insights' in r for r in result['results'])
+    # Unpaged /batch-parse rankings carry no context at all
+    _, info = processor.rankings.create([{'filename': 'a', 'score': {'total': 1}}] * 3,
+                                        key=lambda x: x['score']['total'], limit=1)
+    assert 'insights' not in asyncio.run(processor.next_page(info['next_cursor'], 1))
@@ -0,0 +1,86 @@
+"""
+stream_match_with_jd: candidates are emitted before their AI insights, the
+insight calls overlap instead of running one after another, and the summary
+carries the final batch-wide job_match of every candidate
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from batch.processor import BatchResumeProcessor
+from matcher.job_profile import JobProfile
+
+@pytest.fixture
+def processor(tmp_path):
+    processor = BatchResumeProcessor(model_path=str(tmp_path / 'model'), rankings_dir=None)
+    processor.in_flight = 0
+    processor.max_in_flight = 0
+
+    async def ready(*names):
+        return None
+
+    async def parsed(files, backend, counters):
+        for filename, _ in files:
+            await asyncio.sleep(0)
+            yield {'filename': filename, 'full_text': filename, 'skills': [], 'score': {'total': 50}}
+
+    def match(records, profile, include_ai_insights=True):
+        # Scores depend on the batch, like the TF-IDF fit
+        for res in records:
+            res['job_match'] = {'score': float(len(records) * 10 + int(res['filename'][1]))}
+        return records
+
+    async def attach(records, profile):
+        processor.in_flight += 1
+        processor.max_in_flight = max(processor.max_in_flight, processor.in_flight)
+        await asyncio.sleep(0.05)
+        processor.in_flight -= 1
+        for res in records:
+            res['ai_insights'] = {'summary': res['filename']}
+        return records
+
+    processor.ensure_ready = ready
+    processor._iter_parsed = parsed
+    processor._match_records = match
+    processor._attach_insights_async = attach
+    processor._as_job_profile = lambda job: JobProfile(job, requirements={}, tfidf_terms=[])
+    yield processor
+    processor.close()
+
+def _events(processor, include_ai_insights=True, n=6):
+    files = [(f"r{i}.pdf", b'') for i in range(n)]
+
+    async def collect():
+        # Serialised as they are yielded, like the streaming response
+        return [json.loads(json.dumps(event)) async for event in processor.stream_match_with_jd(
+            files, "Python developer", include_ai_insights=include_ai_insights, progress_every=100)]
+
+    return asyncio.run(collect())
+
+def test_insights_run_concurrently(processor):
+    events = _events(processor)
+    insights = [e for e in events if e['type'] == 'insight']
+    assert sorted(e['index'] for e in insights) == list(range(6))
+    assert all(e['ai_insights'] == {'summary': e['filename']} for e in insights)
+    assert processor.max_in_flight > 1
+    # Every candidate is sent before its own insight
+    order = [(e['type'], e['index']) for e in events if e['type'] in ('candidate', 'insight')]
+    assert all(order.index(('candidate', i)) < order.index(('insight', i)) for i in range(6))
+    assert events[-1]['type'] == 'summary'
+
+def test_summary_has_final_job_match(processor):
+    events = _events(processor, include_ai_insights=False)
+    candidates = [e for e in events if e['type'] == 'candidate']
+    assert not any(e['type'] == 'insight' for e in events)
+    summary = events[-1]
+    final = {entry['filename']: entry['job_match'] for entry in summary['ranking']}
+    # Streamed scores came from one-candidate fits; the summary has the batch fit
+    assert final['r0.pdf'] == {'score': 60.0}
+    assert all(entry['score'] == entry['job_match']['score'] for entry in summary['ranking'])
+    assert [e['filename'] for e in summary['ranking']] == [f"r{i}.pdf" for i in range(5, -1, -1)]
+    assert all('provisional' not in m for m in final.values())
+    assert [c['candidate']['job_match'] for c in candidates] == [
+        {'score': 10.0 + i, 'provisional': True} for i in range(6)
+    ]
@@ -0,0 +1,72 @@
+"""
+RankingStore paging: walking every cursor must give the same order and ranks
+as the full sort it replaces (score descending, ties in input order)
+"""
+
+import random
+
+import pytest
+
+from batch.ranking import RankingStore, decode_cursor, encode_cursor
+
+def _candidates(n, seed=3):
+    rng = random.Random(seed)
+    # Few distinct scores, so ties are common
+    return [{'id': i, 'score': {'total': rng.choice([55.0, 60.5, 72.25, 80.0, 91.0])}} for i in range(n)]
+
+def _full_sort(items):
+    ranked = sorted(items, key=lambda x: x['score']['total'], reverse=True)
+    return [(c['id'], i) for i, c in enumerate(ranked, 1)]
+
+def _walk(store, items, limit):
+    page, info = store.create(items, key=lambda x: x['score']['total'], limit=limit)
+    seen = list(page)
+    totals = {info['total']}
+    while info['next_cursor']:
+        page, info = store.page(info['next_cursor'], limit)
+        seen.extend(page)
+        totals.add(info['total'])
+    return seen, totals
+
+@pytest.mark.parametrize('n,limit', [(0, 5), (1, 5), (7, 3), (50, 10), (101, 7), (20, 500)])
+def test_paging_matches_full_sort(n, limit):
+    items = _candidates(n)
+    expected = _full_sort([dict(c) for c in items])
+    seen, totals = _walk(RankingStore(), items, limit)
+    assert [(c['id'], c['rank']) for c in seen] == expected
+    assert totals == {n}
+
+def test_first_page_only_ranks_what_it_returns():
+    items = _candidates(30)
+    page, info = RankingStore().create(items, key=lambda x: x['score']['total'], limit=5)
+    assert [c['rank'] for c in page] == [1, 2, 3, 4, 5]
+    assert sum('rank' in c for c in items) == 5
+    assert info == {'offset': 0, 'limit': 5, 'total': 30, 'next_cursor': info['next_cursor']}
+    assert decode_cursor(info['next_cursor'])[1] == 5
+
+def test_pages_can_be_reread():
+    store = RankingStore()
+    items = _candidates(12)
+    _, info = store.create(items, key=lambda x: x['score']['total'], limit=4)
+    cursor = info['next_cursor']
+    first, _ = store.page(cursor, 4)
+    again, _ = store.page(cursor, 4)
+    assert [c['id'] for c in first] == [c['id'] for c in again]
+
+def test_cursor_round_trip_and_garbage():
+    assert decode_cursor(encode_cursor('abc_-123', 40)) == ('abc_-123', 40)
+    with pytest.raises(ValueError):
+        decode_cursor('not a cursor!')
+
+def test_expired_and_evicted_sessions():
+    store = RankingStore(max_sessions=1)
+    _, old = store.create(_candidates(10), key=lambda x: x['score']['total'], limit=2)
+    store.create(_candidates(10), key=lambda x: x['score']['total'], limit=2)
+    with pytest.raises(KeyError):
+        store.page(old['next_cursor'], 2)
+
+    store = RankingStore(ttl_seconds=-1)
+    _, info = store.create(_candidates(10), key=lambda x: x['score']['total'], limit=2)
+    store.create([], key=lambda x: 0, limit=2)
+    with pytest.raises(KeyError):
+        store.page(info['next_cursor'], 2)
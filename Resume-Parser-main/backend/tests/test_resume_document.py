@@ -0,0 +1,173 @@
+"""
+ResumeDocument-based extractors against the line-rescanning versions they replaced
+"""
+
+import random
+
+import pytest
+
+from extraction.achievement_extractor import AchievementExtractor
+from extraction.degree_classifier import DegreeClassifier
+from extraction.extra_curricular import ExtraCurricularExtractor
+from extraction.project_extractor import ProjectExtractor
+from extraction.resume_document import ResumeDocument
+
+# Reference implementations: the pre-ResumeDocument extractors, verbatim apart from layout
+
+def _walk(text, headers, stops):
+    in_section = False
+    for line in text.split('\n'):
+        line_clean = line.strip().lower()
+        if any(kw in line_clean for kw in headers):
+            in_section = True
+            continue
+        if in_section and any(kw in line_clean for kw in stops):
+            in_section = False
+            continue
+        yield line, line_clean, in_section
+
+def old_projects(text):
+    projects = [
+        line.strip()
+        for line, _, in_section in _walk(text, ['projects', 'key projects', 'notable projects'],
+                                         ['experience', 'education', 'skills', 'achievements'])
+        if in_section and len(line.strip()) > 10
+    ]
+    return projects[:10]
+
+def old_achievements(text):
+    keywords = ['award', 'honor', 'distinction', 'achievement', 'scholarship', 'placed', 'won']
+    achievements = []
+    for line, line_clean, in_section in _walk(text, ['achievements', 'honors', 'awards'],
+                                              ['experience', 'education', 'skills', 'projects']):
+        if in_section:
+            if len(line.strip()) > 5:
+                achievements.append(line.strip())
+        elif any(kw in line_clean for kw in keywords) and len(line_clean) < 100:
+            achievements.append(line.strip())
+    return achievements
+
+def old_extra_curricular(text):
+    keywords = [
+        'volunteer', 'club', 'society', 'sports', 'captain', 'leader',
+        'coordinated', 'organized', 'event', 'non-profit', 'ngo'
+    ]
+    activities = []
+    for line, line_clean, in_section in _walk(
+            text, ['extra-curricular', 'volunteering', 'co-curricular'],
+            ['experience', 'education', 'skills', 'projects', 'achievements']):
+        if in_section:
+            if len(line.strip()) > 5:
+                activities.append(line.strip())
+        elif any(kw in line_clean for kw in keywords) and len(line_clean) < 100:
+            activities.append(line.strip())
+    return activities
+
+def old_degree(text):
+    text_lower = text.lower()
+    for degree, keywords in (
+        ('phd', ['ph.d', 'doctorate', 'phd']),
+        ('masters', ['m.tech', 'm.e.', 'msc', 'master', 'mba', 'm.s.']),
+        ('bachelors', ['b.tech', 'b.e.', 'bsc', 'bachelor', 'b.s.']),
+        ('diploma', ['diploma']),
+    ):
+        if any(kw in text_lower for kw in keywords):
+            return degree
+    return 'unknown'
+
+SAMPLE = """Jane Doe
+jane@example.com | github.com/janedoe
+
+EDUCATION
+B.Tech in Computer Science, IIT Bombay  CGPA 8.7/10
+
+EXPERIENCE
+Software Engineering Intern, Acme Corp (Summer 2022)
+Built an internal dashboard used by 40 engineers
+
+PROJECTS
+Resume Parser - spaCy NER pipeline with a FastAPI backend
+Chess engine in Rust with alpha-beta pruning and a UCI interface
+Skills used: Python, Rust
+
+ACHIEVEMENTS
+Won first place at the Smart India Hackathon 2021
+Merit scholarship for three consecutive years
+
+EXTRA-CURRICULAR
+Captain of the college cricket team
+Volunteer at a local NGO teaching coding to children
+"""
+
+LINES = [
+    'PROJECTS', 'Key Projects:', 'Notable projects', 'Experience', 'WORK EXPERIENCE', 'Education',
+    'Technical Skills', 'Achievements', 'Honors and Awards', 'Extra-Curricular Activities',
+    'Volunteering', 'Co-curricular', 'Internships', '',
+    'Built a distributed key-value store in Go',
+    'Won the inter-college coding contest',
+    'Awarded the Dean\'s list distinction',
+    'President of the robotics club and organized the annual tech event',
+    'Sports captain, led the football team to the state finals',
+    'Placed in the top 1% of JEE Advanced',
+    'Software engineering intern at a fintech startup',
+    'M.Tech in Data Science', 'B.E. Mechanical', 'Ph.D. candidate', 'Diploma in Civil Engineering',
+    'MBA, 2019', 'MSc Physics', 'short',
+    '  indented line about a Society event   ',
+    'A very long line about volunteer work ' + 'and more detail ' * 8,
+    'Ünïcode line with an AWARD and İstanbul',
+]
+
+def _random_texts(count=300, seed=7):
+    rng = random.Random(seed)
+    return [
+        '\n'.join(rng.choice(LINES) for _ in range(rng.randint(0, 30)))
+        for _ in range(count)
+    ]
+
+TEXTS = [SAMPLE, '', '\n\n', 'projects'] + _random_texts()
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_projects_match_reference(text):
+    assert ProjectExtractor().extract(text) == old_projects(text)
+    assert ProjectExtractor().extract(ResumeDocument(text)) == old_projects(text)
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_achievements_match_reference(text):
+    # The extractor returns list(set(...))[:10], whose order is not stable across runs
+    expected = set(old_achievements(text))
+    result = AchievementExtractor().extract(ResumeDocument(text))
+    assert len(result) == min(10, len(expected))
+    assert set(result) <= expected
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_extra_curricular_matches_reference(text):
+    expected = set(old_extra_curricular(text))
+    result = ExtraCurricularExtractor().extract(ResumeDocument(text))
+    assert len(result) == min(5, len(expected))
+    assert set(result) <= expected
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_degree_matches_reference(text):
+    assert DegreeClassifier().get_highest_degree(ResumeDocument(text)) == old_degree(text)
+
+def test_sample_fields():
+    doc = ResumeDocument(SAMPLE)
+    assert ProjectExtractor().extract(doc) == [
+        'Resume Parser - spaCy NER pipeline with a FastAPI backend',
+        'Chess engine in Rust with alpha-beta pruning and a UCI interface',
+    ]
+    # Nothing after ACHIEVEMENTS is a stop heading, so the section runs to the end
+    assert set(AchievementExtractor().extract(doc)) == {
+        'Won first place at the Smart India Hackathon 2021',
+        'Merit scholarship for three consecutive years',
+        'EXTRA-CURRICULAR',
+        'Captain of the college cricket team',
+        'Volunteer at a local NGO teaching coding to children',
+    }
+    # Substring matching, as before: 'mba' inside 'Bombay' reads as a master's
+    assert DegreeClassifier().get_highest_degree(doc) == 'masters'
+
+def test_keyword_outside_vocabulary_is_indexed_on_demand():
+    doc = ResumeDocument("Line one\nKubernetes operator\nkubernetes again")
+    assert doc.lines_with('kubernetes') == {1, 2}
+    assert doc.contains('operator') and not doc.contains('terraform')
@@ -0,0 +1,132 @@
+"""
+SemanticJobMatcher math (NumPy only, no torch needed) and the int8 / ONNX
+encoders against the fp32 SentenceTransformer
+"""
+
+import hashlib
+
+import numpy as np
+import pytest
+
+import matcher.semantic_matcher as semantic_matcher
+from matcher.embedding_store import EmbeddingStore
+from matcher.semantic_matcher import SemanticJobMatcher
+
+SAMPLES = [
+    "Python developer with Django and PostgreSQL experience",
+    "Built REST APIs in FastAPI and deployed them on AWS",
+    "Frontend engineer working with React, TypeScript and CSS",
+    "Machine learning engineer: PyTorch, scikit-learn, feature engineering",
+    "Managed a team of five and ran weekly sprint planning",
+    "Data analyst skilled in SQL, Excel and Tableau dashboards",
+]
+
+class HashingEncoder:
+    """Deterministic bag-of-words encoder standing in for the model"""
+
+    def __init__(self, dim=64):
+        self.dim = dim
+        self.calls = 0
+
+    def encode(self, texts, convert_to_numpy=True, batch_size=32):
+        self.calls += 1
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                out[i, int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1.0
+        return out
+
+@pytest.fixture
+def matcher(monkeypatch):
+    monkeypatch.setattr(semantic_matcher, 'build_encoder', lambda *args, **kwargs: HashingEncoder())
+    return SemanticJobMatcher(embedding_cache=EmbeddingStore(), backend='onnx')
+
+def _cosine(a, b):
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+def test_available_without_torch(matcher):
+    assert matcher.available
+    assert matcher.model_name == 'all-MiniLM-L6-v2@onnx'
+
+def test_get_embeddings_returns_numpy_and_caches(matcher):
+    first = matcher.get_embeddings(SAMPLES)
+    assert isinstance(first, np.ndarray) and first.shape == (len(SAMPLES), 64)
+    calls = matcher.model.calls
+    np.testing.assert_array_equal(matcher.get_embeddings(SAMPLES), first)
+    assert matcher.model.calls == calls
+
+def test_compute_similarity_is_cosine(matcher):
+    a, b = matcher.get_embeddings(SAMPLES[:2])
+    assert matcher.compute_similarity(SAMPLES[0], SAMPLES[1]) == pytest.approx(_cosine(a, b), abs=1e-6)
+
+def test_embed_resumes_are_unit_vectors(matcher):
+    vectors = matcher.embed_resumes(SAMPLES)
+    assert vectors.shape == (len(SAMPLES), 64)
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+
+def test_resume_similarity_pools_chunk_cosines(matcher):
+    resume = "\n".join(SAMPLES)
+    jd = SAMPLES[0]
+    chunks = matcher.chunk_resume(resume)
+    jd_vector = matcher.get_embedding(jd)
+    expected = [_cosine(v, jd_vector) for v in matcher.get_embeddings(chunks)]
+    result = matcher.resume_similarity(resume, jd)
+    assert result['chunks'] == len(chunks)
+    assert result['max'] == pytest.approx(max(expected), abs=1e-5)
+    assert result['mean'] == pytest.approx(sum(expected) / len(expected), abs=1e-5)
+
+def test_compare_skill_sets_picks_most_similar_jd_skill(matcher):
+    resume_skills = ["zorblax framework", "quantum widgets"]
+    jd_skills = ["zorblax framework tooling", "widgets quantum", "unrelated thing"]
+    result = matcher.compare_skill_sets(resume_skills, jd_skills, threshold=0.5)
+    matches = {m['resume_skill']: m['matches'] for m in result['matched_skills']}
+    assert matches == {"zorblax framework": "zorblax framework tooling", "quantum widgets": "widgets quantum"}
+
+def test_known_skills_match_by_id_without_embedding(matcher):
+    result = matcher.compare_skill_sets(["ReactJS", "Python 3.10"], ["React.js", "Python"], threshold=0.5)
+    assert {(m['resume_skill'], m['matches'], m['confidence']) for m in result['matched_skills']} == {
+        ("ReactJS", "React.js", 100.0), ("Python 3.10", "Python", 100.0)
+    }
+    assert result['score'] == 100.0 and result['embedded_skills'] == 0
+
+def test_known_resume_skill_compared_with_unknown_jd_skills(matcher):
+    # 'Python' resolves but 'Python programming' does not: compare them semantically
+    result = matcher.compare_skill_sets(["Python"], ["Python programming"], threshold=0.5)
+    assert [m['matches'] for m in result['matched_skills']] == ["Python programming"]
+    assert result['score'] == 100.0 and result['embedded_skills'] == 1
+
+def test_known_skills_never_match_other_known_skills_semantically(matcher):
+    # 'Java' and 'JavaScript' are different IDs, however close their embeddings
+    result = matcher.compare_skill_sets(["Java"], ["JavaScript", "Python programming"], threshold=0.0)
+    assert [m['matches'] for m in result['matched_skills']] == ["Python programming"]
+    result = matcher.compare_skill_sets(["Java"], ["JavaScript"], threshold=0.0)
+    assert result['matched_skills'] == [] and result['embedded_skills'] == 0
+
+def test_hybrid_match_runs_on_numpy(matcher):
+    result = matcher.hybrid_match(SAMPLES[0], SAMPLES[0], ["Python"], ["Python"], tfidf_score=0.5)
+    assert result['semantic_similarity'] == pytest.approx(100.0, abs=0.01)
+    assert 'semantic_disabled' not in result
+
+@pytest.mark.parametrize('backend', ['int8', 'onnx'])
+def test_backend_matches_fp32_cosines(backend, tmp_path):
+    """The quantised / exported encoders keep the fp32 geometry (needs the model and its packages)"""
+    pytest.importorskip('sentence_transformers')
+    pytest.importorskip('torch')
+    if backend == 'onnx':
+        pytest.importorskip('onnxruntime')
+    from matcher.encoders import build_encoder
+    from matcher.vector_index import normalize_rows
+
+    try:
+        baseline = build_encoder('all-MiniLM-L6-v2', 'torch', device='cpu')
+        encoder = build_encoder('all-MiniLM-L6-v2', backend, device='cpu', onnx_dir=str(tmp_path))
+    except Exception as e:
+        pytest.skip(f"model not available: {e}")
+
+    expected = normalize_rows(baseline.encode(SAMPLES, convert_to_numpy=True))
+    actual = normalize_rows(encoder.encode(SAMPLES, convert_to_numpy=True))
+    cosines = (expected * actual).sum(axis=1)
+    assert cosines.min() > (0.99 if backend == 'onnx' else 0.95)
+    # Pairwise similarities (what the matcher scores with) barely move
+    drift = np.abs(expected @ expected.T - actual @ actual.T)
+    assert drift.max() < (0.01 if backend == 'onnx' else 0.05)
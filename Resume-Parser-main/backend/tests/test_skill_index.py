@@ -0,0 +1,48 @@
+"""
+SkillIndex: alias forms of one skill resolve to the same canonical ID, and
+TFIDFJobMatcher.calculate_skill_match compares skills by that ID
+"""
+
+import pytest
+
+from matcher.skill_index import SkillIndex, build_index, default_index, skill_key
+from matcher.tfidf_matcher import TFIDFJobMatcher
+
+@pytest.fixture(scope='module')
+def index():
+    return default_index()
+
+@pytest.mark.parametrize('forms,skill_id', [
+    (["React", "ReactJS", "React.js", "react js", "REACT.JS"], 'react'),
+    (["Node.js", "NodeJS", "node js"], 'nodejs'),
+    (["JavaScript", "JS"], 'javascript'),
+    (["Python", "python", "Python 3.10"], 'python'),
+    (["MS Excel", "Microsoft Excel"], 'excel'),
+    (["DSA", "Data Structures and Algorithms"], 'datastructures'),
+])
+def test_aliases_resolve_to_one_id(index, forms, skill_id):
+    assert {index.resolve(form) for form in forms} == {skill_id}
+
+def test_languages_with_symbols_stay_distinct(index):
+    assert len({index.resolve(s) for s in ("C", "C++", "C#")}) == 3
+    assert index.resolve("Java") != index.resolve("JavaScript")
+
+def test_unknown_skills(index):
+    assert index.resolve("Python programming") is None
+    assert index.resolve("") is None
+    assert index.canonical_key("Zorblax  Framework!") == skill_key("zorblax framework") == 'zorblaxframework'
+
+def test_missing_index_file_knows_nothing():
+    empty = SkillIndex()
+    assert len(empty) == 0 and empty.resolve("React") is None
+    assert empty.canonical_key("React.js") == 'reactjs'
+
+def test_build_index_adds_aliases():
+    built = build_index(['react'], extra_aliases={'react': ['ReactJS']}, display_names={})
+    assert built.resolve("reactjs") == built.resolve("React") is not None
+
+def test_skill_match_by_canonical_id():
+    result = TFIDFJobMatcher().calculate_skill_match(["ReactJS", "NodeJS", "Rust"], ["React.js", "Node.js", "Go"])
+    assert result['score'] == pytest.approx(66.67)
+    assert result['matched'] == ["react.js", "node.js"]
+    assert result['missing'] == ["go"]
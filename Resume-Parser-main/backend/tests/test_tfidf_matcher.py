@@ -0,0 +1,63 @@
+"""
+TFIDFJobMatcher.match_batch: one fit per batch, equal to fitting the raw texts
+with a plain vectorizer, and no document-frequency pruning of shared terms
+"""
+
+import pytest
+
+pytest.importorskip('sklearn')
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from matcher.tfidf_matcher import TFIDFJobMatcher
+
+JD = "Backend engineer: Python, Django, PostgreSQL, REST APIs and AWS deployment"
+RESUMES = [
+    "Python developer building Django REST APIs backed by PostgreSQL",
+    "Frontend engineer with React, TypeScript and CSS animations",
+    "Deployed Python microservices on AWS with Docker and Terraform",
+    "Data analyst: SQL, Excel, Tableau dashboards",
+    "",
+]
+
+@pytest.fixture(scope='module')
+def matcher():
+    return TFIDFJobMatcher()
+
+def _reference(texts, jd):
+    """Raw-text fit with the matcher's settings and no max_df"""
+    vectorizer = TfidfVectorizer(max_features=1000, stop_words='english', ngram_range=(1, 2), min_df=1, max_df=1.0)
+    matrix = vectorizer.fit_transform(list(texts) + [jd])
+    return cosine_similarity(matrix[:len(texts)], matrix[len(texts)]).ravel()
+
+def test_batch_matches_raw_text_fit(matcher):
+    result = matcher.match_batch(RESUMES, JD)
+    assert result['similarities'] == pytest.approx(list(_reference(RESUMES, JD)), abs=1e-9)
+    assert result['similarities'][0] > result['similarities'][1]
+    assert result['similarities'][4] == 0.0
+
+@pytest.mark.parametrize('n', [1, 2, 3, 5])
+def test_shared_terms_survive_small_batches(matcher, n):
+    # max_df=0.8 used to prune every term the resumes share with the JD
+    result = matcher.match_batch([RESUMES[0]] * n, JD)
+    assert all(score > 0 for score in result['similarities'])
+    assert result['similarities'] == pytest.approx(list(_reference([RESUMES[0]] * n, JD)), abs=1e-9)
+    assert all(result['resume_terms']) and result['job_terms']
+
+def test_calculate_similarity_is_single_resume_batch(matcher):
+    for resume in RESUMES:
+        assert matcher.calculate_similarity(resume, JD) == matcher.match_batch([resume], JD, top_n=0)['similarities'][0]
+    assert matcher.calculate_similarity(RESUMES[0], JD) > 0
+
+def test_precomputed_jd_terms(matcher):
+    jd_terms = matcher.analyze(JD)
+    assert matcher.match_batch(RESUMES, JD, jd_terms=jd_terms) == matcher.match_batch(RESUMES, JD)
+
+def test_key_terms_of_one_document(matcher):
+    terms = matcher.get_key_terms(JD, top_n=5)
+    assert len(terms) == 5 and all(isinstance(t, str) for t in terms)
+    assert matcher.get_key_terms("the and of", top_n=5) == []
+
+def test_empty_batch(matcher):
+    assert matcher.match_batch([], JD) == {'similarities': [], 'resume_terms': [], 'job_terms': []}